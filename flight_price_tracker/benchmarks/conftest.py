@@ -0,0 +1,109 @@
+import os
+import sys
+import json
+
+import pytest
+
+# ──────────────────────────────────────────────────────────────
+# Benchmark Fixtures
+# Shared setup for the pytest-benchmark suite (run from
+# flight_price_tracker/, see pytest.ini). Nothing here talks to
+# Amadeus, MySQL, SendGrid or Twilio: searches return a recorded
+# 250-offer Flight Offers Search response and the DB and
+# notification calls are stubbed, so the numbers only move when
+# our own code does.
+#
+# Set before the app modules are imported (load_dotenv() doesn't
+# override them): placeholder API credentials, no on-disk search
+# store so every run starts from the same empty cache, and only
+# warnings logged (the log calls still run, nothing is written).
+# ──────────────────────────────────────────────────────────────
+
+os.environ.setdefault('AMADEUS_API_KEY', 'benchmark')
+os.environ.setdefault('AMADEUS_API_SECRET', 'benchmark')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ['SEARCH_STORE_PATH'] = ''
+
+# The project root for the src.* imports, and src/core for the
+# price checker's bare `from db import ...` style imports
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(PROJECT_ROOT, 'src', 'core'))
+sys.path.insert(0, PROJECT_ROOT)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# The request the recorded response answers (JFK -> LAX round trip)
+RECORDED_SEARCH = {
+    'origin': 'JFK',
+    'destination': 'LAX',
+    'departure_date': '2026-12-01',
+    'return_date': '2026-12-08',
+}
+
+
+class RecordedResponse:
+    """Stands in for the Amadeus SDK's Response (status_code and parsed data)."""
+
+    def __init__(self, body):
+        self.status_code = 200
+        self.data = body['data']
+        self.result = body
+
+
+@pytest.fixture(scope='session')
+def recorded_search():
+    """The recorded JFK-LAX Flight Offers Search body: {'meta': ..., 'data': [250 offers]}."""
+    with open(os.path.join(FIXTURES_DIR, 'flight_offers_250.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def stub_amadeus(monkeypatch, recorded_search):
+    """Every search returns the recorded response. Yields the list of calls' params."""
+    from src.api import travelpayouts
+
+    calls = []
+
+    def search(**params):
+        calls.append(params)
+        return RecordedResponse(recorded_search)
+
+    monkeypatch.setattr(travelpayouts.amadeus.shopping.flight_offers_search, 'get', search)
+    yield calls
+
+
+@pytest.fixture
+def parsed_offers(stub_amadeus):
+    """The recorded response parsed by prices_for_dates (no display fields yet)."""
+    from src.api.travelpayouts import prices_for_dates, AMADEUS_MAX_RESULTS
+
+    return prices_for_dates(
+        RECORDED_SEARCH['origin'], RECORDED_SEARCH['destination'],
+        departure_at=RECORDED_SEARCH['departure_date'], return_at=RECORDED_SEARCH['return_date'],
+        limit=AMADEUS_MAX_RESULTS,
+    )
+
+
+@pytest.fixture
+def web_app(monkeypatch, stub_amadeus):
+    """The Flask app (no warm-up) with the per-IP search limit turned off."""
+    from src.web import app as web
+
+    monkeypatch.setattr(web.search_limiter, 'rate', 0)
+    return web.create_app({'WARM_UP': False, 'TESTING': True})
+
+
+@pytest.fixture
+def alert_details():
+    """alert_details/flight_details as the price checker passes them to the notifiers."""
+    alert = {
+        'alert_id': 42,
+        'origin': RECORDED_SEARCH['origin'],
+        'destination': RECORDED_SEARCH['destination'],
+        'departure_date': RECORDED_SEARCH['departure_date'],
+        'return_date': RECORDED_SEARCH['return_date'],
+        'price_threshold': 450.0,
+        'trip_type': 'round-trip',
+    }
+    flight = {'price': 389.2, 'airline': 'B6'}
+    return alert, flight
@@ -0,0 +1,112 @@
+from itertools import count
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import RECORDED_SEARCH
+
+# ──────────────────────────────────────────────────────────────
+# Price checker
+# A full check_all_alerts() pass over 1k/10k/100k alerts. The
+# alerts are spread over ROUTE_COUNT routes (so most fetches are
+# search cache hits, as in production). Every search returns the
+# recorded response, the DB calls are no-ops and the notifiers
+# succeed without sending. The search cache and the dedup store
+# (a real SQLite file under tmp_path) start empty every round.
+#
+# About 10% of alerts see a price drop (email + SMS through
+# deliver_once), 1% have expired (spread over the routes) and
+# the rest scan all 250 offers without finding one under their
+# threshold.
+# ──────────────────────────────────────────────────────────────
+
+ROUTE_COUNT = 200  # below SEARCH_CACHE_MAX, so no route is fetched twice in a pass
+DESTINATIONS = ('LAX', 'SFO', 'SEA', 'ORD', 'MIA', 'DFW', 'DEN', 'ATL', 'BOS', 'LAS')
+
+# Rounds per size: enough to compare runs without the 100k case taking minutes
+ROUNDS = {1_000: 5, 10_000: 3, 100_000: 2}
+
+
+def make_alerts(alert_count, cheapest_price):
+    """Rows shaped like get_verified_active_alerts() results."""
+    today = date.today()
+    alerts = []
+    for i in range(alert_count):
+        route = i % ROUTE_COUNT
+        departure = today + timedelta(days=30 + route // len(DESTINATIONS))
+        if i % 97 == 96:
+            departure = today - timedelta(days=1)  # expired
+        alerts.append({
+            'id': i + 1,
+            'email': f"traveler{i}@example.com",
+            'phone': f"+1555{i:07d}",
+            'email_verified': True,
+            'phone_verified': True,
+            'origin': RECORDED_SEARCH['origin'],
+            'destination': DESTINATIONS[route % len(DESTINATIONS)],
+            'departure_date': departure,
+            'return_date': departure + timedelta(days=7),
+            'trip_type': 'round-trip',
+            # one in ten is above the cheapest recorded offer
+            'price_threshold': cheapest_price + 50 if i % 10 == 0 else cheapest_price - 1,
+            'is_active': True,
+        })
+    return alerts
+
+
+@pytest.fixture
+def checker(monkeypatch, stub_amadeus, parsed_offers):
+    """price_checker with the DB and notifiers stubbed. Yields (module, sent counts)."""
+    from src.core import price_checker
+
+    sent = {'price_drop': 0, 'expired': 0}
+
+    def send_price_drop(contact, alert_details, flight_details):
+        sent['price_drop'] += 1
+        return True
+
+    def send_expired(contact, alert_details):
+        sent['expired'] += 1
+        return True
+
+    def no_op(*args, **kwargs):
+        pass
+
+    for name in ('record_price_point', 'update_last_checked', 'update_price_threshold', 'delete_alert'):
+        monkeypatch.setattr(price_checker, name, no_op)
+    for name in ('send_price_drop_notification', 'send_price_drop_sms'):
+        monkeypatch.setattr(price_checker, name, send_price_drop)
+    for name in ('send_alert_expired_notification', 'send_alert_expired_sms'):
+        monkeypatch.setattr(price_checker, name, send_expired)
+    monkeypatch.setattr(price_checker, 'CHECKER_ALERT_DELAY', 0)
+    yield price_checker, sent
+
+
+@pytest.mark.parametrize('alert_count', sorted(ROUNDS))
+def test_check_all_alerts(benchmark, checker, parsed_offers, stub_amadeus, monkeypatch, tmp_path, alert_count):
+    from src.core.search_cache import SearchCache
+    from src.core.notification_dedup import NotificationDedupStore
+
+    price_checker, sent = checker
+    alerts = make_alerts(alert_count, parsed_offers[0]['price'])
+    monkeypatch.setattr(price_checker, 'get_verified_active_alerts', lambda: alerts)
+
+    rounds = count()
+
+    def fresh_state():
+        round_dir = tmp_path / f"round{next(rounds)}"
+        round_dir.mkdir()
+        monkeypatch.setattr(price_checker, '_search_cache', SearchCache())
+        monkeypatch.setattr(price_checker, '_dedup_store', NotificationDedupStore(str(round_dir / 'dedup.sqlite3')))
+        stub_amadeus.clear()
+        sent.update(price_drop=0, expired=0)
+
+    benchmark.pedantic(price_checker.check_all_alerts, kwargs={'profile': False},
+                       setup=fresh_state, rounds=ROUNDS[alert_count])
+
+    # every route fetched once; email + SMS per drop and per expiry
+    assert len(stub_amadeus) == min(alert_count, ROUTE_COUNT)
+    assert sent['price_drop'] == 2 * sum(1 for alert in alerts
+                                         if alert['price_threshold'] > parsed_offers[0]['price']
+                                         and alert['departure_date'] >= date.today())
+    assert sent['expired'] == 2 * sum(1 for alert in alerts if alert['departure_date'] < date.today())
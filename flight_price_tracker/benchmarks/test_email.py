@@ -0,0 +1,44 @@
+import pytest
+
+# ──────────────────────────────────────────────────────────────
+# Email rendering
+# The notification functions up to the provider call: template
+# read, placeholder fill-in, reference lookups and building the
+# SendGrid Mail object. _send_mail is replaced by a stub that
+# accepts everything.
+# ──────────────────────────────────────────────────────────────
+
+
+class _Accepted:
+    status_code = 202
+
+
+@pytest.fixture
+def sent_mail(monkeypatch):
+    """Messages passed to SendGrid, captured instead of sent."""
+    from src.core import email_service
+
+    messages = []
+
+    def send_mail(message):
+        messages.append(message)
+        return _Accepted()
+
+    monkeypatch.setattr(email_service, '_send_mail', send_mail)
+    return messages
+
+
+def test_price_drop_email(benchmark, sent_mail, alert_details):
+    from src.core.email_service import send_price_drop_notification
+
+    alert, flight = alert_details
+    assert benchmark(send_price_drop_notification, 'traveler@example.com', alert, flight)
+    assert 'JFK' in sent_mail[-1].get()['content'][0]['value']
+
+
+def test_verification_email(benchmark, sent_mail, alert_details):
+    from src.core.email_service import send_verification_email
+
+    alert, _ = alert_details
+    assert benchmark(send_verification_email, 'traveler@example.com', 'token', alert)
+    assert sent_mail
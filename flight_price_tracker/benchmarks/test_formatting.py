@@ -0,0 +1,33 @@
+import pytest
+
+from src.api.travelpayouts import parse_duration, format_time_12hr
+
+# ──────────────────────────────────────────────────────────────
+# Per-offer formatting helpers
+# Each offer calls these once per itinerary (durations) and
+# twice per itinerary (times), so a 250-offer round trip runs
+# them about 1,500 times.
+# ──────────────────────────────────────────────────────────────
+
+DURATIONS = ['PT2H30M', 'PT11H', 'PT45M', 'PT13H25M', 'PT6H5M', 'PT21H50M', 'PT1H', 'PT9H40M']
+TIMES = ['00:05', '06:30', '11:59', '12:00', '13:45', '17:20', '20:25', '23:55']
+
+
+@pytest.mark.parametrize('value, expected', [('PT2H30M', '2h 30m'), ('PT11H', '11h'), ('PT45M', '45m')])
+def test_parse_duration(benchmark, value, expected):
+    assert benchmark(parse_duration, value) == expected
+
+
+@pytest.mark.parametrize('value, expected', [('00:05', '12:05 AM'), ('13:45', '1:45 PM')])
+def test_format_time_12hr(benchmark, value, expected):
+    assert benchmark(format_time_12hr, value) == expected
+
+
+def test_parse_duration_batch(benchmark):
+    results = benchmark(lambda: [parse_duration(value) for value in DURATIONS * 100])
+    assert len(results) == 800
+
+
+def test_format_time_12hr_batch(benchmark):
+    results = benchmark(lambda: [format_time_12hr(value) for value in TIMES * 100])
+    assert len(results) == 800
@@ -0,0 +1,64 @@
+from conftest import RECORDED_SEARCH
+
+# ──────────────────────────────────────────────────────────────
+# Search path
+# Parsing the recorded 250-offer response, adding display fields
+# and serving /search: the miss path (fetch, parse, enrich,
+# render) and the cached path (lookup and cached page).
+# ──────────────────────────────────────────────────────────────
+
+SEARCH_URL = (f"/search?origin={RECORDED_SEARCH['origin']}&destination={RECORDED_SEARCH['destination']}"
+              f"&departure_date={RECORDED_SEARCH['departure_date']}&return_date={RECORDED_SEARCH['return_date']}"
+              f"&trip_type=round-trip&adults=1")
+
+
+def test_prices_for_dates_parse(benchmark, stub_amadeus):
+    from src.api.travelpayouts import prices_for_dates, AMADEUS_MAX_RESULTS
+
+    offers = benchmark(
+        prices_for_dates, RECORDED_SEARCH['origin'], RECORDED_SEARCH['destination'],
+        departure_at=RECORDED_SEARCH['departure_date'], return_at=RECORDED_SEARCH['return_date'],
+        limit=AMADEUS_MAX_RESULTS,
+    )
+    assert len(offers) == 250
+    assert offers[0]['price'] <= offers[-1]['price']
+
+
+# enrich_offers() sets every display field each time, so the same
+# list can go through it again
+def test_enrich_offers(benchmark, parsed_offers):
+    from src.core.reference import get_reference
+
+    offers = benchmark(get_reference().enrich_offers, parsed_offers)
+    assert offers[0]['origin_city'] and offers[0]['airline_name']
+
+
+def test_fetch_offers(benchmark, web_app):
+    from src.web import app as web
+
+    params, _ = web.parse_search_args({**RECORDED_SEARCH, 'trip_type': 'round-trip'})
+    offers = benchmark(web.fetch_offers, params)
+    assert len(offers) == 250 and 'airline_name' in offers[0]
+
+
+def test_search_page_miss(benchmark, web_app, monkeypatch):
+    from src.web import app as web
+    from src.core.search_cache import SearchCache, FragmentCache
+
+    client = web_app.test_client()
+
+    # empty caches before each round, so every request fetches and renders
+    def clear_caches():
+        monkeypatch.setattr(web, 'search_cache', SearchCache())
+        monkeypatch.setattr(web, 'results_pages', FragmentCache())
+
+    response = benchmark.pedantic(client.get, args=(SEARCH_URL,), setup=clear_caches, rounds=50)
+    assert response.status_code == 200
+
+
+def test_search_page_cached(benchmark, web_app):
+    client = web_app.test_client()
+    assert client.get(SEARCH_URL).status_code == 200
+
+    response = benchmark(client.get, SEARCH_URL)
+    assert response.status_code == 200
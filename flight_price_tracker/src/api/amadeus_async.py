@@ -0,0 +1,187 @@
+import os
+import time
+import asyncio
+import logging
+
+import aiohttp
+from dotenv import load_dotenv
+
+from src.api.travelpayouts import (APIError, build_search_params, parse_offer, UPSTREAM_SECONDS,
+                                   OFFER_PARSE_SECONDS, OFFERS_PARSED)
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Async Amadeus Client
+# Non-blocking counterpart of travelpayouts.prices_for_dates().
+# The Amadeus SDK uses urllib, so every search holds a thread
+# for the whole round trip. This client talks to the same REST
+# endpoints over one aiohttp session: the searches on one event
+# loop share keep-alive connections and one OAuth2 token. How
+# many run at once is up to the callers (see async_search.py).
+#
+# Responses are parsed with the same parse_offer() as the sync
+# path, so both return identical results.
+# ──────────────────────────────────────────────────────────────
+
+AMADEUS_HOSTS = {
+    'test': 'https://test.api.amadeus.com',
+    'production': 'https://api.amadeus.com',
+}
+
+# Same AMADEUS_HOSTNAME switch the SDK reads; AMADEUS_BASE_URL overrides it (e.g. a local stand-in)
+AMADEUS_BASE_URL = os.getenv('AMADEUS_BASE_URL') or AMADEUS_HOSTS[os.getenv('AMADEUS_HOSTNAME', 'test')]
+AMADEUS_ASYNC_MAX_CONNECTIONS = int(os.getenv('AMADEUS_ASYNC_MAX_CONNECTIONS', 200))  # open sockets to Amadeus
+AMADEUS_ASYNC_TIMEOUT = float(os.getenv('AMADEUS_ASYNC_TIMEOUT', 30))  # seconds per search, connect included
+TOKEN_EXPIRY_MARGIN = 60  # refresh the token this many seconds before it expires
+
+TOKEN_PATH = '/v1/security/oauth2/token'
+FLIGHT_OFFERS_PATH = '/v2/shopping/flight-offers'
+
+
+# Pulls a readable message out of an Amadeus error body
+# ({"errors": [{"title": ..., "detail": ...}]}).
+def _error_message(status, body):
+    errors = body.get('errors') if isinstance(body, dict) else None
+    if errors:
+        first = errors[0]
+        return first.get('detail') or first.get('title') or f"HTTP {status}"
+    if isinstance(body, dict) and body.get('error_description'):
+        return body['error_description']
+    return f"HTTP {status}"
+
+
+class AsyncAmadeusClient:
+    """OAuth2 + Flight Offers Search over a shared aiohttp session."""
+
+    def __init__(self, client_id=None, client_secret=None, base_url=AMADEUS_BASE_URL,
+                 max_connections=AMADEUS_ASYNC_MAX_CONNECTIONS, timeout=AMADEUS_ASYNC_TIMEOUT):
+        """
+        Args:
+            client_id: Amadeus API key (defaults to AMADEUS_API_KEY)
+            client_secret: Amadeus API secret (defaults to AMADEUS_API_SECRET)
+            base_url: Scheme and host of the Amadeus API
+            max_connections: Cap on concurrent sockets; extra searches queue
+            timeout: Seconds allowed for one HTTP request
+        """
+        self.client_id = client_id or os.getenv('AMADEUS_API_KEY')
+        self.client_secret = client_secret or os.getenv('AMADEUS_API_SECRET')
+        self.base_url = base_url.rstrip('/')
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._session = None
+        self._token = None
+        self._token_expires_at = 0
+        self._token_lock = None
+
+    # The session and lock belong to the event loop that first uses
+    # them, so they're created lazily inside a coroutine.
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._token_lock = asyncio.Lock()
+        return self._session
+
+    async def _access_token(self, force=False):
+        session = self._get_session()
+        async with self._token_lock:
+            if not force and self._token and time.time() < self._token_expires_at:
+                return self._token
+
+            async with session.post(self.base_url + TOKEN_PATH, data={
+                'grant_type': 'client_credentials',
+                'client_id': self.client_id,
+                'client_secret': self.client_secret,
+            }) as response:
+                body = await response.json(content_type=None)
+                if response.status != 200:
+                    raise APIError(f"Amadeus API Error: {_error_message(response.status, body)}")
+
+            self._token = body['access_token']
+            self._token_expires_at = time.time() + int(body.get('expires_in', 1799)) - TOKEN_EXPIRY_MARGIN
+            return self._token
+
+    async def flight_offers(self, search_params):
+        """GET /v2/shopping/flight-offers and return the raw offers."""
+        session = self._get_session()
+        for attempt in range(2):
+            token = await self._access_token(force=attempt > 0)
+            async with session.get(self.base_url + FLIGHT_OFFERS_PATH, params=search_params,
+                                   headers={'Authorization': f"Bearer {token}"}) as response:
+                body = await response.json(content_type=None)
+                # expired or revoked token: get a new one and retry once
+                if response.status == 401 and attempt == 0:
+                    continue
+                if response.status != 200:
+                    raise APIError(f"Amadeus API Error: {_error_message(response.status, body)}")
+                return body.get('data', [])
+
+    def reset_after_fork(self):
+        """Forget a session inherited from the parent process (the token stays valid)."""
+        self._session = None
+        self._token_lock = None
+
+    async def close(self):
+        """Close the HTTP session (call from the loop that used it)."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_client = None
+
+
+# Shared client for the async search service; its session lives on
+# whichever event loop first uses it.
+def get_async_client():
+    """Return the process-wide AsyncAmadeusClient."""
+    global _client
+    if _client is None:
+        _client = AsyncAmadeusClient()
+    return _client
+
+
+# Async counterpart of travelpayouts.prices_for_dates(): same
+# arguments, same sorted list of parsed offers, same APIError.
+async def async_prices_for_dates(origin: str, destination: str,
+                                 departure_at: str, return_at: str = None,
+                                 currency: str = "USD", limit: int = 30,
+                                 one_way: bool = False, direct: bool = False,
+                                 adults: int = 1, children: int = 0,
+                                 infants: int = 0, client=None):
+    """Fetch flight offers from Amadeus without blocking the event loop."""
+    client = client or get_async_client()
+    search_params = build_search_params(origin, destination, departure_at, return_at,
+                                        currency, limit, one_way, direct, adults)
+    try:
+        with UPSTREAM_SECONDS.time(client='async'):
+            offers = await client.flight_offers(search_params)
+    except APIError:
+        raise
+    except asyncio.TimeoutError:
+        raise APIError(f"Flight search failed: no response from Amadeus within {client.timeout:.0f}s")
+    except Exception as e:
+        # Network issues, JSON parsing errors, etc.
+        logger.warning("Flight search failed: %s", e)
+        raise APIError(f"Flight search failed: {str(e)}")
+
+    with OFFER_PARSE_SECONDS.time(client='async'):
+        results = [parse_offer(offer, adults, children, infants) for offer in offers]
+    OFFERS_PARSED.inc(len(offers), client='async')
+    results.sort(key=lambda x: x['price'])
+    return results[:limit]
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. AsyncAmadeusClient       - aiohttp session + cached OAuth2 token
+#        .flight_offers()       - Raw Flight Offers Search call
+#   2. get_async_client()       - Shared per-process client
+#   3. async_prices_for_dates() - Non-blocking prices_for_dates()
+# ──────────────────────────────────────────────────────────────
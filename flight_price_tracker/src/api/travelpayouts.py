@@ -1,24 +1,45 @@
 import os
 import re
+import sys
+import time
+import logging
 
 from dotenv import load_dotenv
 from amadeus import Client, ResponseError
 
+# add the project root to the path so `src.` imports resolve when run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.core import metrics
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # ──────────────────────────────────────────────────────────────
 # Amadeus API Configuration
 # Uses OAuth2 client credentials (API key + secret) to
 # authenticate with the Amadeus Flight Offers Search API.
 # ──────────────────────────────────────────────────────────────
 
+# Amadeus returns at most this many offers per search
+AMADEUS_MAX_RESULTS = 250
+
 # Get credentials and validate
 API_KEY = os.getenv('AMADEUS_API_KEY')
 API_SECRET = os.getenv('AMADEUS_API_SECRET')
 
-print(f"DEBUG - Amadeus API Key loaded: {API_KEY[:10] if API_KEY else 'MISSING'}...")
-print(f"DEBUG - Amadeus API Secret loaded: {API_SECRET[:10] if API_SECRET else 'MISSING'}...")
+# only whether they're set is logged, never any part of them
+if not API_KEY or not API_SECRET:
+    logger.warning("Amadeus credentials missing (AMADEUS_API_KEY / AMADEUS_API_SECRET)")
+
+# Shared with amadeus_async.py, which reports under client="async"
+UPSTREAM_SECONDS = metrics.histogram('upstream_search_seconds', 'Amadeus flight-offers search calls',
+                                     ('client', 'outcome'))
+OFFER_PARSE_SECONDS = metrics.histogram('offer_parse_seconds', 'Parsing one search response into offer dicts',
+                                        ('client',))
+OFFERS_PARSED = metrics.counter('offers_parsed', 'Offers parsed from Amadeus responses', ('client',))
 
 # Initialize Amadeus
 # The Client handles token refresh automatically — once created
@@ -100,6 +121,18 @@ def parse_duration(duration_str: str) -> str:
         return f"{minutes}m"
 
 
+# Total minutes in an ISO 8601 duration ("PT2H30M" -> 150).
+# Stored alongside the display string so results can be
+# sorted by duration.
+def duration_minutes(duration_str: str) -> int:
+    """Parse ISO 8601 duration to a total number of minutes."""
+    hour_match = re.search(r'(\d+)H', duration_str)
+    minute_match = re.search(r'(\d+)M', duration_str)
+    hours = int(hour_match.group(1)) if hour_match else 0
+    minutes = int(minute_match.group(1)) if minute_match else 0
+    return hours * 60 + minutes
+
+
 # ──────────────────────────────────────────────────────────────
 # Main Search Function
 # This is the function that app.py and price_checker.py call
@@ -109,6 +142,252 @@ def parse_duration(duration_str: str) -> str:
 # ──────────────────────────────────────────────────────────────
 
 
+# Parses one raw Amadeus offer into a flat dict with outbound +
+# return details and a Skyscanner deep-link for booking.
+def parse_offer(offer, adults=1, children=0, infants=0):
+    """Flatten one Amadeus flight offer into the dict our templates render."""
+    # --- Outbound itinerary ---
+
+    # Get first itinerary [outbound]
+    itinerary = offer['itineraries'][0]
+    segments = itinerary['segments']
+
+    # Get return itinerary if exists
+    # A round-trip offer has two itineraries: [0] = outbound, [1] = return
+    return_itinerary = offer['itineraries'][1] if len(offer['itineraries']) > 1 else None
+
+    # Calculate local transfers (stops)
+    # Each segment is one non-stop leg, so stops = segments - 1
+    transfers = len(segments) - 1
+    return_transfers = len(return_itinerary['segments']) - 1 if return_itinerary else 0
+
+    # Get flight details
+    # first_segment = takeoff info, last_segment = final landing info
+    first_segment = segments[0]
+    last_segment = segments[-1]
+
+    # Calculate duration (in minutes)
+    # Amadeus returns ISO 8601 format like "PT2H30M"
+    duration_str = itinerary['duration']  # Format:PT2H30M
+    duration = parse_duration(duration_str)
+    total_minutes = duration_minutes(duration_str)
+
+    # calculate return flight duration if it exists
+    return_duration = None
+    if return_itinerary:
+        return_duration_str = return_itinerary['duration']
+        return_duration = parse_duration(return_duration_str)
+        total_minutes += duration_minutes(return_duration_str)
+
+    # --- Departure / Arrival times ---
+
+    # extract departure and arrival times
+    departure_datetime = first_segment['departure']['at']  # full datetime
+    arrival_datetime = last_segment['arrival']['at']  # full datetime
+    # Slice out HH:MM from the ISO datetime string (e.g., "2026-02-15T14:30:00" → "14:30")
+    departure_time_24hr = departure_datetime[11:16] if len(departure_datetime) > 11 else None  # HH:MM
+    arrival_time_24hr = arrival_datetime[11:16] if len(arrival_datetime) > 11 else None  # HH:MM
+
+    # converts to 12hr
+    departure_time = format_time_12hr(departure_time_24hr)
+    arrival_time = format_time_12hr(arrival_time_24hr)
+
+    # --- Layover stops ---
+
+    # extract layover stops (intermediate airports)
+    # Each segment's arrival airport (except the last) is a layover
+    layover_stops = []
+    if transfers > 0:
+        for i in range(len(segments) - 1):  # exclude last segment
+            layover_stops.append(segments[i]['arrival']['iataCode'])
+
+    # --- Return flight details ---
+
+    # get return flight details if exists
+    return_departure_time = None
+    return_arrival_time = None
+    return_airline = None
+    return_layover_stops = []
+    if return_itinerary:
+        return_segments = return_itinerary['segments']
+        return_departure_datetime = return_segments[0]['departure']['at']
+        return_arrival_datetime = return_segments[-1]['arrival']['at']
+        return_departure_time_24hr = return_departure_datetime[11:16] if len(return_departure_datetime) > 11 else None
+        return_arrival_time_24hr = return_arrival_datetime[11:16] if len(return_arrival_datetime) > 11 else None
+
+        # gets return airline if it exists
+        return_airline = return_segments[0]['carrierCode']
+
+        # convert to 12hr
+        return_departure_time = format_time_12hr(return_departure_time_24hr)
+        return_arrival_time = format_time_12hr(return_arrival_time_24hr)
+
+        # return flight layovers
+        if return_transfers > 0:
+            for i in range(len(return_segments) - 1):
+                return_layover_stops.append(return_segments[i]['arrival']['iataCode'])
+
+    # --- Skyscanner booking link ---
+
+    # build skyscanner deep link
+    # Formats dates as YYYYMMDD (no dashes) for the Skyscanner URL
+    if return_itinerary:
+        # round trip format: /origin/destination/departdate/returndate
+        return_date_str = return_itinerary['segments'][0]['departure']['at'][:10].replace('-', '')
+        departure_date_str = first_segment['departure']['at'][:10].replace('-', '')
+        link = (
+            f"https://www.skyscanner.com/transport/flights/"
+            f"{first_segment['departure']['iataCode']}/"
+            f"{last_segment['arrival']['iataCode']}/"
+            f"{departure_date_str}/{return_date_str}/"
+            f"?adults={adults}&adultsv2={adults}&cabinclass=economy"
+            f"&children={children}&childrenv2="
+            f"&inboundaltsenabled=false&infants={infants}"
+            f"&outboundaltsenabled=false&preferdirects=false"
+            f"&ref=home&rtn=1"
+        )
+    else:
+        # for one way flights
+        departure_date_str = first_segment['departure']['at'][:10].replace('-', '')
+        link = (
+            f"https://www.skyscanner.com/transport/flights/"
+            f"{first_segment['departure']['iataCode']}/"
+            f"{last_segment['arrival']['iataCode']}/"
+            f"{departure_date_str}/"
+            f"?adults={adults}&adultsv2={adults}&cabinclass=economy"
+            f"&children={children}&childrenv2="
+            f"&inboundaltsenabled=false&infants={infants}"
+            f"&outboundaltsenabled=false&preferdirects=false"
+            f"&ref=home&rtn=0"
+        )
+
+    # --- Build the normalised result ---
+
+    # Build result obj matching existing format
+    return {
+        "price": float(offer['price']['total']),
+        "origin": first_segment['departure']['iataCode'],
+        "destination": last_segment['arrival']['iataCode'],
+        "depart_date": first_segment['departure']['at'][:10],  # YYYY-MM-DD
+        "departure_time": departure_time,
+        "arrival_time": arrival_time,
+        "return_date": return_itinerary['segments'][0]['departure']['at'][:10] if return_itinerary else None,
+        "return_departure_time": return_departure_time,
+        "return_arrival_time": return_arrival_time,
+        "airline": first_segment['carrierCode'],
+        "return_airline": return_airline,
+        "transfers": transfers,
+        "return_transfers": return_transfers,
+        "layover_stops": layover_stops,
+        "return_layover_stops": return_layover_stops,
+        "duration": duration,
+        "return_duration": return_duration,
+        "duration_minutes": total_minutes,  # outbound + return, for sorting
+        "flight_number": f"{first_segment['carrierCode']}{first_segment['number']}",
+        "link": link,  # Generic booking link
+    }
+
+
+# Converts an Amadeus ResponseError into an APIError, logging
+# everything we can for debugging.
+def _amadeus_error(error):
+    # Get error message
+    error_msg = "Unknown error"
+    if hasattr(error, 'description'):
+        error_msg = error.description() if callable(error.description) else error.description
+
+    response = getattr(error, 'response', None)
+    logger.warning("Amadeus API error %s: %s", type(error).__name__, error_msg, extra={
+        'status': response.status_code if response else None,
+        'body': response.body if response else None,
+    })
+
+    return APIError(f"Amadeus API Error: {error_msg}")
+
+
+# Builds the Flight Offers Search query parameters. Shared with
+# the async client in amadeus_async.py so both send the same query.
+def build_search_params(origin: str, destination: str,
+                        departure_at: str, return_at: str = None,
+                        currency: str = "USD", limit: int = 30,
+                        one_way: bool = False, direct: bool = False,
+                        adults: int = 1) -> dict:
+    """Amadeus query parameters for a search (see prices_for_dates() for the arguments)."""
+    search_params = {
+        'originLocationCode': origin,
+        'destinationLocationCode': destination,
+        'departureDate': departure_at,
+        'adults': adults,
+        'currencyCode': currency,
+        'max': min(limit, AMADEUS_MAX_RESULTS),
+    }
+
+    # Add return date for round-trip
+    if return_at and not one_way:
+        search_params['returnDate'] = return_at
+
+    # Add non-stop filter if requested
+    if direct:
+        search_params['nonStop'] = 'true'
+
+    return search_params
+
+
+# Calls the Amadeus API and yields each offer as soon as it is
+# parsed, in the order Amadeus returns them. Used directly by the
+# streaming search page; prices_for_dates() collects and sorts it.
+def iter_prices_for_dates(origin: str, destination: str,
+                          departure_at: str, return_at: str = None,
+                          currency: str = "USD", limit: int = 30,
+                          one_way: bool = False, direct: bool = False,
+                          adults: int = 1, children: int = 0,
+                          infants: int = 0):
+    """
+    Fetch flight offers from Amadeus and yield them one at a time.
+
+    Takes the same arguments as prices_for_dates(). Offers are not
+    sorted; raises APIError on failure.
+    """
+    try:
+        # ── Build the API request parameters ──────────────────
+
+        # Build search parameters
+        search_params = build_search_params(origin, destination, departure_at, return_at,
+                                            currency, limit, one_way, direct, adults)
+
+        logger.debug("Searching flights %s -> %s", origin, destination, extra={'params': search_params})
+
+        # ── Call the Amadeus API ──────────────────────────────
+
+        # Make API call
+        with UPSTREAM_SECONDS.time(client='sdk'):
+            response = amadeus.shopping.flight_offers_search.get(**search_params)
+
+        logger.debug("Amadeus returned %d offers", len(response.data), extra={'status': response.status_code})
+
+        # ── Parse each offer into a flat result dict ──────────
+
+        # Only parsing is timed, not the time the consumer spends
+        # between offers (the streaming page flushes each one).
+        parse_seconds = 0.0
+        for offer in response.data:
+            start = time.perf_counter()
+            parsed = parse_offer(offer, adults, children, infants)
+            parse_seconds += time.perf_counter() - start
+            yield parsed
+        OFFER_PARSE_SECONDS.observe(parse_seconds, client='sdk')
+        OFFERS_PARSED.inc(len(response.data), client='sdk')
+
+    except ResponseError as error:
+        # Amadeus-specific error
+        raise _amadeus_error(error)
+
+    except Exception as e:
+        # Catch-all for network issues, JSON parsing errors, etc.
+        logger.warning("Flight search failed: %s", e)
+        raise APIError(f"Flight search failed: {str(e)}")
+
+
 # Fetches flight offers from the Amadeus API, parses each offer
 # into a flat dict with outbound + return details, builds a
 # Skyscanner deep-link for booking, and returns them sorted by
@@ -136,215 +415,17 @@ def prices_for_dates(origin: str, destination: str,
         List of flight deals with price, dates, airline, etc.
 
     """
-    try:
-        print(f"DEBUG - Searching flights: {origin} -> {destination}")
-        print(f"DEBUG - Departure: {departure_at}, Return: {return_at}, One-way: {one_way}")
-
-        # ── Build the API request parameters ──────────────────
-
-        # Build search parameters
-        search_params = {
-            'originLocationCode': origin,
-            'destinationLocationCode': destination,
-            'departureDate': departure_at,
-            'adults': adults,
-            'currencyCode': currency,
-            'max': min(limit, 250),  # Amadeus max is 250
-        }
-
-        # Add return date for round-trip
-        if return_at and not one_way:
-            search_params['returnDate'] = return_at
-
-        # Add non-stop filter if requested
-        if direct:
-            search_params['nonStop'] = 'true'
+    results = list(iter_prices_for_dates(
+        origin, destination, departure_at, return_at, currency, limit,
+        one_way, direct, adults, children, infants,
+    ))
 
-        print(f"DEBUG - API Parameters: {search_params}")
+    # ── Sort and return ───────────────────────────────────
 
-        # ── Call the Amadeus API ──────────────────────────────
-
-        # Make API call
-        response = amadeus.shopping.flight_offers_search.get(**search_params)
-
-        print(f"DEBUG - Response status: {response.status_code}")
-        print(f"DEBUG - Number of offers: {len(response.data)}")
-
-        # ── Parse each offer into a flat result dict ──────────
-
-        # Parse results
-        results = []
-        for offer in response.data:
-
-            # --- Outbound itinerary ---
-
-            # Get first itinerary [outbound]
-            itinerary = offer['itineraries'][0]
-            segments = itinerary['segments']
-
-            # Get return itinerary if exists
-            # A round-trip offer has two itineraries: [0] = outbound, [1] = return
-            return_itinerary = offer['itineraries'][1] if len(offer['itineraries']) > 1 else None
-
-            # Calculate local transfers (stops)
-            # Each segment is one non-stop leg, so stops = segments - 1
-            transfers = len(segments) - 1
-            return_transfers = len(return_itinerary['segments']) - 1 if return_itinerary else 0
-
-            # Get flight details
-            # first_segment = takeoff info, last_segment = final landing info
-            first_segment = segments[0]
-            last_segment = segments[-1]
-
-            # Calculate duration (in minutes)
-            # Amadeus returns ISO 8601 format like "PT2H30M"
-            duration_str = itinerary['duration']  # Format:PT2H30M
-            duration = parse_duration(duration_str)
-
-            # calculate return flight duration if it exists
-            return_duration = None
-            if return_itinerary:
-                return_duration_str = return_itinerary['duration']
-                return_duration = parse_duration(return_duration_str)
-
-            # --- Departure / Arrival times ---
-
-            # extract departure and arrival times
-            departure_datetime = first_segment['departure']['at']  # full datetime
-            arrival_datetime = last_segment['arrival']['at']  # full datetime
-            # Slice out HH:MM from the ISO datetime string (e.g., "2026-02-15T14:30:00" → "14:30")
-            departure_time_24hr = departure_datetime[11:16] if len(departure_datetime) > 11 else None  # HH:MM
-            arrival_time_24hr = arrival_datetime[11:16] if len(arrival_datetime) > 11 else None  # HH:MM
-
-            # converts to 12hr
-            departure_time = format_time_12hr(departure_time_24hr)
-            arrival_time = format_time_12hr(arrival_time_24hr)
-
-            # --- Layover stops ---
-
-            # extract layover stops (intermediate airports)
-            # Each segment's arrival airport (except the last) is a layover
-            layover_stops = []
-            if transfers > 0:
-                for i in range(len(segments) - 1):  # exclude last segment
-                    layover_stops.append(segments[i]['arrival']['iataCode'])
-
-            # --- Return flight details ---
-
-            # get return flight details if exists
-            return_departure_time = None
-            return_arrival_time = None
-            return_airline = None
-            return_layover_stops = []
-            if return_itinerary:
-                return_segments = return_itinerary['segments']
-                return_departure_datetime = return_segments[0]['departure']['at']
-                return_arrival_datetime = return_segments[-1]['arrival']['at']
-                return_departure_time_24hr = return_departure_datetime[11:16] if len(return_departure_datetime) > 11 else None
-                return_arrival_time_24hr = return_arrival_datetime[11:16] if len(return_arrival_datetime) > 11 else None
-
-                # gets return airline if it exists
-                return_airline = return_segments[0]['carrierCode']
-
-                # convert to 12hr
-                return_departure_time = format_time_12hr(return_departure_time_24hr)
-                return_arrival_time = format_time_12hr(return_arrival_time_24hr)
-
-                # return flight layovers
-                if return_transfers > 0:
-                    for i in range(len(return_segments) - 1):
-                        return_layover_stops.append(return_segments[i]['arrival']['iataCode'])
-
-            # --- Skyscanner booking link ---
-
-            # build skyscanner deep link
-            # Formats dates as YYYYMMDD (no dashes) for the Skyscanner URL
-            if return_itinerary:
-                # round trip format: /origin/destination/departdate/returndate
-                return_date_str = return_itinerary['segments'][0]['departure']['at'][:10].replace('-', '')
-                departure_date_str = first_segment['departure']['at'][:10].replace('-', '')
-                link = (
-                    f"https://www.skyscanner.com/transport/flights/"
-                    f"{first_segment['departure']['iataCode']}/"
-                    f"{last_segment['arrival']['iataCode']}/"
-                    f"{departure_date_str}/{return_date_str}/"
-                    f"?adults={adults}&adultsv2={adults}&cabinclass=economy"
-                    f"&children={children}&childrenv2="
-                    f"&inboundaltsenabled=false&infants={infants}"
-                    f"&outboundaltsenabled=false&preferdirects=false"
-                    f"&ref=home&rtn=1"
-                )
-            else:
-                # for one way flights
-                departure_date_str = first_segment['departure']['at'][:10].replace('-', '')
-                link = (
-                    f"https://www.skyscanner.com/transport/flights/"
-                    f"{first_segment['departure']['iataCode']}/"
-                    f"{last_segment['arrival']['iataCode']}/"
-                    f"{departure_date_str}/"
-                    f"?adults={adults}&adultsv2={adults}&cabinclass=economy"
-                    f"&children={children}&childrenv2="
-                    f"&inboundaltsenabled=false&infants={infants}"
-                    f"&outboundaltsenabled=false&preferdirects=false"
-                    f"&ref=home&rtn=0"
-                )
-
-            # --- Append the normalised result ---
-
-            # Build result obj matching existing format
-            results.append({
-                "price": float(offer['price']['total']),
-                "origin": first_segment['departure']['iataCode'],
-                "destination": last_segment['arrival']['iataCode'],
-                "depart_date": first_segment['departure']['at'][:10],  # YYYY-MM-DD
-                "departure_time": departure_time,
-                "arrival_time": arrival_time,
-                "return_date": return_itinerary['segments'][0]['departure']['at'][:10] if return_itinerary else None,
-                "return_departure_time": return_departure_time,
-                "return_arrival_time": return_arrival_time,
-                "airline": first_segment['carrierCode'],
-                "return_airline": return_airline,
-                "transfers": transfers,
-                "return_transfers": return_transfers,
-                "layover_stops": layover_stops,
-                "return_layover_stops": return_layover_stops,
-                "duration": duration,
-                "return_duration": return_duration,
-                "flight_number": f"{first_segment['carrierCode']}{first_segment['number']}",
-                "link": link,  # Generic booking link
-            })
-
-        # ── Sort and return ───────────────────────────────────
-
-        # sort by price
-        results.sort(key=lambda x: x['price'])
-
-        print(f"DEBUG - Returning {len(results)} flights")
-        return results[:limit]  # return only requested limit
-
-    except ResponseError as error:
-        # Amadeus-specific error — log everything we can for debugging
-        print(f"DEBUG - Amadeus API error:")
-        print(f"  Error Type: {type(error).__name__}")
-        if hasattr(error, 'response') and error.response:
-            print(f"  Status Code: {error.response.status_code}")
-            print(f"  Error Details: {error.response.body}")
-        if hasattr(error, 'description'):
-            desc = error.description() if callable(error.description) else error.description
-            print(f"  Description: {desc}")
-        print(f"  Full Error: {str(error)}")
-
-        # Get error message
-        error_msg = "Unknown error"
-        if hasattr(error, 'description'):
-            error_msg = error.description() if callable(error.description) else error.description
-
-        raise APIError(f"Amadeus API Error: {error_msg}")
+    # sort by price
+    results.sort(key=lambda x: x['price'])
 
-    except Exception as e:
-        # Catch-all for network issues, JSON parsing errors, etc.
-        print(f"DEBUG - Unexpected Error: {str(e)}")
-        raise APIError(f"Flight search failed: {str(e)}")
+    return results[:limit]  # return only requested limit
 
 
 # ──────────────────────────────────────────────────────────────
@@ -366,5 +447,9 @@ if __name__ == "__main__":
 # Function Reference
 #   1. format_time_12hr()   - Converts "14:30" → "2:30 PM"
 #   2. parse_duration()     - Converts "PT2H30M" → "2h 30m"
-#   3. prices_for_dates()   - Main search: calls Amadeus API, parses offers, returns sorted list
+#   3. duration_minutes()   - Converts "PT2H30M" → 150
+#   4. parse_offer()        - Flattens one raw Amadeus offer into a result dict
+#   5. build_search_params() - Amadeus query parameters (shared with amadeus_async.py)
+#   6. iter_prices_for_dates() - Calls Amadeus API and yields parsed offers as they're ready
+#   7. prices_for_dates()   - Main search: calls Amadeus API, parses offers, returns sorted list
 # ──────────────────────────────────────────────────────────────
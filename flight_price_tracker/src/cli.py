@@ -1,5 +1,12 @@
+import os
+import sys
 from datetime import date, timedelta
-from api.travelpayouts import prices_for_dates, TOKEN # imports api function and token (prices_for_dates = searches flights) (TOKEN API key from .env)
+
+# the API and core modules import each other through the src package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.travelpayouts import prices_for_dates # imports api function (prices_for_dates = searches flights)
+from core.reference import get_reference # shared airport/airline lookups (city and airline names)
 
 def main():
     # test cities
@@ -27,6 +34,9 @@ def main():
         print("❌ No deals found")
         return
 
+    # adds city and airline names to every deal in one pass
+    get_reference().enrich_offers(deals)
+
     # Show top 10 cheapest deals
     print("Top 10 Cheapest Flights:")
     print("-" * 80)
@@ -40,9 +50,9 @@ def main():
     # :10 means to sort only 10 lowest
     for d in sorted(deals, key=lambda x: x['price'])[:10]: # sorts by prices (lowest first)
         usd_price = d['price'] * RUB_TO_USD  # Convert RUB to USD
-        print(f"  ${usd_price:.2f} • {d['origin']}→{d['destination']} "
+        print(f"  ${usd_price:.2f} • {d['origin_city']} ({d['origin']})→{d['destination_city']} ({d['destination']}) "
               f"({d['depart_date'][:10]} → {d['return_date'][:10]}) • " # :10 takes the first 10 characters "2026-01-19T09:35:00-08:00" -> "2026-01-19"
-              f"airline:{d.get('airline') or '—'} • stops:{d.get('transfers')}")
+              f"airline:{d.get('airline_name') or '—'} • stops:{d.get('transfers')}")
 
 if __name__ == "__main__":
     print("🔧 __main__ hit")
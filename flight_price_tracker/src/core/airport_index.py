@@ -0,0 +1,256 @@
+import re
+import heapq
+import unicodedata
+from bisect import bisect_left
+from array import array
+from collections import Counter
+from functools import lru_cache
+
+# ──────────────────────────────────────────────────────────────
+# Airport Autocomplete Index
+# Built once at startup over each airport's code, city, state,
+# country and name so /api/airports can answer a keystroke
+# without scanning the whole list. Two structures are kept:
+#
+#   - Prefix index: every word of every field, sorted, each with
+#     an ascending list of airport ids. A bisect over the sorted
+#     words gives the same "all words starting with X" range a
+#     trie would, in a fraction of the memory.
+#   - Trigram index: trigram -> airport ids, used as a fuzzy
+#     fallback for typos and mid-word matches ("ngel" -> Los Angeles).
+#
+# Results are ranked (exact code, code prefix, city prefix, ...)
+# and the answers for 1-2 character prefixes, the only queries
+# with very wide ranges, are precomputed.
+# ──────────────────────────────────────────────────────────────
+
+MAX_LIMIT = 20  # hard cap on results per query
+SHORT_PREFIX_LEN = 2  # queries this short are served from precomputed lists
+QUERY_CACHE_SIZE = 4096  # recently seen queries kept in an LRU
+FUZZY_MIN_LEN = 4  # trigram fallback only kicks in for queries this long
+
+# Match tiers, lowest is best
+TIER_CODE_EXACT = 0
+TIER_CODE_PREFIX = 1
+TIER_CITY_PREFIX = 2
+TIER_NAME_PREFIX = 3
+# ...then any other word prefix match, then trigram (fuzzy) matches
+
+
+# ──────────────────────────────────────────────────────────────
+# Text Helpers
+# ──────────────────────────────────────────────────────────────
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    """Lowercase and strip accents ("São Paulo" -> "sao paulo")."""
+    if not text:
+        return ''
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    """Split normalized text into alphanumeric words."""
+    return _WORD_RE.findall(normalize(text))
+
+
+def trigrams(text):
+    """Set of 3-character substrings of the words in `text`, padded at word starts."""
+    return _word_trigrams(tokenize(text))
+
+
+def _word_trigrams(words):
+    grams = set()
+    for word in words:
+        padded = f" {word}"
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# ──────────────────────────────────────────────────────────────
+# Index
+# ──────────────────────────────────────────────────────────────
+
+
+class _SortedPrefixIndex:
+    """Sorted (key, id) pairs as two flat lists; bisect gives every key with a prefix."""
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        self.keys = [key for key, _ in pairs]
+        self.ids = array('I', (airport_id for _, airport_id in pairs))
+
+    def range(self, prefix):
+        """Return (start, end) positions of keys starting with `prefix`."""
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + '\uffff', start)
+        return start, end
+
+
+class AirportIndex:
+    """Ranked prefix + trigram search over a list of airport dicts."""
+
+    def __init__(self, airports):
+        """
+        Args:
+            airports: List of dicts with code, city, state, state_abbr,
+                      country and name. List order is used as the
+                      tie-breaker, so put the busiest airports first.
+        """
+        # Compact result rows returned to the client
+        self.results = tuple(
+            {
+                'code': a['code'],
+                'city': a.get('city', ''),
+                'name': a.get('name', ''),
+                'country': a.get('country', ''),
+            }
+            for a in airports
+        )
+
+        # --- Word prefix index: unique sorted words, each with ascending airport ids ---
+        postings = {}
+        grams = {}
+        airport_words = []
+        for airport_id, a in enumerate(airports):
+            text = ' '.join(filter(None, (
+                a.get('code'), a.get('city'), a.get('state'),
+                a.get('state_abbr'), a.get('country'), a.get('name'),
+            )))
+            words = tuple(dict.fromkeys(tokenize(text)))
+            airport_words.append(words)
+            for word in words:
+                postings.setdefault(word, array('I')).append(airport_id)
+            for gram in _word_trigrams(words):
+                grams.setdefault(gram, array('I')).append(airport_id)
+
+        self._words = sorted(postings)
+        self._postings = [postings[word] for word in self._words]
+        self._airport_words = tuple(airport_words)
+        self._trigrams = grams
+
+        # --- Field prefix indexes used for the top ranking tiers ---
+        self._by_code = _SortedPrefixIndex((a['code'].lower(), i) for i, a in enumerate(airports))
+        self._by_city = _SortedPrefixIndex((normalize(a.get('city', '')), i) for i, a in enumerate(airports))
+        self._by_name = _SortedPrefixIndex((normalize(a.get('name', '')), i) for i, a in enumerate(airports))
+
+        # --- Precompute answers for the widest (shortest) prefixes ---
+        self._short = {}
+        prefixes = {word[:n] for word in self._words for n in range(1, SHORT_PREFIX_LEN + 1)}
+        for prefix in prefixes:
+            self._short[prefix] = tuple(self._rank(prefix, [prefix], MAX_LIMIT))
+
+        self._cached_search = lru_cache(maxsize=QUERY_CACHE_SIZE)(self._search)
+
+    def __len__(self):
+        return len(self.results)
+
+    # Ascending airport ids having a word that starts with `prefix`.
+    # Each word's posting list is already sorted, so this is a lazy
+    # k-way merge and callers can stop after the first few ids.
+    def _prefix_stream(self, prefix):
+        start = bisect_left(self._words, prefix)
+        end = bisect_left(self._words, prefix + '\uffff', start)
+        last = None
+        for airport_id in heapq.merge(*self._postings[start:end]):
+            if airport_id != last:
+                last = airport_id
+                yield airport_id
+
+    def _prefix_size(self, prefix):
+        start = bisect_left(self._words, prefix)
+        end = bisect_left(self._words, prefix + '\uffff', start)
+        return sum(len(p) for p in self._postings[start:end])
+
+    def _matches_all(self, airport_id, words):
+        """True if every query word prefixes some word of the airport."""
+        airport_words = self._airport_words[airport_id]
+        return all(any(w.startswith(q) for w in airport_words) for q in words)
+
+    # Best `limit` ids for a query. Code/city/name prefix matches come
+    # from the small field indexes; the rest are filled in list order
+    # from the most selective query word's posting lists.
+    def _rank(self, query, words, limit):
+        ranked = []
+        for tier_index, tier in ((self._by_code, TIER_CODE_PREFIX),
+                                 (self._by_city, TIER_CITY_PREFIX),
+                                 (self._by_name, TIER_NAME_PREFIX)):
+            start, end = tier_index.range(query)
+            for pos in range(start, end):
+                airport_id = tier_index.ids[pos]
+                exact = tier == TIER_CODE_PREFIX and tier_index.keys[pos] == query
+                ranked.append((TIER_CODE_EXACT if exact else tier, airport_id))
+
+        ranked.sort()
+        ids = list(dict.fromkeys(airport_id for _, airport_id in ranked))[:limit]
+        if len(ids) >= limit:
+            return ids
+
+        seen = set(ids)
+        driver = min(words, key=self._prefix_size)
+        for airport_id in self._prefix_stream(driver):
+            if airport_id in seen or not self._matches_all(airport_id, words):
+                continue
+            ids.append(airport_id)
+            if len(ids) >= limit:
+                break
+        return ids
+
+    # Trigram fallback: airports sharing most of the query's
+    # trigrams, best overlap first.
+    def _fuzzy(self, query, exclude, limit):
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        counts = Counter()
+        for gram in query_grams:
+            counts.update(self._trigrams.get(gram, ()))
+        needed = max(2, -(-len(query_grams) * 2 // 3))  # at least 2/3 of the trigrams
+        matches = [(-hits, airport_id) for airport_id, hits in counts.items()
+                   if hits >= needed and airport_id not in exclude]
+        matches.sort()
+        return [airport_id for _, airport_id in matches[:limit]]
+
+    def _search(self, query, limit):
+        words = tokenize(query)
+        if not words:
+            return ()
+        query = ' '.join(words)
+
+        if len(words) == 1 and len(query) <= SHORT_PREFIX_LEN:
+            ids = self._short.get(query, ())[:limit]
+        else:
+            ids = self._rank(query, words, limit)
+            if len(ids) < limit and len(query) >= FUZZY_MIN_LEN:
+                ids = ids + self._fuzzy(query, set(ids), limit - len(ids))
+
+        return tuple(self.results[airport_id] for airport_id in ids)
+
+    def search(self, query, limit=8):
+        """
+        Find airports matching what the user has typed so far.
+
+        Args:
+            query: Partial code, city, state, country or airport name
+            limit: Max results (capped at MAX_LIMIT)
+
+        Returns:
+            List of {code, city, name, country} dicts, best match first
+        """
+        limit = max(1, min(int(limit), MAX_LIMIT))
+        return list(self._cached_search(normalize(query).strip(), limit))
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. normalize()          - Lowercases and strips accents
+#   2. tokenize()           - Splits text into searchable words
+#   3. trigrams()           - 3-character grams used for fuzzy matching
+#   4. AirportIndex         - Prefix + trigram index over the airport list
+#        .search()          - Ranked, limited autocomplete results
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,448 @@
+import os
+import re
+import sys
+import csv
+import json
+import logging
+import argparse
+from datetime import date
+
+import pymysql
+from dotenv import load_dotenv
+
+# add the project root to the path so `src.` imports resolve when run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.core.db import create_alerts
+from src.core.email_service import generate_verification_token, send_bulk_verification_email, BULK_EMAIL_MAX_ROWS
+from src.core.sms_service import generate_verification_code, send_bulk_verification_sms
+from src.core.notification_queue import notification_queue
+from src.core.logs import configure_logging
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Bulk Alert Import
+# Creates alerts from a CSV or JSON file (POST /alerts/import, or
+# run this file directly). Rows are read and validated one at a
+# time, valid ones are inserted ALERT_IMPORT_BATCH_SIZE at a time
+# (one multi-row INSERT and one transaction per batch, see
+# db.create_alerts), and invalid ones are reported by line.
+#
+# Every alert for the same email shares one verification token,
+# and every alert for the same phone one code, so each contact
+# gets a single verification message listing all of their new
+# alerts instead of one per row.
+#
+# If a batch insert fails the import stops there: batches already
+# committed stay, and their contacts still get their verification
+# messages (otherwise those alerts could never be activated); the
+# failed batch and the unread rows are not imported.
+#
+# Columns / keys (same as the /alerts form):
+#   email, phone, origin, destination, departure_date,
+#   return_date, price_threshold, trip_type
+# ──────────────────────────────────────────────────────────────
+
+ALERT_IMPORT_BATCH_SIZE = int(os.getenv('ALERT_IMPORT_BATCH_SIZE', 500))  # rows per INSERT/transaction
+ALERT_IMPORT_MAX_ROWS = int(os.getenv('ALERT_IMPORT_MAX_ROWS', 50000))  # rows read per import
+ALERT_IMPORT_MAX_ERRORS = 100  # row errors listed in the result (all are counted)
+
+IMPORT_FORMATS = ('csv', 'json', 'jsonl')
+TRIP_TYPES = ('one-way', 'round-trip')
+
+_AIRPORT_CODE = re.compile(r'^[A-Z]{3}$')
+_PHONE = re.compile(r'^\+[1-9]\d{7,14}$')  # E.164
+_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+
+class AlertImportError(ValueError):
+    """Raised when the file itself can't be read (as opposed to a bad row)."""
+    pass
+
+
+# ──────────────────────────────────────────────────────────────
+# Readers
+# Each yields (line_number, row_dict) without loading the whole
+# file. Line numbers are what the errors are reported against.
+# ──────────────────────────────────────────────────────────────
+
+
+def iter_csv(stream):
+    """Rows of a CSV file with a header line."""
+    reader = csv.DictReader(stream)
+    if reader.fieldnames is None:
+        return
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_json_lines(stream):
+    """Rows of a JSON Lines file (one object per line)."""
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            raise AlertImportError(f"Line {line_number}: invalid JSON ({e.msg})")
+
+
+# Decodes the array one element at a time from a sliding buffer,
+# so a large upload is never held in memory as a whole. Rows are
+# numbered by position in the array.
+def iter_json_array(stream, chunk_size=65536):
+    """Rows of a JSON array of objects."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    eof = False
+    while not buffer and not eof:
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer = chunk.lstrip()
+    if not buffer.startswith('['):
+        raise AlertImportError("Expected a JSON array of alerts")
+    buffer = buffer[1:]
+    index = 0
+
+    while True:
+        buffer = buffer.lstrip()
+        if not buffer and not eof:
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        if buffer.startswith(']'):
+            return
+        if index and buffer.startswith(','):
+            buffer = buffer[1:].lstrip()
+        try:
+            item, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise AlertImportError(f"Item {index + 1}: invalid JSON ({e.msg})")
+            # the item may just be cut off at the end of the buffer
+            chunk = stream.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        index += 1
+        buffer = buffer[end:]
+        yield index, item
+
+
+def iter_rows(stream, fmt):
+    """(line_number, row) pairs from a text stream in one of IMPORT_FORMATS."""
+    if fmt == 'csv':
+        return iter_csv(stream)
+    if fmt == 'jsonl':
+        return iter_json_lines(stream)
+    if fmt == 'json':
+        return iter_json_array(stream)
+    raise AlertImportError(f"Unsupported format {fmt!r} (expected one of {', '.join(IMPORT_FORMATS)})")
+
+
+# Guesses the format from a filename or content type
+def detect_format(filename=None, content_type=None):
+    """One of IMPORT_FORMATS, or None if it can't be told."""
+    name = (filename or '').lower()
+    content_type = (content_type or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')) or 'ndjson' in content_type or 'jsonl' in content_type:
+        return 'jsonl'
+    if name.endswith('.json') or 'json' in content_type:
+        return 'json'
+    if name.endswith('.csv') or 'csv' in content_type:
+        return 'csv'
+    return None
+
+
+# ──────────────────────────────────────────────────────────────
+# Validation
+# ──────────────────────────────────────────────────────────────
+
+
+def _text(row, field):
+    value = row.get(field)
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _date(row, field):
+    value = _text(row, field)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{field} must be YYYY-MM-DD")
+
+
+# Same rules as the /alerts form, plus the checks the form leaves
+# to the browser (formats, dates in the future).
+def validate_row(row, today=None):
+    """
+    Check one import row.
+
+    Returns:
+        Dict of create_alert arguments (without tokens)
+
+    Raises:
+        ValueError describing the first problem found
+    """
+    if not isinstance(row, dict):
+        raise ValueError("Expected an object with alert fields")
+    today = today or date.today()
+
+    email = _text(row, 'email') or None
+    phone = _text(row, 'phone') or None
+    if not email and not phone:
+        raise ValueError("email or phone is required")
+    if email and (len(email) > 255 or not _EMAIL.match(email)):
+        raise ValueError(f"Invalid email {email!r}")
+    if phone and not _PHONE.match(phone):
+        raise ValueError("phone must include country code (e.g., +15551234567)")
+
+    origin = _text(row, 'origin').upper()
+    destination = _text(row, 'destination').upper()
+    for field, code in (('origin', origin), ('destination', destination)):
+        if not _AIRPORT_CODE.match(code):
+            raise ValueError(f"{field} must be a 3-letter airport code")
+    if origin == destination:
+        raise ValueError("origin and destination are the same")
+
+    departure_date = _date(row, 'departure_date')
+    return_date = _date(row, 'return_date')
+    if departure_date is None:
+        raise ValueError("departure_date is required")
+    if departure_date < today:
+        raise ValueError("departure_date is in the past")
+
+    trip_type = _text(row, 'trip_type').lower() or ('round-trip' if return_date else 'one-way')
+    if trip_type not in TRIP_TYPES:
+        raise ValueError(f"trip_type must be one of {', '.join(TRIP_TYPES)}")
+    if trip_type == 'one-way':
+        return_date = None
+    elif return_date is None:
+        raise ValueError("return_date is required for round-trip alerts")
+    elif return_date < departure_date:
+        raise ValueError("return_date is before departure_date")
+
+    try:
+        price_threshold = round(float(_text(row, 'price_threshold')), 2)
+    except ValueError:
+        raise ValueError("price_threshold must be a number")
+    if not 0 < price_threshold < 100_000_000:  # DECIMAL(10,2)
+        raise ValueError("price_threshold must be greater than 0")
+
+    return {
+        'email': email,
+        'phone': phone,
+        'origin': origin,
+        'destination': destination,
+        'departure_date': departure_date.isoformat(),
+        'return_date': return_date.isoformat() if return_date else None,
+        'price_threshold': price_threshold,
+        'trip_type': trip_type,
+    }
+
+
+# ──────────────────────────────────────────────────────────────
+# Import
+# ──────────────────────────────────────────────────────────────
+
+
+def _alert_details(alert):
+    """The alert_details dict the notification functions take."""
+    return {
+        'origin': alert['origin'],
+        'destination': alert['destination'],
+        'departure_date': alert['departure_date'],
+        'return_date': alert['return_date'],
+        'price_threshold': alert['price_threshold'],
+        'trip_type': alert['trip_type'],
+    }
+
+
+# Each contact collects the token/code shared by its alerts, the
+# first alert's id (delivery status is tracked under it) and the
+# details listed in its verification message.
+def _new_contact(secret):
+    return {'secret': secret, 'first_id': None, 'count': 0, 'details': []}
+
+
+def import_alerts(rows, batch_size=ALERT_IMPORT_BATCH_SIZE, max_rows=ALERT_IMPORT_MAX_ROWS,
+                  send_verifications=True, dry_run=False):
+    """
+    Validate and insert alerts from (line_number, row) pairs.
+
+    Args:
+        rows: Iterable of (line_number, row_dict), e.g. from iter_rows()
+        batch_size: Alerts per INSERT/transaction
+        max_rows: Rows read before the import stops
+        send_verifications: Queue one verification email/SMS per contact
+        dry_run: Validate only; nothing is written or sent
+
+    Returns:
+        Summary dict: imported, rejected, duplicates, errors (first
+        ALERT_IMPORT_MAX_ERRORS), verification counts, and `error`
+        if the file stopped being readable part way or an insert
+        failed (`failed` then counts the rows in that batch)
+    """
+    result = {
+        'imported': 0,
+        'rejected': 0,
+        'duplicates': 0,
+        'failed': 0,
+        'errors': [],
+        'truncated': False,
+        'dry_run': dry_run,
+        'verifications': {'email': 0, 'sms': 0},
+    }
+    emails = {}  # email -> contact (see _new_contact)
+    phones = {}  # phone -> contact
+    seen = set()  # rows already accepted in this import
+    batch = []
+
+    def reject(line_number, message):
+        result['rejected'] += 1
+        if len(result['errors']) < ALERT_IMPORT_MAX_ERRORS:
+            result['errors'].append({'line': line_number, 'error': message})
+
+    # Inserts the batch, then files each new alert under its contacts.
+    # Returns False if the insert failed (the batch is dropped).
+    def flush():
+        if not batch:
+            return True
+        try:
+            alert_ids = [None] * len(batch) if dry_run else create_alerts(batch)
+        except pymysql.Error as e:
+            logger.error("Alert import stopped by a database error after %d alerts: %s", result['imported'], e)
+            result['error'] = f"Database error after {result['imported']} imported alerts; the rest were not imported"
+            result['failed'] += len(batch)
+            batch.clear()
+            return False
+        for alert_id, alert in zip(alert_ids, batch):
+            for contact in (emails.get(alert['email']), phones.get(alert['phone'])):
+                if contact is None:
+                    continue
+                if contact['first_id'] is None:
+                    contact['first_id'] = alert_id
+                contact['count'] += 1
+                if len(contact['details']) < BULK_EMAIL_MAX_ROWS:
+                    contact['details'].append(_alert_details(alert))
+        result['imported'] += len(batch)
+        batch.clear()
+        return True
+
+    try:
+        for read, (line_number, row) in enumerate(rows):
+            if read >= max_rows:
+                result['truncated'] = True
+                break
+            try:
+                alert = validate_row(row)
+            except ValueError as e:
+                reject(line_number, str(e))
+                continue
+
+            fingerprint = tuple(alert.values())
+            if fingerprint in seen:
+                result['duplicates'] += 1
+                continue
+            seen.add(fingerprint)
+
+            # one token per email and one code per phone for the whole import;
+            # phone-only alerts still get a token of their own, as from the form
+            email, phone = alert['email'], alert['phone']
+            if email and email not in emails:
+                emails[email] = _new_contact(generate_verification_token())
+            if phone and phone not in phones:
+                phones[phone] = _new_contact(generate_verification_code())
+                phones[phone]['token'] = generate_verification_token()
+            alert['verification_token'] = emails[email]['secret'] if email else phones[phone]['token']
+            alert['phone_verification_code'] = phones[phone]['secret'] if phone else None
+
+            batch.append(alert)
+            if len(batch) >= batch_size and not flush():
+                break
+    except AlertImportError as e:
+        result['error'] = str(e)
+    finally:
+        # rows before a read error are still imported (and verified
+        # below); after a failed insert the batch is already empty
+        flush()
+
+    if dry_run or not send_verifications:
+        return result
+
+    # --- One verification message per contact ---
+    for email, contact in emails.items():
+        if contact['count']:
+            notification_queue.submit(contact['first_id'], 'verification_email', send_bulk_verification_email,
+                                      email, contact['secret'], contact['details'], contact['count'])
+            result['verifications']['email'] += 1
+    for phone, contact in phones.items():
+        if contact['count']:
+            notification_queue.submit(contact['first_id'], 'verification_sms', send_bulk_verification_sms,
+                                      phone, contact['secret'], contact['first_id'], contact['count'])
+            result['verifications']['sms'] += 1
+    return result
+
+
+# ──────────────────────────────────────────────────────────────
+# Entry Point
+#   python src/core/alert_import.py alerts.csv
+#   python src/core/alert_import.py alerts.json --dry-run
+# ──────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import price alerts from CSV or JSON.")
+    parser.add_argument('path', help="CSV (with header), JSON array or JSON Lines file")
+    parser.add_argument('--format', choices=IMPORT_FORMATS, help="default: from the file extension")
+    parser.add_argument('--batch-size', type=int, default=ALERT_IMPORT_BATCH_SIZE)
+    parser.add_argument('--max-rows', type=int, default=ALERT_IMPORT_MAX_ROWS)
+    parser.add_argument('--dry-run', action='store_true', help="validate only")
+    parser.add_argument('--no-verify', action='store_true', help="don't send verification messages")
+    args = parser.parse_args()
+
+    # log lines go to stderr so the summary below stays readable
+    configure_logging(stream=sys.stderr)
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error("can't tell the format from the file name; pass --format")
+
+    with open(args.path, newline='', encoding='utf-8-sig') as f:
+        summary = import_alerts(iter_rows(f, fmt), batch_size=args.batch_size, max_rows=args.max_rows,
+                                send_verifications=not args.no_verify, dry_run=args.dry_run)
+
+    # wait for the queued verification sends before exiting
+    notification_queue.shutdown(wait=True)
+
+    print(f"Imported:      {summary['imported']}{' (dry run)' if args.dry_run else ''}")
+    print(f"Rejected:      {summary['rejected']}")
+    print(f"Duplicates:    {summary['duplicates']}")
+    print(f"Verifications: {summary['verifications']['email']} email, {summary['verifications']['sms']} SMS")
+    if summary['truncated']:
+        print(f"Stopped after {args.max_rows} rows (--max-rows)")
+    if summary['failed']:
+        print(f"Not imported:  {summary['failed']} (failed batch)")
+    if summary.get('error'):
+        print(f"Stopped early: {summary['error']}")
+    for error in summary['errors']:
+        print(f"  line {error['line']}: {error['error']}")
+    if summary['rejected'] > len(summary['errors']):
+        print(f"  ...and {summary['rejected'] - len(summary['errors'])} more")
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. iter_rows()        - (line, row) pairs from a CSV / JSON / JSON Lines stream
+#   2. detect_format()    - Format from a filename or content type
+#   3. validate_row()     - Checks one row; returns create_alert arguments
+#   4. import_alerts()    - Validates, batch-inserts and queues one verification per contact
+# ──────────────────────────────────────────────────────────────
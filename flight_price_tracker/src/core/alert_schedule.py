@@ -0,0 +1,161 @@
+import os
+import time
+import heapq
+from collections import deque
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# ──────────────────────────────────────────────────────────────
+# Incremental Alert Schedule
+# The price checker loads every verified alert once at startup
+# and from then on only applies the alert_changes feed (see
+# db.py): new or newly verified alerts are due immediately,
+# updated alerts keep their slot with the fresh row, deleted or
+# deactivated alerts are dropped. Each alert is checked every
+# CHECKER_INTERVAL_HOURS from its own last check, so there is
+# no full-table pass.
+# ──────────────────────────────────────────────────────────────
+
+CHECKER_INTERVAL_HOURS = float(os.getenv('CHECKER_INTERVAL_HOURS', 6))  # time between checks of one alert
+CHANGE_FEED_OVERLAP = 100  # seqs re-read each poll, for transactions that commit out of order
+
+
+def is_checkable(alert):
+    """True if the checker should watch this alert (active with a verified contact)."""
+    return bool(alert['is_active'] and (alert['email_verified'] or alert['phone_verified']))
+
+
+class AlertSchedule:
+    """Alerts keyed by id with a min-heap of next check times."""
+
+    def __init__(self, interval=CHECKER_INTERVAL_HOURS * 3600):
+        self.interval = interval
+        self.watermark = 0  # highest alert_changes seq applied
+        self._alerts = {}  # alert_id -> alert row
+        self._due = {}  # alert_id -> next check time
+        self._heap = []  # (due, alert_id); entries that disagree with _due are stale
+        self._applied = deque(maxlen=4 * CHANGE_FEED_OVERLAP)  # recently applied seqs
+        self._applied_set = set()
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def __contains__(self, alert_id):
+        return alert_id in self._alerts
+
+    def _set_due(self, alert_id, due):
+        self._due[alert_id] = due
+        heapq.heappush(self._heap, (due, alert_id))
+
+    def load(self, alerts, watermark, now=None):
+        """Replace the schedule with `alerts`, all due now."""
+        now = now if now is not None else time.time()
+        self._alerts.clear()
+        self._due.clear()
+        self._heap = []
+        self.watermark = watermark
+        for alert in alerts:
+            self.upsert(alert, now)
+
+    def upsert(self, alert, now=None):
+        """Add or refresh an alert. Returns True if it was newly scheduled."""
+        alert_id = alert['id']
+        if not is_checkable(alert):
+            self.remove(alert_id)
+            return False
+
+        is_new = alert_id not in self._alerts
+        self._alerts[alert_id] = alert
+        if is_new:
+            self._set_due(alert_id, now if now is not None else time.time())
+        return is_new
+
+    def remove(self, alert_id):
+        """Drop an alert (its heap entry goes stale and is skipped)."""
+        self._alerts.pop(alert_id, None)
+        self._due.pop(alert_id, None)
+
+    # Applies one batch from get_alert_changes(). Upserted alerts are
+    # re-read in a single query via fetch_alerts(ids); ids it doesn't
+    # return were deleted in the meantime.
+    def apply_changes(self, changes, fetch_alerts, now=None):
+        """Apply change feed rows. Returns (added, removed) counts."""
+        upserts, deletes = set(), set()
+        for change in changes:
+            seq = change['seq']
+            self.watermark = max(self.watermark, seq)
+            if seq in self._applied_set:
+                continue
+            if len(self._applied) == self._applied.maxlen:
+                self._applied_set.discard(self._applied[0])
+            self._applied.append(seq)
+            self._applied_set.add(seq)
+
+            if change['change_type'] == 'delete':
+                deletes.add(change['alert_id'])
+                upserts.discard(change['alert_id'])
+            else:
+                upserts.add(change['alert_id'])
+                deletes.discard(change['alert_id'])
+
+        added = removed = 0
+        for alert_id in deletes:
+            if alert_id in self._alerts:
+                self.remove(alert_id)
+                removed += 1
+
+        if upserts:
+            rows = {alert['id']: alert for alert in fetch_alerts(sorted(upserts))}
+            for alert_id in upserts:
+                alert = rows.get(alert_id)
+                was_scheduled = alert_id in self._alerts
+                if alert is None:
+                    self.remove(alert_id)
+                elif self.upsert(alert, now):
+                    added += 1
+                if was_scheduled and alert_id not in self._alerts:
+                    removed += 1
+        return added, removed
+
+    @property
+    def poll_from(self):
+        """Seq to poll after; slightly behind the watermark to catch late commits."""
+        return max(0, self.watermark - CHANGE_FEED_OVERLAP)
+
+    def next_due(self):
+        """Time the next alert is due, or None if the schedule is empty."""
+        heap = self._heap
+        while heap and self._due.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def pop_due(self, now=None):
+        """Remove and return every alert due at `now`, earliest first."""
+        now = now if now is not None else time.time()
+        due = []
+        while True:
+            next_time = self.next_due()
+            if next_time is None or next_time > now:
+                return due
+            _, alert_id = heapq.heappop(self._heap)
+            del self._due[alert_id]
+            due.append(self._alerts[alert_id])
+
+    def reschedule(self, alert_id, now=None):
+        """Schedule an alert's next check one interval from now (if still watched)."""
+        if alert_id in self._alerts:
+            self._set_due(alert_id, (now if now is not None else time.time()) + self.interval)
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. is_checkable()        - Active alert with a verified contact
+#   2. AlertSchedule         - In-memory alerts with next check times
+#        .load()             - Startup load (the only full read)
+#        .apply_changes()    - Applies a batch from the alert_changes feed
+#        .pop_due()          - Alerts whose check is due
+#        .reschedule()       - Next check one interval after this one
+# ──────────────────────────────────────────────────────────────
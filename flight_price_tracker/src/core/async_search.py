@@ -0,0 +1,183 @@
+import os
+import asyncio
+import threading
+import concurrent.futures
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# ──────────────────────────────────────────────────────────────
+# Async Search Service
+# Runs one asyncio event loop on a background thread and sends
+# upstream searches through the async Amadeus client. The
+# existing sync code (Flask views, SearchCache refreshes, the
+# route warmer) submits a search and waits on a
+# concurrent.futures.Future. The HTTP I/O for every in-flight
+# search is multiplexed on the one loop, instead of each search
+# running a blocking SDK call of its own.
+#
+# Enabled with SEARCH_ASYNC=1; otherwise fetch_offers() in
+# app.py keeps calling the sync SDK directly.
+#
+# This does not lift the web server's thread cap: a Flask view
+# still blocks its WSGI thread on future.result() until the
+# search is done, so a worker with T threads serves at most T
+# searches at once either way, and upstream_gate in app.py caps
+# them at SEARCH_MAX_UPSTREAM (32) per process on top of that.
+# What changes is that those searches share one loop and one
+# connection pool instead of each thread running its own SDK
+# call (tools/bench_search.py --path routes measures it).
+# Hundreds of searches in flight only happen for a caller that
+# submit()s many at once and waits on them together, like the
+# load test; no web route does that.
+# ──────────────────────────────────────────────────────────────
+
+SEARCH_ASYNC = os.getenv('SEARCH_ASYNC', '0') == '1'  # route upstream searches through the event loop
+SEARCH_ASYNC_MAX_IN_FLIGHT = int(os.getenv('SEARCH_ASYNC_MAX_IN_FLIGHT', 500))  # searches on the loop at once (submit() callers)
+SEARCH_ASYNC_WAIT = float(os.getenv('SEARCH_ASYNC_WAIT', 60))  # seconds a sync caller waits for a result
+
+
+class AsyncSearchService:
+    """Background event loop that runs async_prices_for_dates() for sync callers."""
+
+    def __init__(self, max_in_flight=SEARCH_ASYNC_MAX_IN_FLIGHT, client=None):
+        """
+        Args:
+            max_in_flight: Searches allowed upstream at once; more wait their turn
+            client: AsyncAmadeusClient to use (defaults to the shared one)
+        """
+        self.max_in_flight = max_in_flight
+        self.client = client
+        self._loop = None
+        self._thread = None
+        self._semaphore = None
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'in_flight': 0, 'completed': 0, 'failed': 0}
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._loop
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(self._loop)
+                self._semaphore = asyncio.Semaphore(self.max_in_flight)
+                ready.set()
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=run, name='async-search', daemon=True)
+            self._thread.start()
+            ready.wait()
+            return self._loop
+
+    def _client(self):
+        from src.api.amadeus_async import get_async_client
+        return self.client or get_async_client()
+
+    async def _search(self, kwargs, timeout):
+        # the timeout is enforced on the loop, so a search whose caller
+        # gave up is cancelled there (waiting for the semaphore included)
+        if timeout is not None:
+            try:
+                return await asyncio.wait_for(self._search(kwargs, None), timeout)
+            except asyncio.TimeoutError:
+                with self._lock:
+                    self._stats['failed'] += 1
+                raise
+
+        from src.api.amadeus_async import async_prices_for_dates
+
+        async with self._semaphore:
+            with self._lock:
+                self._stats['in_flight'] += 1
+            try:
+                result = await async_prices_for_dates(client=self._client(), **kwargs)
+            except Exception:
+                with self._lock:
+                    self._stats['failed'] += 1
+                raise
+            finally:
+                with self._lock:
+                    self._stats['in_flight'] -= 1
+            with self._lock:
+                self._stats['completed'] += 1
+            return result
+
+    def submit(self, timeout=None, **kwargs):
+        """Start a search (prices_for_dates() arguments). Returns a concurrent.futures.Future.
+
+        With `timeout` the search is cancelled on the loop after that many
+        seconds and the future raises asyncio.TimeoutError.
+        """
+        loop = self._ensure_started()
+        with self._lock:
+            self._stats['submitted'] += 1
+        return asyncio.run_coroutine_threadsafe(self._search(kwargs, timeout), loop)
+
+    def prices_for_dates(self, timeout=SEARCH_ASYNC_WAIT, **kwargs):
+        """Blocking drop-in for travelpayouts.prices_for_dates(); the I/O runs on the loop."""
+        future = self.submit(timeout=timeout, **kwargs)
+        # the loop times the search out itself; the extra second only
+        # matters if the loop is too busy to do that
+        try:
+            return future.result(timeout + 1)
+        except concurrent.futures.TimeoutError:
+            future.cancel()  # cancels the task on the loop too
+            raise
+
+    def stats(self):
+        """Counters for monitoring and the load test."""
+        with self._lock:
+            return dict(self._stats, max_in_flight=self.max_in_flight)
+
+    # The loop thread and the client's sockets belong to the parent;
+    # a forked worker starts its own loop on its first search.
+    def reset_after_fork(self):
+        """Drop the parent's event loop and HTTP session."""
+        self._lock = threading.Lock()
+        self._loop = self._thread = self._semaphore = None
+        self._client().reset_after_fork()
+
+    def close(self, timeout=5):
+        """Close the HTTP session and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._client().close(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            loop.close()
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+# The loop thread only starts on the first search, so importing
+# this module (or creating the service) costs nothing.
+def get_async_search():
+    """Return the process-wide AsyncSearchService."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = AsyncSearchService()
+        return _service
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. AsyncSearchService    - Event loop thread for upstream searches
+#        .submit()           - Start a search, returns a Future
+#        .prices_for_dates() - Blocking wrapper (drop-in for the sync call)
+#        .close()            - Close the HTTP session and stop the loop
+#        .reset_after_fork() - Fresh loop state in a forked worker
+#   2. get_async_search()    - Shared per-process service
+# ──────────────────────────────────────────────────────────────
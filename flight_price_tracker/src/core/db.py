@@ -1,8 +1,17 @@
 import os
+import sys
+import logging
 import pymysql
 from dotenv import load_dotenv
 from datetime import datetime
 
+# add the project root to the path so `src.` imports resolve when run directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.core import metrics
+
+logger = logging.getLogger(__name__)
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -24,6 +33,29 @@ DB_CONFIG = {
 }
 
 
+# price_alerts columns that can be returned outside the app.
+# Verification secrets are deliberately not in this list.
+ALERT_PUBLIC_COLUMNS = (
+    'id', 'email', 'phone', 'origin', 'destination', 'departure_date', 'return_date',
+    'price_threshold', 'trip_type', 'is_active', 'email_verified', 'phone_verified',
+    'created_at', 'last_checked',
+)
+
+# price_alerts columns the "my alerts" dashboard shows
+DASHBOARD_COLUMNS = (
+    'id', 'origin', 'destination', 'departure_date', 'return_date', 'price_threshold',
+    'trip_type', 'is_active', 'email_verified', 'phone_verified', 'created_at',
+)
+
+
+DB_SECONDS = metrics.histogram('db_query_seconds', 'Database calls, including connecting', ('op', 'outcome'))
+
+
+# Records a query function's duration under its own name
+def _timed(func):
+    return metrics.timed(DB_SECONDS, op=func.__name__)(func)
+
+
 # ──────────────────────────────────────────────────────────────
 # Connection Helper
 # ──────────────────────────────────────────────────────────────
@@ -38,7 +70,7 @@ def get_connection():
         connection = pymysql.connect(**DB_CONFIG)
         return connection
     except pymysql.Error as e:
-        print(f"Error connecting to MySQL: {e}")
+        logger.error("Error connecting to MySQL: %s", e)
         raise
 
 
@@ -47,7 +79,7 @@ def get_connection():
 # ──────────────────────────────────────────────────────────────
 
 
-# Creates the price_alerts table in MySQL if it doesn't already exist.
+# Creates the price_alerts, price_history and alert_changes tables in MySQL if they don't already exist.
 # Should be called once when first setting up the project or when
 # the database is empty. Safe to call multiple times (uses IF NOT EXISTS).
 def init_db():
@@ -76,18 +108,94 @@ def init_db():
                     phone_verification_code VARCHAR(6),
                     token_created_at TIMESTAMP NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    last_checked TIMESTAMP NULL
+                    last_checked TIMESTAMP NULL,
+                    INDEX idx_price_alerts_email (email, id),
+                    INDEX idx_price_alerts_phone (phone, id)
+                )
+            """)
+
+            # contact indexes for tables created before they were added
+            # ("my alerts" pages and bulk phone verification look alerts up
+            # by contact; (contact, id) also serves their keyset pagination)
+            _ensure_index(cursor, 'price_alerts', 'idx_price_alerts_email', '(email, id)')
+            _ensure_index(cursor, 'price_alerts', 'idx_price_alerts_phone', '(phone, id)')
+
+            # creates price_history table if DNE
+            # One row per observed lowest price for an alert: the baseline
+            # fetched when the alert is created, then one per checker pass.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS price_history (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    alert_id INT NOT NULL,
+                    price DECIMAL(10,2) NOT NULL,
+                    airline VARCHAR(10),
+                    recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_price_history_alert (alert_id, recorded_at),
+                    FOREIGN KEY (alert_id) REFERENCES price_alerts(id) ON DELETE CASCADE
+                )
+            """)
+
+            # creates alert_changes table if DNE
+            # Append-only change feed: every write to price_alerts adds a
+            # row here, so the price checker can poll for new, changed and
+            # deleted alerts by sequence number instead of rescanning.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS alert_changes (
+                    seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+                    alert_id INT NOT NULL,
+                    change_type VARCHAR(10) NOT NULL,
+                    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_alert_changes_changed_at (changed_at)
                 )
             """)
             connection.commit()
-            print("Database initialized successfully.")
+            logger.info("Database initialized successfully.")
     except pymysql.Error as e:
-        print(f"Error initializing database: {e}")
+        logger.error("Error initializing database: %s", e)
         raise
     finally:
         connection.close()
 
 
+# CREATE TABLE IF NOT EXISTS leaves existing tables alone, so
+# indexes added later are created here if they're missing.
+def _ensure_index(cursor, table, index, columns):
+    cursor.execute("""
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+    """, (table, index))
+    if cursor.fetchone() is None:
+        cursor.execute(f"ALTER TABLE {table} ADD INDEX {index} {columns}")
+        logger.info("Added index %s to %s.", index, table)
+
+
+# ──────────────────────────────────────────────────────────────
+# Change Feed Helpers
+# ──────────────────────────────────────────────────────────────
+
+# change_type values in alert_changes
+CHANGE_UPSERT = 'upsert'  # alert created or updated
+CHANGE_DELETE = 'delete'  # alert removed
+
+
+# Appends a change row using the caller's cursor, so it commits
+# (or rolls back) together with the write it describes.
+def _log_alert_change(cursor, alert_id, change_type=CHANGE_UPSERT):
+    cursor.execute("""
+        INSERT INTO alert_changes (alert_id, change_type)
+        VALUES (%s, %s)
+    """, (alert_id, change_type))
+
+
+# Same for many alerts; executemany sends one multi-row INSERT.
+def _log_alert_changes(cursor, alert_ids, change_type=CHANGE_UPSERT):
+    cursor.executemany("""
+        INSERT INTO alert_changes (alert_id, change_type)
+        VALUES (%s, %s)
+    """, [(alert_id, change_type) for alert_id in alert_ids])
+
+
 # ──────────────────────────────────────────────────────────────
 # CRUD Operations
 # Functions for creating, reading, updating, and deleting
@@ -99,6 +207,7 @@ def init_db():
 # Called from the /alerts/create route in app.py when a user submits the alert form.
 # Returns the new row's auto-incremented ID so we can reference it later
 # (e.g., for verification or unsubscribe links).
+@_timed
 def create_alert(phone, origin, destination, departure_date, return_date,
                  price_threshold, trip_type, email=None,
                  verification_token=None, phone_verification_code=None):
@@ -137,12 +246,74 @@ def create_alert(phone, origin, destination, departure_date, return_date,
                 verification_token, phone_verification_code,
                 datetime.now() if verification_token else None,
             ))
-            connection.commit()
 
             # lastrowid gives us the auto-incremented ID of the new row
-            return cursor.lastrowid
+            alert_id = cursor.lastrowid
+            _log_alert_change(cursor, alert_id)
+            connection.commit()
+            return alert_id
+    except pymysql.Error as e:
+        logger.error("Error creating alert: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# price_alerts columns written for a new alert, in VALUES order
+_ALERT_INSERT_COLUMNS = (
+    'phone', 'email', 'origin', 'destination', 'departure_date', 'return_date',
+    'price_threshold', 'trip_type', 'is_active', 'verification_token',
+    'phone_verification_code', 'token_created_at',
+)
+
+
+# Inserts many alerts (same fields as create_alert) in one
+# transaction: a single multi-row INSERT plus one multi-row
+# change feed INSERT. Used by the bulk import (alert_import.py).
+# A multi-row INSERT with every row known up front is a "simple
+# insert" to InnoDB, so its auto-increment ids are consecutive
+# starting at lastrowid.
+@_timed
+def create_alerts(alerts):
+    """
+    Create several price alerts at once.
+
+    Args:
+        alerts: List of dicts with create_alert's arguments
+
+    Returns:
+        List of the new alert IDs, in the same order
+    """
+    if not alerts:
+        return []
+
+    now = datetime.now()
+    placeholders = "(" + ", ".join(["%s"] * len(_ALERT_INSERT_COLUMNS)) + ")"
+    values = []
+    for alert in alerts:
+        token = alert.get('verification_token')
+        values.extend((
+            alert['phone'], alert.get('email'), alert['origin'], alert['destination'],
+            alert['departure_date'], alert['return_date'],
+            alert['price_threshold'], alert['trip_type'], True,
+            token, alert.get('phone_verification_code'),
+            now if token else None,
+        ))
+
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO price_alerts ({', '.join(_ALERT_INSERT_COLUMNS)}) "
+                f"VALUES {', '.join([placeholders] * len(alerts))}",
+                values,
+            )
+            alert_ids = list(range(cursor.lastrowid, cursor.lastrowid + len(alerts)))
+            _log_alert_changes(cursor, alert_ids)
+            connection.commit()
+            return alert_ids
     except pymysql.Error as e:
-        print(f"Error creating alert: {e}")
+        logger.error("Error creating alerts: %s", e)
         raise
     finally:
         connection.close()
@@ -151,6 +322,7 @@ def create_alert(phone, origin, destination, departure_date, return_date,
 # Fetches every alert where is_active = TRUE from the database.
 # Used by the background price checker to know which routes
 # to monitor for price drops.
+@_timed
 def get_active_alerts():
     """Get all active price alerts."""
     connection = get_connection()
@@ -165,7 +337,7 @@ def get_active_alerts():
             """)
             return cursor.fetchall()
     except pymysql.Error as e:
-        print(f"Error fetching alerts: {e}")
+        logger.error("Error fetching alerts: %s", e)
         raise
     finally:
         connection.close()
@@ -174,6 +346,7 @@ def get_active_alerts():
 # Looks up a single alert by its primary key.
 # Used throughout app.py to fetch full alert details when
 # verifying, unsubscribing, or sending notifications.
+@_timed
 def get_alert_by_id(alert_id):
     """Get a specific alert by ID."""
     connection = get_connection()
@@ -186,7 +359,7 @@ def get_alert_by_id(alert_id):
             """, (alert_id,))
             return cursor.fetchone()
     except pymysql.Error as e:
-        print(f"Error fetching alert: {e}")
+        logger.error("Error fetching alert: %s", e)
         raise
     finally:
         connection.close()
@@ -195,6 +368,7 @@ def get_alert_by_id(alert_id):
 # Sets the last_checked column to the current time for a given alert.
 # Called by the background price checker after it finishes processing
 # an alert, so we can track how recently each alert was checked.
+@_timed
 def update_last_checked(alert_id):
     """Update the last chekced timestamp for an alert."""
     connection = get_connection()
@@ -209,7 +383,7 @@ def update_last_checked(alert_id):
             """, (datetime.now(), alert_id))
             connection.commit()
     except pymysql.Error as e:
-        print(f"Error updating last_checked: {e}")
+        logger.error("Error updating last_checked: %s", e)
         raise
     finally:
         connection.close()
@@ -218,6 +392,7 @@ def update_last_checked(alert_id):
 # Changes the price_threshold value for an existing alert.
 # Could be used if a user wants to adjust the maximum price
 # they're willing to pay without creating a brand new alert.
+@_timed
 def update_price_threshold(alert_id, new_threshold):
     """Update the price threshold for an alert."""
     connection = get_connection()
@@ -228,9 +403,10 @@ def update_price_threshold(alert_id, new_threshold):
                 SET price_threshold = %s
                 WHERE id = %s
             """, (new_threshold, alert_id))
+            _log_alert_change(cursor, alert_id)
             connection.commit()
     except pymysql.Error as e:
-        print(f"Error updating price threshold: {e}")
+        logger.error("Error updating price threshold: %s", e)
         raise
     finally:
         connection.close()
@@ -240,6 +416,7 @@ def update_price_threshold(alert_id, new_threshold):
 # Called from the /unsubscribe route in app.py when a user
 # clicks the unsubscribe link in their email or SMS.
 # Returns True on success, False if the delete fails.
+@_timed
 def delete_alert(alert_id):
     """Permanently delete an alert from the database."""
     connection = get_connection()
@@ -251,13 +428,276 @@ def delete_alert(alert_id):
                 DELETE FROM price_alerts
                 WHERE id = %s
             """, (alert_id,))
+            _log_alert_change(cursor, alert_id, CHANGE_DELETE)
             connection.commit()
             return True
     except pymysql.Error as e:
-        print(f"Error deleting alert: {e}")
+        logger.error("Error deleting alert: %s", e)
         return False
 
 
+# Keyset pagination over alerts in id order: pass the last id of
+# the previous page as after_id. Only the requested columns are
+# read, and every column name is checked against
+# ALERT_PUBLIC_COLUMNS before it goes into the SQL.
+@_timed
+def list_alerts(after_id=0, limit=50, email=None, phone=None, active_only=False,
+                columns=ALERT_PUBLIC_COLUMNS):
+    """
+    Get one page of alerts.
+
+    Args:
+        after_id: Return alerts with id > after_id
+        limit: Page size
+        email: Only alerts for this email (optional)
+        phone: Only alerts for this phone (optional)
+        active_only: Skip deactivated alerts
+        columns: Columns to select (subset of ALERT_PUBLIC_COLUMNS)
+
+    Returns:
+        List of alert dicts, ordered by id
+    """
+    columns = [c for c in columns if c in ALERT_PUBLIC_COLUMNS]
+    if 'id' not in columns:
+        columns.insert(0, 'id')  # needed for the next page's after_id
+
+    conditions = ["id > %s"]
+    values = [after_id]
+    if email:
+        conditions.append("email = %s")
+        values.append(email)
+    if phone:
+        conditions.append("phone = %s")
+        values.append(phone)
+    if active_only:
+        conditions.append("is_active = TRUE")
+
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT {', '.join(columns)} FROM price_alerts
+                WHERE {' AND '.join(conditions)}
+                ORDER BY id ASC
+                LIMIT %s
+            """, (*values, limit))
+            return cursor.fetchall()
+    except pymysql.Error as e:
+        logger.error("Error listing alerts: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# Lowest alert id for an email or phone, or None if it has no alerts.
+# One probe of the contact index.
+@_timed
+def first_contact_alert_id(email=None, phone=None):
+    """Whether (and under which alert id) a contact has any alerts."""
+    column, value = ('email', email) if email else ('phone', phone)
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT id FROM price_alerts
+                WHERE {column} = %s
+                ORDER BY id ASC
+                LIMIT 1
+            """, (value,))
+            row = cursor.fetchone()
+            return row['id'] if row else None
+    except pymysql.Error as e:
+        logger.error("Error looking up contact alerts: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# One page of a contact's alerts for the "my alerts" dashboard,
+# with each alert's latest observed price. Walks the contact index
+# from after_id, so a page costs the same however many alerts the
+# contact (or the table) has; the latest price is one backward
+# probe of idx_price_history_alert per alert on the page.
+@_timed
+def get_contact_alerts(email=None, phone=None, after_id=0, limit=25):
+    """
+    Get one page of the alerts for an email or phone.
+
+    Args:
+        email: Email address (either this or phone)
+        phone: Phone number
+        after_id: Return alerts with id > after_id
+        limit: Page size
+
+    Returns:
+        List of dicts with DASHBOARD_COLUMNS plus latest_price,
+        latest_airline and latest_price_at (None until checked), by id
+    """
+    column, value = ('email', email) if email else ('phone', phone)
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT {', '.join('a.' + c for c in DASHBOARD_COLUMNS)},
+                       ph.price AS latest_price, ph.airline AS latest_airline,
+                       ph.recorded_at AS latest_price_at
+                FROM price_alerts a
+                LEFT JOIN price_history ph ON ph.id = (
+                    SELECT h.id FROM price_history h
+                    WHERE h.alert_id = a.id
+                    ORDER BY h.recorded_at DESC, h.id DESC
+                    LIMIT 1
+                )
+                WHERE a.{column} = %s AND a.id > %s
+                ORDER BY a.id ASC
+                LIMIT %s
+            """, (value, after_id, limit))
+            return cursor.fetchall()
+    except pymysql.Error as e:
+        logger.error("Error fetching contact alerts: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# Fetches the given alerts in one query. Used by the price checker
+# to load just the alerts named in the change feed.
+@_timed
+def get_alerts_by_ids(alert_ids):
+    """Get alerts by ID. Missing (deleted) IDs are simply absent."""
+    if not alert_ids:
+        return []
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            placeholders = ', '.join(['%s'] * len(alert_ids))
+            cursor.execute(f"""
+                SELECT * FROM price_alerts
+                WHERE id IN ({placeholders})
+            """, tuple(alert_ids))
+            return cursor.fetchall()
+    except pymysql.Error as e:
+        logger.error("Error fetching alerts: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# Change Feed
+# Read side of alert_changes, polled by the price checker.
+# ──────────────────────────────────────────────────────────────
+
+
+# Highest change sequence number so far (0 if none). The checker
+# reads this before its startup load, then polls for anything newer.
+@_timed
+def get_latest_change_seq():
+    """Get the newest alert_changes sequence number."""
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(seq), 0) AS seq FROM alert_changes")
+            return cursor.fetchone()['seq']
+    except pymysql.Error as e:
+        logger.error("Error fetching change sequence: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# Changes after a sequence number, oldest first. A primary-key
+# range scan, so polling every few seconds is cheap.
+@_timed
+def get_alert_changes(after_seq, limit=500):
+    """Get up to `limit` alert changes with seq > after_seq."""
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT seq, alert_id, change_type FROM alert_changes
+                WHERE seq > %s
+                ORDER BY seq ASC
+                LIMIT %s
+            """, (after_seq, limit))
+            return cursor.fetchall()
+    except pymysql.Error as e:
+        logger.error("Error fetching alert changes: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# Drops change rows older than `days`; the checker only ever needs
+# the changes since its last poll.
+@_timed
+def prune_alert_changes(days=7):
+    """Delete old alert_changes rows. Returns rows removed."""
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                DELETE FROM alert_changes
+                WHERE changed_at < NOW() - INTERVAL %s DAY
+            """, (days,))
+            connection.commit()
+            return cursor.rowcount
+    except pymysql.Error as e:
+        logger.error("Error pruning alert changes: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# Price History
+# Lowest prices seen for each alert over time.
+# ──────────────────────────────────────────────────────────────
+
+
+# Appends one observed lowest price for an alert. Called from the
+# alert-creation prefetch in app.py (the baseline) and by the
+# price checker on every pass.
+@_timed
+def record_price_point(alert_id, price, airline=None):
+    """Record the lowest price currently found for an alert."""
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO price_history (alert_id, price, airline, recorded_at)
+                VALUES (%s, %s, %s, %s)
+            """, (alert_id, price, airline, datetime.now()))
+            connection.commit()
+    except pymysql.Error as e:
+        logger.error("Error recording price point: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
+# Most recent price point for an alert, e.g. the baseline shown on
+# the confirmation page. Served by the (alert_id, recorded_at) index.
+@_timed
+def get_latest_price_point(alert_id):
+    """Get the most recent price point for an alert, or None."""
+    connection = get_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT price, airline, recorded_at FROM price_history
+                WHERE alert_id = %s
+                ORDER BY recorded_at DESC, id DESC
+                LIMIT 1
+            """, (alert_id,))
+            return cursor.fetchone()
+    except pymysql.Error as e:
+        logger.error("Error fetching price point: %s", e)
+        raise
+    finally:
+        connection.close()
+
+
 # ──────────────────────────────────────────────────────────────
 # Verification Functions
 # Used during the email/phone verification flow to confirm
@@ -271,6 +711,7 @@ def delete_alert(alert_id):
 # tokens are used to store a specific alert
 # email verified sets email_verified=TRUE for alert
 # tokens are used for security and uniqueness
+@_timed
 def verify_email_token(token):
     """
     Verify an email using the verification token.
@@ -292,21 +733,25 @@ def verify_email_token(token):
                 AND email_verified = FALSE
             """, (token,))
 
-            alert = cursor.fetchone()
-            if not alert:
+            alerts = cursor.fetchall()
+            if not alerts:
                 return False
 
             # Mark email as verified
-            cursor.execute("""
+            # A bulk import shares one token across all of a contact's
+            # new alerts, so one click verifies every one of them.
+            alert_ids = [alert['id'] for alert in alerts]
+            cursor.execute(f"""
                 UPDATE price_alerts
                 SET email_verified = TRUE
-                WHERE id = %s
-            """, (alert['id'],))
+                WHERE id IN ({', '.join(['%s'] * len(alert_ids))})
+            """, alert_ids)
+            _log_alert_changes(cursor, alert_ids)
 
             connection.commit()
             return True
     except pymysql.Error as e:
-        print(f"Error verifying email token: {e}")
+        logger.error("Error verifying email token: %s", e)
         return False
     finally:
         connection.close()
@@ -315,6 +760,7 @@ def verify_email_token(token):
 # Checks the 6-digit code the user entered against the one stored
 # in the database for that alert. If it matches, marks phone_verified = TRUE.
 # Called from the /verify-phone POST route in app.py.
+@_timed
 def verify_phone_code(alert_id, code):
     """
     Verify a phone using the verification code.
@@ -330,9 +776,9 @@ def verify_phone_code(alert_id, code):
         with connection.cursor() as cursor:
             # find alert with this ID and code
             # Matches on both alert_id AND code so that a valid code
-            # can only verify the specific alert it was issued for.
+            # can only verify the alert(s) it was issued for.
             cursor.execute("""
-                SELECT id FROM price_alerts
+                SELECT id, phone FROM price_alerts
                 WHERE id = %s
                 AND phone_verification_code = %s
                 AND phone_verified = FALSE
@@ -343,16 +789,26 @@ def verify_phone_code(alert_id, code):
                 return False
 
             # mark phone as verified
+            # Alerts imported in bulk for this phone share the code,
+            # so they are verified along with this one.
             cursor.execute("""
+                SELECT id FROM price_alerts
+                WHERE phone = %s
+                AND phone_verification_code = %s
+                AND phone_verified = FALSE
+            """, (alert['phone'], code))
+            alert_ids = [row['id'] for row in cursor.fetchall()]
+            cursor.execute(f"""
                 UPDATE price_alerts
                 SET phone_verified = TRUE
-                WHERE id = %s
-            """, (alert_id,))
+                WHERE id IN ({', '.join(['%s'] * len(alert_ids))})
+            """, alert_ids)
+            _log_alert_changes(cursor, alert_ids)
 
             connection.commit()
             return True
     except pymysql.Error as e:
-        print(f"Error verifying phone code: {e}")
+        logger.error("Error verifying phone code: %s", e)
         return False
     finally:
         connection.close()
@@ -366,6 +822,8 @@ def verify_phone_code(alert_id, code):
 
 # initialize db when module is imported
 if __name__ == "__main__":
+    from src.core.logs import configure_logging
+    configure_logging()
     init_db()
     print("Database setup is completed.")
 
@@ -373,13 +831,23 @@ if __name__ == "__main__":
 # ──────────────────────────────────────────────────────────────
 # Function Reference
 #   1. get_connection()        - Creates a connection to MySQL using .env credentials
-#   2. init_db()               - Creates the price_alerts table if it doesn't exist
+#   2. init_db()               - Creates the price_alerts/price_history/alert_changes tables if they don't exist
 #   3. create_alert()          - Saves a new price alert to the database
-#   4. get_active_alerts()     - Retrieves all active alerts (for the background checker)
-#   5. get_alert_by_id()       - Gets a specific alert by ID
-#   6. update_last_checked()   - Updates when an alert was last checked
-#   7. update_price_threshold()- Updates the price threshold for an alert
-#   8. delete_alert()          - Permanently removes an alert from the database
-#   9. verify_email_token()    - Verifies an email via token and marks it verified
-#  10. verify_phone_code()     - Verifies a phone via 6-digit code and marks it verified
+#   4. create_alerts()         - Saves many alerts in one transaction (bulk import)
+#   5. get_active_alerts()     - Retrieves all active alerts (for the background checker)
+#   6. get_alert_by_id()       - Gets a specific alert by ID
+#   7. update_last_checked()   - Updates when an alert was last checked
+#   8. update_price_threshold()- Updates the price threshold for an alert
+#   9. delete_alert()          - Permanently removes an alert from the database
+#  10. list_alerts()           - One keyset-paginated page of alerts (JSON API)
+#  11. first_contact_alert_id()- Whether an email/phone has alerts (indexed probe)
+#  12. get_contact_alerts()    - One page of a contact's alerts with latest prices
+#  13. get_alerts_by_ids()     - Gets several alerts in one query
+#  14. get_latest_change_seq() - Newest change feed sequence number
+#  15. get_alert_changes()     - Alert changes since a sequence number (checker polling)
+#  16. prune_alert_changes()   - Drops old change feed rows
+#  17. record_price_point()    - Records the lowest price found for an alert
+#  18. get_latest_price_point()- Most recent price point for an alert
+#  19. verify_email_token()    - Verifies an email via token and marks it verified
+#  20. verify_phone_code()     - Verifies a phone via 6-digit code and marks it verified
 # ──────────────────────────────────────────────────────────────
@@ -1,13 +1,20 @@
 import os
 import secrets
+import logging
 
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 from dotenv import load_dotenv
 
+from src.core.reference import get_reference
+from src.core import metrics
+from src.core.logs import mask_email
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # ──────────────────────────────────────────────────────────────
 # Email Configuration
 # Pulls SendGrid credentials and app URL from environment
@@ -19,6 +26,35 @@ load_dotenv()
 SENDGRID_API_KEY = os.getenv('SENDGRID_API_KEY')
 SENDER_EMAIL = os.getenv('SENDER_EMAIL')
 BASE_URL = os.getenv('BASE_URL', 'http://localhost:5000')  # used to build verification and unsubscribe links
+SENDGRID_API_HOST = os.getenv('SENDGRID_API_HOST', 'https://api.sendgrid.com')  # point at a local sink for benchmarks
+BULK_EMAIL_MAX_ROWS = 50  # alerts listed in a bulk verification email
+
+NOTIFICATION_SECONDS = metrics.histogram('notification_send_seconds', 'Email and SMS provider calls',
+                                         ('channel', 'outcome'))
+
+# One SendGrid client is reused for every email instead of
+# building a new one per send.
+_sendgrid_client = None
+
+
+def _get_sendgrid_client():
+    """Return the shared SendGrid client, creating it on first use."""
+    global _sendgrid_client
+    if _sendgrid_client is None:
+        _sendgrid_client = SendGridAPIClient(SENDGRID_API_KEY, host=SENDGRID_API_HOST)
+    return _sendgrid_client
+
+
+def _send_mail(message):
+    """Send a Mail through the shared client, timing the SendGrid call."""
+    with NOTIFICATION_SECONDS.time(channel='email'):
+        return _get_sendgrid_client().send(message)
+
+
+def reset_after_fork():
+    """Drop the parent's SendGrid client; a forked worker builds its own."""
+    global _sendgrid_client
+    _sendgrid_client = None
 
 
 # ──────────────────────────────────────────────────────────────
@@ -36,6 +72,13 @@ def _get_template_path(template_name):
     )
 
 
+def _route_label(alert_details):
+    """Return "City (CODE) → City (CODE)" for the alert's route."""
+    reference = get_reference()
+    return (f"{reference.airport_label(alert_details['origin'])} → "
+            f"{reference.airport_label(alert_details['destination'])}")
+
+
 def _build_return_date_html(alert_details):
     """Return an HTML snippet for the return date, or empty string if one-way."""
     if alert_details.get('return_date'):
@@ -86,8 +129,8 @@ def send_verification_email(to_email, verification_token, alert_details):
 
         # replace placeholders
         html_content = html_template.format(
-            origin=alert_details.get('origin'),
-            destination=alert_details.get('destination'),
+            origin=get_reference().airport_label(alert_details.get('origin')),
+            destination=get_reference().airport_label(alert_details.get('destination')),
             departure_date=alert_details.get('departure_date'),
             return_date_html=return_date_html,
             price_threshold=alert_details.get('price_threshold'),
@@ -104,16 +147,95 @@ def send_verification_email(to_email, verification_token, alert_details):
         )
 
         # Send through the SendGrid API
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
-        print(f"Verification email sent to {to_email}")
-        print(f"SendGrid Response Status Code: {response.status_code}")
-        print(f"SendGrid Response Body: {response.body}")
-        print(f"SendGrid Response Headers: {response.headers}")
+        response = _send_mail(message)
+        logger.info("Verification email sent to %s", mask_email(to_email), extra={'status': response.status_code})
+        return True
+
+    except Exception as e:
+        logger.error("Error sending verification email: %s", e)
+        return False
+
+
+# Bulk-import version of the above: one email per contact listing
+# all of their new alerts (the first BULK_EMAIL_MAX_ROWS of them),
+# with a single link that verifies every one.
+def send_bulk_verification_email(to_email, verification_token, alerts_details, alert_count=None):
+    """Send one verification link covering several alerts (alert_count defaults to len(alerts_details))."""
+    try:
+        alert_count = alert_count or len(alerts_details)
+        verification_link = f"{BASE_URL}/verify-email?token={verification_token}"
+
+        template_path = _get_template_path('bulk_verification_email.html')
+        with open(template_path, 'r') as f:
+            html_template = f.read()
+
+        # one table row per alert
+        rows = []
+        for alert_details in alerts_details[:BULK_EMAIL_MAX_ROWS]:
+            dates = alert_details.get('departure_date')
+            if alert_details.get('return_date'):
+                dates = f"{dates} – {alert_details['return_date']}"
+            rows.append(
+                "<tr>"
+                f"<td style='padding: 6px 4px; border-bottom: 1px solid #eee;'>{_route_label(alert_details)}</td>"
+                f"<td style='padding: 6px 4px; border-bottom: 1px solid #eee;'>{dates}</td>"
+                f"<td style='padding: 6px 4px; border-bottom: 1px solid #eee; text-align: right;'>"
+                f"${alert_details.get('price_threshold')}</td>"
+                "</tr>"
+            )
+        more = alert_count - len(rows)
+        more_alerts_html = f"<p style='margin: 12px 0 0; color: #555;'>…and {more} more.</p>" if more > 0 else ""
+
+        html_content = html_template.format(
+            alert_count=alert_count,
+            alert_rows_html="\n".join(rows),
+            more_alerts_html=more_alerts_html,
+            verification_link=verification_link,
+        )
+
+        message = Mail(
+            from_email=SENDER_EMAIL,
+            to_emails=to_email,
+            subject=f'Verify Your {alert_count} Flight Price Alerts',
+            html_content=html_content,
+        )
+
+        response = _send_mail(message)
+        logger.info("Bulk verification email (%d alerts) sent to %s", alert_count, mask_email(to_email),
+                    extra={'status': response.status_code})
+        return True
+
+    except Exception as e:
+        logger.error("Error sending bulk verification email: %s", e)
+        return False
+
+
+# Sends the signed "my alerts" link requested on /my-alerts. The
+# token is made (and checked) by the web app; it's only embedded here.
+def send_my_alerts_link_email(to_email, link_token, link_days):
+    """Send a link to the dashboard of all alerts for this email."""
+    try:
+        dashboard_link = f"{BASE_URL}/my-alerts/{link_token}"
+
+        template_path = _get_template_path('my_alerts_link_email.html')
+        with open(template_path, 'r') as f:
+            html_template = f.read()
+
+        html_content = html_template.format(dashboard_link=dashboard_link, link_days=link_days)
+
+        message = Mail(
+            from_email=SENDER_EMAIL,
+            to_emails=to_email,
+            subject='Your Flight Price Alerts',
+            html_content=html_content,
+        )
+
+        response = _send_mail(message)
+        logger.info("My alerts link sent to %s", mask_email(to_email), extra={'status': response.status_code})
         return True
 
     except Exception as e:
-        print(f"Error sending verification email: {e}")
+        logger.error("Error sending my alerts link: %s", e)
         return False
 
 
@@ -147,14 +269,14 @@ def send_price_drop_notification(to_email, alert_details, flight_details):
 
         # Replace placeholders
         html_content = html_template.format(
-            origin=alert_details['origin'],
-            destination=alert_details['destination'],
+            origin=get_reference().airport_label(alert_details['origin']),
+            destination=get_reference().airport_label(alert_details['destination']),
             departure_date=alert_details['departure_date'],
             return_date_html=return_date_html,
             price_threshold=alert_details['price_threshold'],
             current_price=flight_details['price'],
             savings=savings,
-            airline=flight_details.get('airline', 'Unknown'),
+            airline=get_reference().airline_name(flight_details.get('airline', 'Unknown')),
             trip_type=alert_details.get('trip_type', '').replace('-', ' ').title(),
             results_link=results_link,
             unsubscribe_link=unsubscribe_link,
@@ -163,17 +285,17 @@ def send_price_drop_notification(to_email, alert_details, flight_details):
         message = Mail(
             from_email=SENDER_EMAIL,
             to_emails=to_email,
-            subject=f'Price Drop Alert: ${flight_details["price"]} - {alert_details["origin"]} → {alert_details["destination"]}',
+            subject=f'Price Drop Alert: ${flight_details["price"]} - {_route_label(alert_details)}',
             html_content=html_content,
         )
 
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
-        print(f"Price drop notification sent to {to_email}")
+        response = _send_mail(message)
+        logger.info("Price drop notification sent to %s", mask_email(to_email),
+                    extra={'status': response.status_code})
         return True
 
     except Exception as e:
-        print(f"Error sending price drop notification: {e}")
+        logger.error("Error sending price drop notification: %s", e)
         return False
 
 
@@ -193,8 +315,8 @@ def send_alert_expired_notification(to_email, alert_details):
 
         # replace placeholders
         html_content = html_template.format(
-            origin=alert_details['origin'],
-            destination=alert_details['destination'],
+            origin=get_reference().airport_label(alert_details['origin']),
+            destination=get_reference().airport_label(alert_details['destination']),
             departure_date=alert_details['departure_date'],
             return_date_html=return_date_html,
             price_threshold=alert_details['price_threshold'],
@@ -205,17 +327,17 @@ def send_alert_expired_notification(to_email, alert_details):
         message = Mail(
             from_email=SENDER_EMAIL,
             to_emails=to_email,
-            subject=f'Price Alert Expired - {alert_details["origin"]} → {alert_details['destination']}',
+            subject=f'Price Alert Expired - {_route_label(alert_details)}',
             html_content=html_content,
         )
 
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
-        print(f"Alert expired notification sent to {to_email}")
+        response = _send_mail(message)
+        logger.info("Alert expired notification sent to %s", mask_email(to_email),
+                    extra={'status': response.status_code})
         return True
 
     except Exception as e:
-        print(f"Error sending alert expired notification: {e}")
+        logger.error("Error sending alert expired notification: %s", e)
         return False
 
 
@@ -235,8 +357,8 @@ def send_deleted_alert_notification(to_email, alert_details):
 
         # replace placeholders
         html_content = html_template.format(
-            origin=alert_details['origin'],
-            destination=alert_details['destination'],
+            origin=get_reference().airport_label(alert_details['origin']),
+            destination=get_reference().airport_label(alert_details['destination']),
             departure_date=alert_details['departure_date'],
             return_date_html=return_date_html,
             price_threshold=alert_details['price_threshold'],
@@ -247,17 +369,17 @@ def send_deleted_alert_notification(to_email, alert_details):
         message = Mail(
             from_email=SENDER_EMAIL,
             to_emails=to_email,
-            subject=f"Alert Deleted - {alert_details['origin']} → {alert_details['destination']}",
+            subject=f"Alert Deleted - {_route_label(alert_details)}",
             html_content=html_content,
         )
 
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
-        print(f"Alert deleted confirmation sent to {to_email}")
+        response = _send_mail(message)
+        logger.info("Alert deleted confirmation sent to %s", mask_email(to_email),
+                    extra={'status': response.status_code})
         return True
 
     except Exception as e:
-        print(f"Error sending alert deleted notification: {e}")
+        logger.error("Error sending alert deleted notification: %s", e)
         return False
 
 
@@ -288,8 +410,8 @@ def send_alert_activated_notification(to_email, alert_details):
 
         # replace placeholders
         html_content = html_template.format(
-            origin=alert_details['origin'],
-            destination=alert_details['destination'],
+            origin=get_reference().airport_label(alert_details['origin']),
+            destination=get_reference().airport_label(alert_details['destination']),
             departure_date=alert_details['departure_date'],
             return_date_html=return_date_html,
             price_threshold=alert_details['price_threshold'],
@@ -301,17 +423,17 @@ def send_alert_activated_notification(to_email, alert_details):
         message = Mail(
             from_email=SENDER_EMAIL,
             to_emails=to_email,
-            subject=f'Alert Activated - {alert_details["origin"]} → {alert_details["destination"]}',
+            subject=f'Alert Activated - {_route_label(alert_details)}',
             html_content=html_content,
         )
 
-        sg = SendGridAPIClient(SENDGRID_API_KEY)
-        response = sg.send(message)
-        print(f"Alert activated notification sent to {to_email}")
+        response = _send_mail(message)
+        logger.info("Alert activated notification sent to %s", mask_email(to_email),
+                    extra={'status': response.status_code})
         return True
 
     except Exception as e:
-        print(f"Error sending alert activated notification: {e}")
+        logger.error("Error sending alert activated notification: %s", e)
         return False
 
 
@@ -319,8 +441,11 @@ def send_alert_activated_notification(to_email, alert_details):
 # Function Reference
 #   1. generate_verification_token() - Creates a secure random URL-safe token
 #   2. send_verification_email()     - Sends the "please verify your email" link
-#   3. send_price_drop_notification()- Alerts the user that a price dropped below threshold
-#   4. send_alert_expired_notification() - Tells the user their alert expired
-#   5. send_deleted_alert_notification() - Confirms the alert was unsubscribed/deleted
-#   6. send_alert_activated_notification() - Confirms the alert is now active
+#   3. send_bulk_verification_email() - One verification link for a contact's imported alerts
+#   4. send_my_alerts_link_email()   - Sends the signed link to a contact's alert dashboard
+#   5. send_price_drop_notification()- Alerts the user that a price dropped below threshold
+#   6. send_alert_expired_notification() - Tells the user their alert expired
+#   7. send_deleted_alert_notification() - Confirms the alert was unsubscribed/deleted
+#   8. send_alert_activated_notification() - Confirms the alert is now active
+#   9. reset_after_fork()            - New SendGrid client in a forked worker
 # ──────────────────────────────────────────────────────────────
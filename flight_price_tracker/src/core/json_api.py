@@ -0,0 +1,123 @@
+import os
+import json
+import base64
+import binascii
+from decimal import Decimal
+from datetime import date, datetime
+
+from dotenv import load_dotenv
+
+# orjson is several times faster than json for large offer lists;
+# fall back to the standard library when it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Load environment variables from .env file
+load_dotenv()
+
+# ──────────────────────────────────────────────────────────────
+# JSON API Helpers
+# Encoding, cursors and field selection for the /api/v1 routes
+# in app.py. Kept free of Flask so the price checker and tools
+# can reuse them.
+# ──────────────────────────────────────────────────────────────
+
+API_TOKEN = os.getenv('API_TOKEN')  # bearer token for /api/v1/alerts; unset disables it
+API_DEFAULT_LIMIT = 50  # items per page when ?limit= is missing
+API_MAX_LIMIT = 250  # largest page a client can ask for
+GZIP_MIN_BYTES = 1024  # smaller responses aren't worth compressing
+
+
+class CursorError(ValueError):
+    """Raised for a cursor that can't be decoded."""
+    pass
+
+
+# ──────────────────────────────────────────────────────────────
+# Encoding
+# ──────────────────────────────────────────────────────────────
+
+
+def _default(obj):
+    """Serialize the types MySQL rows contain that JSON doesn't."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """Encode to compact JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+# ──────────────────────────────────────────────────────────────
+# Cursors
+# Opaque to clients: compact JSON, URL-safe base64 without
+# padding. They carry position only, never authorization.
+# ──────────────────────────────────────────────────────────────
+
+
+def encode_cursor(state):
+    """Encode a dict of pagination state as an opaque cursor string."""
+    return base64.urlsafe_b64encode(dumps(state)).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor(). Raises CursorError if it's malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        state = json.loads(raw)
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise CursorError("Invalid cursor")
+    if not isinstance(state, dict):
+        raise CursorError("Invalid cursor")
+    return state
+
+
+# ──────────────────────────────────────────────────────────────
+# Field Selection & Limits
+# ──────────────────────────────────────────────────────────────
+
+
+# "price,airline" -> ('price', 'airline'); None/empty means all fields.
+# Unknown names are rejected so typos don't silently drop data.
+def parse_fields(fields_arg, allowed):
+    """Validate a comma-separated ?fields= value against `allowed`."""
+    if not fields_arg:
+        return None
+    fields = tuple(dict.fromkeys(f.strip() for f in fields_arg.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+
+def select_fields(records, fields):
+    """Project each record onto `fields` (all fields if None)."""
+    if fields is None:
+        return list(records)
+    return [{f: record.get(f) for f in fields} for record in records]
+
+
+def clamp_limit(limit, default=API_DEFAULT_LIMIT, maximum=API_MAX_LIMIT):
+    """Page size from ?limit=, within 1..maximum."""
+    if limit is None:
+        return default
+    return max(1, min(int(limit), maximum))
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. dumps()               - Fast compact JSON (orjson, or json fallback)
+#   2. encode_cursor()       - Pagination state -> opaque cursor
+#   3. decode_cursor()       - Opaque cursor -> pagination state
+#   4. parse_fields()        - Validates ?fields=
+#   5. select_fields()       - Projects records onto the requested fields
+#   6. clamp_limit()         - Page size within bounds
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import uuid
+import queue
+import atexit
+import logging
+import contextvars
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# ──────────────────────────────────────────────────────────────
+# Logging
+# Modules log through `logging.getLogger(__name__)` with lazy
+# %-style arguments, so a disabled level costs one cached level
+# check and the message is never built. configure_logging()
+# routes every record through a bounded queue to one output
+# handler on a background thread: callers never wait on stdout,
+# and when the queue is full records are dropped (and counted)
+# rather than blocking a request.
+#
+# Records are written as one JSON object per line (LOG_FORMAT=
+# text for local development) and carry the current request id
+# (web app) or run id (price checker) from context variables.
+# Verification tokens and codes are never logged; email
+# addresses and phone numbers go through mask_email() and
+# mask_phone().
+# ──────────────────────────────────────────────────────────────
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()  # DEBUG, INFO, WARNING or ERROR
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # json, or text for local development
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # records buffered before new ones are dropped
+
+# Third-party loggers that are too chatty (or log message bodies)
+# at INFO. twilio.http_client logs every request's form data,
+# which includes the SMS text and so the verification codes.
+QUIET_LOGGERS = ('twilio.http_client', 'urllib3')
+
+# Set per request (app.py) and per checker pass (price_checker.py)
+request_id_var = contextvars.ContextVar('request_id', default=None)
+run_id_var = contextvars.ContextVar('run_id', default=None)
+
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'request_id', 'run_id',
+}
+
+
+def new_id():
+    """A short random id for a request or run."""
+    return uuid.uuid4().hex[:16]
+
+
+def mask_email(email):
+    """"jane.doe@example.com" -> "j***@example.com"."""
+    if not email:
+        return email
+    local, _, domain = email.partition('@')
+    return f"{local[:1]}***@{domain}"
+
+
+def mask_phone(phone):
+    """"+15551234567" -> "***4567"."""
+    if not phone:
+        return phone
+    return '***' + phone[-4:]
+
+
+# ──────────────────────────────────────────────────────────────
+# Formatters
+# ──────────────────────────────────────────────────────────────
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record: ts, level, logger, msg, ids and extras."""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        if getattr(record, 'request_id', None):
+            entry['request_id'] = record.request_id
+        if getattr(record, 'run_id', None):
+            entry['run_id'] = record.run_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Readable single lines for a terminal, with ids and extras appended."""
+
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)-7s %(name)s: %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = [(key, value) for key, value in record.__dict__.items()
+                  if key not in _RECORD_ATTRS and not key.startswith('_') and value is not None]
+        for key in ('request_id', 'run_id'):
+            if getattr(record, key, None):
+                fields.append((key, getattr(record, key)))
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields)
+        return line
+
+
+# ──────────────────────────────────────────────────────────────
+# Queue Handler
+# ──────────────────────────────────────────────────────────────
+
+
+class _ContextFilter(logging.Filter):
+    """Stamps the caller's request/run id on the record (before it changes threads)."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        record.run_id = run_id_var.get()
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of waiting when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.addFilter(_ContextFilter())
+        self._exc_formatter = logging.Formatter()
+
+    # Merges the arguments in the calling thread (they may change
+    # afterwards) and turns the traceback into text, which unlike
+    # the exc_info tuple is safe to hand to another thread.
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler = None
+_listener = None
+
+
+def _stop_listener():
+    # flushes whatever is still queued (runs at interpreter exit)
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging(level=None, fmt=None, stream=None):
+    """
+    Route all logging through the queue to stdout. Calling it again
+    replaces the previous setup.
+
+    Args:
+        level: Level name (default LOG_LEVEL)
+        fmt: "json" or "text" (default LOG_FORMAT)
+        stream: Output stream (default sys.stdout)
+
+    Returns:
+        The queue handler (its .dropped counts records lost to a full queue)
+    """
+    global _handler, _listener
+
+    root = logging.getLogger()
+    if _handler is not None:
+        root.removeHandler(_handler)
+        _listener.stop()
+    else:
+        atexit.register(_stop_listener)
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(TextFormatter() if (fmt or LOG_FORMAT) == 'text' else JsonFormatter())
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, output)
+    _listener.start()
+
+    root.addHandler(_handler)
+    root.setLevel(level or LOG_LEVEL)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    return _handler
+
+
+def logging_stats():
+    """Queue depth and dropped records, for the metrics endpoint."""
+    if _handler is None:
+        return {}
+    return {'queued': _handler.queue.qsize(), 'dropped': _handler.dropped}
+
+
+# The listener thread isn't copied by fork(); a forked worker
+# starts its own on a fresh queue.
+def reset_after_fork():
+    """Restart the output thread in a forked worker."""
+    global _listener
+    if _handler is None:
+        return
+    handlers = _listener.handlers
+    _handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+    _listener = QueueListener(_handler.queue, *handlers)
+    _listener.start()
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. configure_logging()     - Queue-based JSON/text logging for the whole process
+#   2. request_id_var / run_id_var - Context variables stamped on every record
+#   3. new_id()                - Random id for a request or checker run
+#   4. mask_email() / mask_phone() - Contact details as they may appear in logs
+#   5. logging_stats()         - Queue depth and dropped records
+#   6. reset_after_fork()      - New output thread in a forked worker
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,315 @@
+import time
+import threading
+import logging
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Metrics
+# Counters and latency histograms for the hot paths (upstream
+# search, offer parsing, enrichment, DB calls, rendering and the
+# notification channels), kept in process memory and rendered in
+# the Prometheus text format: by /metrics in the web app and by
+# a small HTTP listener in the price checker.
+#
+# Recording is a perf_counter() pair plus a dict update under a
+# lock. Histograms store per-bucket counts and only make them
+# cumulative when rendered. Each process (and each forked web
+# worker) reports its own numbers; Prometheus adds them up.
+# ──────────────────────────────────────────────────────────────
+
+METRICS_PREFIX = 'flight_tracker_'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Upper bounds (seconds) from sub-millisecond cache/DB work to slow upstream calls
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+# ──────────────────────────────────────────────────────────────
+# Metric Types
+# ──────────────────────────────────────────────────────────────
+
+
+class Counter:
+    """Monotonic count per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name if name.endswith('_total') else name + '_total'
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}  # label values tuple -> count
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        """Current count for a label set (mainly for tests and tools)."""
+        return self._values.get(tuple(labels.get(name, '') for name in self.labelnames), 0)
+
+    def lines(self):
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in sorted(values):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+
+class _Timer:
+    """Context manager/decorator body for Histogram.time()."""
+
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if 'outcome' in self.histogram.labelnames and 'outcome' not in self.labels:
+            self.labels['outcome'] = 'error' if exc_type else 'ok'
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class Histogram:
+    """Bucketed observations (usually seconds) per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values = {}  # label values tuple -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, **labels):
+        """
+        Time a block: `with HISTOGRAM.time(op='x'):`. If the histogram
+        has an `outcome` label and none is given, it's set to "ok" or
+        "error" depending on whether the block raised.
+        """
+        return _Timer(self, labels)
+
+    def count(self, **labels):
+        """Observations so far for a label set."""
+        series = self._values.get(tuple(labels.get(name, '') for name in self.labelnames))
+        return sum(series[:-1]) if series else 0
+
+    def total(self):
+        """Sum of every observation so far, across all label sets."""
+        with self._lock:
+            return sum(series[-1] for series in self._values.values())
+
+    def lines(self):
+        with self._lock:
+            values = [(key, list(series)) for key, series in self._values.items()]
+        for key, series in sorted(values):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                yield (f"{self.name}_bucket{_format_labels(self.labelnames, key, (('le', _format_value(bound)),))} "
+                       f"{cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(series[-1])}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+
+# ──────────────────────────────────────────────────────────────
+# Registry
+# ──────────────────────────────────────────────────────────────
+
+
+class Registry:
+    """The process's metrics plus stats callbacks read at scrape time."""
+
+    def __init__(self):
+        self._metrics = {}  # name -> Counter/Histogram
+        self._stats = {}  # name -> (callable returning a dict of numbers, keys to expose or None)
+        self._lock = threading.Lock()
+
+    # A module imported under two names (e.g. `db` and `src.core.db`
+    # in the price checker) asks for the same metric twice and gets
+    # the same object back.
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        name = METRICS_PREFIX + name
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def register_stats(self, name, stats_func, keys=None):
+        """
+        Expose an existing stats() dict as gauges named
+        flight_tracker_<name>_<key> (non-numeric values are skipped).
+        `keys` limits it to those entries.
+        """
+        with self._lock:
+            self._stats[name] = (stats_func, keys)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            stats = list(self._stats.items())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.lines())
+
+        for name, (stats_func, keys) in stats:
+            try:
+                values = stats_func()
+            except Exception as e:
+                logger.warning("Error reading %s stats for metrics: %s", name, e)
+                continue
+            for key, value in values.items():
+                if keys is not None and key not in keys:
+                    continue
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                gauge = f"{METRICS_PREFIX}{name}_{key}"
+                lines.append(f"# TYPE {gauge} gauge")
+                lines.append(f"{gauge} {_format_value(value)}")
+
+        return '\n'.join(lines) + '\n'
+
+    # Counts recorded by the parent before the fork would otherwise be
+    # reported again by every worker.
+    def reset_after_fork(self):
+        """Start a forked worker's metrics from zero."""
+        self._lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric.reset()
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+register_stats = REGISTRY.register_stats
+render = REGISTRY.render
+reset_after_fork = REGISTRY.reset_after_fork
+
+
+def timed(histogram, **labels):
+    """Decorator recording each call's duration in `histogram`."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Timer(histogram, dict(labels)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ──────────────────────────────────────────────────────────────
+# Standalone Listener
+# For processes without a web app (the price checker):
+# GET /metrics on its own port.
+# ──────────────────────────────────────────────────────────────
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the console
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(address):
+    """
+    Serve /metrics from a daemon thread.
+
+    Args:
+        address: "host:port" (e.g. "127.0.0.1:9102")
+
+    Returns:
+        The running server
+    """
+    host, _, port = address.rpartition(':')
+    server = ThreadingHTTPServer((host or '0.0.0.0', int(port)), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. Counter / Histogram    - Labelled metric types (.inc(), .observe(), .time())
+#   2. Registry               - Holds metrics and stats callbacks; renders the text format
+#        .register_stats()    - Exposes an existing stats() dict as gauges
+#   3. timed()                - Decorator timing every call into a histogram
+#   4. start_metrics_server() - /metrics listener for the price checker
+# ──────────────────────────────────────────────────────────────
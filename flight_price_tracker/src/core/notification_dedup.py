@@ -0,0 +1,293 @@
+import os
+import socket
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Dedup Configuration
+# Every outgoing notification gets a deterministic idempotency
+# key. Keys are stored as 16-byte digests in a small local
+# SQLite file so that a crashed/retried checker run (or two
+# checkers running side by side) never sends the same alert
+# twice. A bounded in-memory LRU sits in front of the file so
+# the hot path does not touch disk for keys we've already seen.
+#
+# Delivery is at-most-once: the key is claimed before the provider
+# call, so a checker that dies mid-send has claimed a key for a
+# message that may never have gone out, and it isn't retried.
+# ──────────────────────────────────────────────────────────────
+
+DEFAULT_DEDUP_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'notification_dedup.sqlite3'
+)
+
+DEDUP_DB_PATH = os.getenv('NOTIFICATION_DEDUP_PATH', DEFAULT_DEDUP_PATH)
+DEDUP_CACHE_SIZE = int(os.getenv('NOTIFICATION_DEDUP_CACHE_SIZE', 4096))  # max keys held in memory
+DEDUP_RETENTION_DAYS = int(os.getenv('NOTIFICATION_DEDUP_RETENTION_DAYS', 30))  # how long keys are kept on disk
+
+# Length of one checker "run window" in hours. Matches the 6-hour
+# schedule in price_checker.py: a new run is named after the window
+# it starts in (and the scheduler starts a new run this often).
+RUN_WINDOW_HOURS = int(os.getenv('CHECKER_RUN_WINDOW_HOURS', 6))
+
+
+# ──────────────────────────────────────────────────────────────
+# Key Helpers
+# ──────────────────────────────────────────────────────────────
+
+
+# Returns an id for the current checker run window, e.g.
+# "2026-03-01T06" for the 06:00-12:00 window. CHECKER_RUN_ID can
+# be set to pin the id explicitly (e.g. when replaying a run).
+# This only names new runs: the checker gets its run id from
+# NotificationDedupStore.begin_run(), so a run that crashed at
+# 05:59 and is re-run at 06:01 keeps its id (and its keys).
+def current_run_id(now=None):
+    """Return the id of the checker run window containing `now`."""
+    pinned = os.getenv('CHECKER_RUN_ID')
+    if pinned:
+        return pinned
+
+    now = now or datetime.now()
+    window_start = now.hour - (now.hour % RUN_WINDOW_HOURS)
+    return f"{now.strftime('%Y-%m-%d')}T{window_start:02d}"
+
+
+# Identifies the process that owns a checker run. The dedup file is
+# local, so host + pid is enough (and works out after a fork).
+def _run_owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# True unless the owner is a process on this host that has exited.
+# Owners on another host can't be checked and count as alive.
+def _owner_alive(owner):
+    host, _, pid = owner.rpartition(':')
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+# Builds the idempotency key for a single notification.
+# The same alert/event/channel/price/run always produces the same
+# 16-byte digest, so the key itself is tiny to store and compare.
+def make_idempotency_key(alert_id, event_type, channel, price=None, run_id=None):
+    """
+    Build a deterministic idempotency key for a notification.
+
+    Args:
+        alert_id: The alert the notification belongs to
+        event_type: e.g. "price_drop" or "expired"
+        channel: "email" or "sms"
+        price: Price that triggered the notification (optional)
+        run_id: Checker run id from current_run_id() (optional)
+
+    Returns:
+        16-byte digest identifying the notification
+    """
+    price_part = f"{float(price):.2f}" if price is not None else ""
+    raw = f"{alert_id}|{event_type}|{channel}|{price_part}|{run_id or ''}"
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).digest()
+
+
+# ──────────────────────────────────────────────────────────────
+# Dedup Store
+# ──────────────────────────────────────────────────────────────
+
+
+class NotificationDedupStore:
+    """Compact on-disk set of sent notification keys with an LRU front cache."""
+
+    def __init__(self, path=DEDUP_DB_PATH, cache_size=DEDUP_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # digest -> None, most recently used last
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # WAL mode lets several checker processes claim keys concurrently
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sent_notifications (
+                key BLOB PRIMARY KEY,
+                sent_at INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        # checker runs; finished_at stays NULL until the run completes,
+        # and only the owner (host:pid, see _run_owner()) may finish it
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS checker_runs (
+                run_id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                started_at INTEGER NOT NULL,
+                finished_at INTEGER
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+    def _remember(self, key):
+        """Add a key to the LRU, evicting the oldest entry if full."""
+        self._cache[key] = None
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # Atomically records the key. Returns True if the caller now owns
+    # the send, False if this notification was already sent (or is
+    # being sent by another process).
+    def claim(self, key):
+        """Claim a notification key. Returns False if it's a duplicate."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return False
+
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO sent_notifications (key, sent_at) VALUES (?, ?)",
+                (key, int(datetime.now().timestamp())),
+            )
+            self._conn.commit()
+            self._remember(key)
+            return cursor.rowcount == 1
+
+    # Removes a claimed key so the notification can be retried.
+    # Called when the provider call fails after claim().
+    def release(self, key):
+        """Forget a key after a failed send."""
+        with self._lock:
+            self._cache.pop(key, None)
+            self._conn.execute("DELETE FROM sent_notifications WHERE key = ?", (key,))
+            self._conn.commit()
+
+    # Returns the run id to build keys with. If a run is unfinished:
+    #   - its owner is still running (the daemon, while a --once pass
+    #     or a second checker starts): share the run, so both use the
+    #     same keys, but leave finishing it to the owner
+    #   - its owner is gone (crashed or killed): take it over, whatever
+    #     the clock says now, so its notifications aren't sent again
+    # Otherwise a new run starts under the current window's id, with a
+    # suffix if that window already had one (a deliberate re-run sends
+    # again instead of being suppressed by the finished run's keys).
+    def begin_run(self, now=None):
+        """Join or take over the unfinished checker run, or start one. Returns its run id."""
+        pinned = os.getenv('CHECKER_RUN_ID')
+        if pinned:
+            return pinned
+
+        owner = _run_owner()
+        now = now or datetime.now()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, owner FROM checker_runs WHERE finished_at IS NULL ORDER BY started_at DESC LIMIT 1"
+            ).fetchone()
+            if row:
+                run_id, run_owner = row
+                if run_owner != owner and not _owner_alive(run_owner):
+                    logger.info("Resuming checker run %s left unfinished by %s", run_id, run_owner)
+                    self._conn.execute("UPDATE checker_runs SET owner = ? WHERE run_id = ?", (owner, run_id))
+                    self._conn.commit()
+                return run_id
+
+            window = current_run_id(now)
+            run_id, attempt = window, 1
+            while self._conn.execute("SELECT 1 FROM checker_runs WHERE run_id = ?", (run_id,)).fetchone():
+                attempt += 1
+                run_id = f"{window}.{attempt}"
+            self._conn.execute(
+                "INSERT INTO checker_runs (run_id, owner, started_at) VALUES (?, ?, ?)",
+                (run_id, owner, int(now.timestamp())),
+            )
+            self._conn.commit()
+            return run_id
+
+    def finish_run(self, run_id):
+        """Mark a run complete if this process owns it. Returns True if it did."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE checker_runs SET finished_at = ? WHERE run_id = ? AND owner = ? AND finished_at IS NULL",
+                (int(datetime.now().timestamp()), run_id, _run_owner()),
+            )
+            self._conn.commit()
+            return cursor.rowcount == 1
+
+    # Drops keys (and finished runs) older than the retention window
+    # so the file stays small.
+    def prune(self, retention_days=DEDUP_RETENTION_DAYS):
+        """Delete keys older than `retention_days`. Returns rows removed."""
+        cutoff = int((datetime.now() - timedelta(days=retention_days)).timestamp())
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM sent_notifications WHERE sent_at < ?", (cutoff,)
+            )
+            self._conn.execute(
+                "DELETE FROM checker_runs WHERE finished_at < ?", (cutoff,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# ──────────────────────────────────────────────────────────────
+# Send Wrapper
+# ──────────────────────────────────────────────────────────────
+
+
+# Claims the key, then calls the send function. If the send fails
+# the key is released so the next run can try again. Duplicates
+# are reported as delivered, since the earlier send succeeded.
+# A crash between the claim and the provider call leaves the key
+# claimed, so that notification is lost (at-most-once delivery).
+def deliver_once(store, key, send_func, *args):
+    """
+    Call `send_func(*args)` at most once per idempotency key.
+
+    Returns: True if the notification was sent now or previously,
+             False if the send failed
+    """
+    if not store.claim(key):
+        logger.info("Skipping duplicate notification via %s", send_func.__name__)
+        return True
+
+    try:
+        sent = send_func(*args)
+    except Exception:
+        store.release(key)
+        raise
+
+    if not sent:
+        store.release(key)
+    return sent
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. current_run_id()          - Id of the current checker run window
+#   2. make_idempotency_key()    - Deterministic 16-byte key for one notification
+#   3. NotificationDedupStore    - SQLite-backed key set with an LRU front cache
+#        .begin_run()            - Join/take over the unfinished checker run or start one
+#        .finish_run()           - Mark this process's checker run complete
+#   4. deliver_once()            - Sends a notification only if its key is new
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,120 @@
+import os
+import threading
+import logging
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Background Notification Queue
+# Verification and activation messages used to be sent inside
+# the web request, so every alert form post waited on SendGrid
+# and Twilio. The queue hands those sends to a small thread
+# pool and records a per-alert delivery status that the next
+# page can poll (see /alerts/<id>/delivery-status in app.py).
+#
+# The status map is in memory, per process. Under a preforking
+# server (gunicorn -w 4) the poll is answered by whichever
+# worker takes it, and only the one that queued the send knows
+# the status; the others return {}. script.js treats {} as
+# "not done yet" and keeps polling (so a poll that lands on the
+# right worker still shows the result), then hides the box after
+# ~30 seconds. The send itself isn't affected, only the report.
+# ──────────────────────────────────────────────────────────────
+
+NOTIFICATION_WORKERS = int(os.getenv('NOTIFICATION_WORKERS', 4))  # concurrent background sends
+NOTIFICATION_STATUS_MAX = int(os.getenv('NOTIFICATION_STATUS_MAX', 10000))  # alerts whose status we remember
+
+# Delivery states reported to the client
+STATUS_QUEUED = 'queued'
+STATUS_SENT = 'sent'
+STATUS_FAILED = 'failed'
+
+
+class NotificationQueue:
+    """Thread pool for outbound messages plus a bounded per-alert status map."""
+
+    def __init__(self, max_workers=NOTIFICATION_WORKERS, max_tracked=NOTIFICATION_STATUS_MAX, name='notify'):
+        self.max_workers = max_workers
+        self.max_tracked = max_tracked
+        self.name = name  # worker thread name prefix
+        self._executor = None
+        self._statuses = OrderedDict()  # alert_id -> {kind: status}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix=self.name
+                )
+            return self._executor
+
+    def _set_status(self, alert_id, kind, status):
+        with self._lock:
+            entry = self._statuses.setdefault(str(alert_id), {})
+            entry[kind] = status
+            self._statuses.move_to_end(str(alert_id))
+            if len(self._statuses) > self.max_tracked:
+                self._statuses.popitem(last=False)
+
+    def _run(self, alert_id, kind, send_func, args):
+        try:
+            sent = send_func(*args)
+        except Exception as e:
+            logger.exception("Error in background %s for alert %s: %s", kind, alert_id, e)
+            sent = False
+        self._set_status(alert_id, kind, STATUS_SENT if sent else STATUS_FAILED)
+        return sent
+
+    # Queues send_func(*args) and returns immediately. `kind` names the
+    # message (e.g. "verification_email") in the alert's status map.
+    # The send runs in a copy of the caller's context, so its log
+    # lines carry the request id of the request that queued it.
+    def submit(self, alert_id, kind, send_func, *args):
+        """Queue a send for an alert. Returns a Future resolving to True/False."""
+        self._set_status(alert_id, kind, STATUS_QUEUED)
+        context = contextvars.copy_context()
+        return self._get_executor().submit(context.run, self._run, alert_id, kind, send_func, args)
+
+    def status(self, alert_id):
+        """Return {kind: status} for an alert, or {} if nothing was queued."""
+        with self._lock:
+            return dict(self._statuses.get(str(alert_id), {}))
+
+    def shutdown(self, wait=True):
+        """Stop accepting work and optionally wait for queued sends."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+    # The parent's worker threads aren't copied by fork(), so its
+    # executor can't be shut down (or used) from the child.
+    def reset_after_fork(self):
+        """Forget the parent's executor and statuses in a forked worker."""
+        self._lock = threading.Lock()
+        self._executor = None
+        self._statuses = OrderedDict()
+
+
+# Shared queue used by the web app
+notification_queue = NotificationQueue()
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. NotificationQueue     - Background sender with per-alert delivery status
+#        .submit()           - Queue a send and return right away
+#        .status()           - Delivery status for an alert ({kind: queued/sent/failed})
+#        .shutdown()         - Stop the worker threads
+#        .reset_after_fork() - Fresh pool state in a forked worker
+#   2. notification_queue    - Shared instance used by app.py
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,265 @@
+import os
+import time
+import heapq
+import hashlib
+import threading
+import logging
+from array import array
+from datetime import date
+
+from dotenv import load_dotenv
+
+from src.core.search_cache import params_from_key
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Popular Routes
+# Every search key is counted in a Count-Min sketch (fixed
+# memory no matter how many distinct searches we see) and the
+# most searched keys are kept in a small top-K heap. Counts are
+# halved every POPULAR_ROUTES_DECAY_HOURS so the list follows
+# what people are searching for now.
+#
+# RouteWarmer walks the top routes in the background and
+# refreshes their cached result sets before they go stale, so
+# most searches are cache hits. It never makes more than
+# SEARCH_WARM_CALLS_PER_HOUR upstream calls.
+# ──────────────────────────────────────────────────────────────
+
+POPULAR_ROUTES_TOP_K = int(os.getenv('POPULAR_ROUTES_TOP_K', 100))  # heavy hitters kept exactly
+POPULAR_ROUTES_SKETCH_WIDTH = int(os.getenv('POPULAR_ROUTES_SKETCH_WIDTH', 4096))  # counters per sketch row
+POPULAR_ROUTES_SKETCH_DEPTH = int(os.getenv('POPULAR_ROUTES_SKETCH_DEPTH', 4))  # sketch rows (hash functions)
+POPULAR_ROUTES_DECAY_HOURS = float(os.getenv('POPULAR_ROUTES_DECAY_HOURS', 24))  # counts halve this often
+
+SEARCH_WARM_TOP_N = int(os.getenv('SEARCH_WARM_TOP_N', 20))  # routes kept warm, 0 disables the warmer
+SEARCH_WARM_CALLS_PER_HOUR = int(os.getenv('SEARCH_WARM_CALLS_PER_HOUR', 120))  # upstream call budget
+SEARCH_WARM_INTERVAL = int(os.getenv('SEARCH_WARM_INTERVAL', 300))  # seconds between warming passes
+
+
+# ──────────────────────────────────────────────────────────────
+# Count-Min Sketch
+# ──────────────────────────────────────────────────────────────
+
+
+class CountMinSketch:
+    """Approximate counts in depth x width counters; estimates never undercount."""
+
+    def __init__(self, width=POPULAR_ROUTES_SKETCH_WIDTH, depth=POPULAR_ROUTES_SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self._counters = array('I', bytes(4 * width * depth))
+
+    # One blake2b digest split into `depth` 32-bit hashes
+    def _cells(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=4 * self.depth).digest()
+        return [row * self.width + int.from_bytes(digest[4 * row:4 * row + 4], 'little') % self.width
+                for row in range(self.depth)]
+
+    # Conservative update: only the counters at the current minimum
+    # are raised, which keeps over-estimates from hash collisions low.
+    def add(self, key, count=1):
+        """Count `key` and return its new estimate."""
+        cells = self._cells(key)
+        counters = self._counters
+        estimate = min(counters[cell] for cell in cells) + count
+        for cell in cells:
+            if counters[cell] < estimate:
+                counters[cell] = estimate
+        return estimate
+
+    def estimate(self, key):
+        """Estimated count for `key`."""
+        return min(self._counters[cell] for cell in self._cells(key))
+
+    def halve(self):
+        """Halve every counter (exponential decay)."""
+        self._counters = array('I', (c >> 1 for c in self._counters))
+
+
+# ──────────────────────────────────────────────────────────────
+# Heavy Hitters
+# ──────────────────────────────────────────────────────────────
+
+
+class HeavyHitters:
+    """Count-Min sketch plus a top-K min-heap of the most frequent keys."""
+
+    def __init__(self, k=POPULAR_ROUTES_TOP_K, decay_hours=POPULAR_ROUTES_DECAY_HOURS, sketch=None):
+        self.k = k
+        self.decay_seconds = decay_hours * 3600
+        self._sketch = sketch or CountMinSketch()
+        self._top = {}  # key -> estimated count
+        self._heap = []  # (count, key); entries that disagree with _top are stale
+        self._last_decay = time.time()
+        self._lock = threading.Lock()
+
+    def _rebuild_heap(self):
+        self._heap = [(count, key) for key, count in self._top.items()]
+        heapq.heapify(self._heap)
+
+    def _maybe_decay(self):
+        if self.decay_seconds and time.time() - self._last_decay >= self.decay_seconds:
+            self._sketch.halve()
+            self._top = {key: count >> 1 for key, count in self._top.items() if count > 1}
+            self._rebuild_heap()
+            self._last_decay = time.time()
+
+    # Smallest (count, key) still in the top-K, skipping stale heap entries
+    def _floor(self):
+        heap = self._heap
+        while heap and self._top.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0]
+
+    def add(self, key):
+        """Record one occurrence of `key`."""
+        with self._lock:
+            self._maybe_decay()
+            estimate = self._sketch.add(key)
+
+            if key not in self._top and len(self._top) >= self.k:
+                floor_count, floor_key = self._floor()
+                if estimate <= floor_count:
+                    return
+                heapq.heappop(self._heap)
+                del self._top[floor_key]
+
+            self._top[key] = estimate
+            heapq.heappush(self._heap, (estimate, key))
+            if len(self._heap) > 4 * self.k:
+                self._rebuild_heap()
+
+    def top(self, n=None):
+        """Return [(key, count), ...] for the most frequent keys, highest first."""
+        with self._lock:
+            items = sorted(self._top.items(), key=lambda item: (-item[1], item[0]))
+        return items[:n] if n is not None else items
+
+    def estimate(self, key):
+        """Estimated count for any key, in or out of the top-K."""
+        with self._lock:
+            return self._sketch.estimate(key)
+
+
+# ──────────────────────────────────────────────────────────────
+# Cache Warmer
+# ──────────────────────────────────────────────────────────────
+
+
+class RouteWarmer:
+    """Background thread that keeps the most searched routes fresh in a SearchCache."""
+
+    def __init__(self, cache, tracker, fetch, top_n=SEARCH_WARM_TOP_N,
+                 calls_per_hour=SEARCH_WARM_CALLS_PER_HOUR, interval=SEARCH_WARM_INTERVAL):
+        """
+        Args:
+            cache: SearchCache to keep warm
+            tracker: HeavyHitters counting search keys
+            fetch: Function taking SearchParams and returning offers
+            top_n: How many of the top routes to keep warm
+            calls_per_hour: Upstream call budget for warming
+            interval: Seconds between warming passes
+        """
+        self.cache = cache
+        self.tracker = tracker
+        self.fetch = fetch
+        self.top_n = top_n
+        self.calls_per_hour = calls_per_hour
+        self.interval = interval
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {'passes': 0, 'calls': 0, 'errors': 0, 'last_pass': None, 'last_pass_calls': 0}
+
+    @property
+    def calls_per_pass(self):
+        return max(1, int(self.calls_per_hour * self.interval / 3600))
+
+    # An entry needs warming if it would go stale before the next pass
+    def _needs_refresh(self, key):
+        entry = self.cache.peek(key)
+        return entry is None or entry.age + self.interval >= self.cache.ttl
+
+    def run_once(self):
+        """Refresh the top routes that need it, within this pass's budget. Returns calls made."""
+        budget = self.calls_per_pass
+        today = date.today().isoformat()
+        calls = errors = 0
+
+        for key, _ in self.tracker.top(self.top_n):
+            if calls >= budget:
+                break
+            try:
+                params = params_from_key(key)
+            except ValueError:
+                logger.warning("Skipping undecodable route key %r", key)
+                continue
+            # ISO dates compare correctly as strings
+            if not params.departure_date or params.departure_date < today:
+                continue
+            if not self._needs_refresh(key):
+                continue
+
+            calls += 1
+            try:
+                self.cache.refresh(key, lambda: self.fetch(params))
+            except Exception as e:
+                errors += 1
+                logger.warning("Error warming %s: %s", key, e)
+
+        with self._lock:
+            self._stats['passes'] += 1
+            self._stats['calls'] += calls
+            self._stats['errors'] += errors
+            self._stats['last_pass'] = time.time()
+            self._stats['last_pass_calls'] = calls
+        return calls
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.exception("Error in route warmer: %s", e)
+
+    def start(self):
+        """Start the warming thread (no-op if disabled or already running)."""
+        with self._lock:
+            if self.top_n <= 0 or (self._thread and self._thread.is_alive()):
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name='route-warmer', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the warming thread."""
+        self._stop.set()
+
+    def reset_after_fork(self):
+        """Forget the parent's thread; the next search starts one in this worker."""
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def stats(self):
+        """Warming counters for the popular-routes endpoint."""
+        with self._lock:
+            return dict(self._stats, top_n=self.top_n, calls_per_pass=self.calls_per_pass,
+                        running=bool(self._thread and self._thread.is_alive()))
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. CountMinSketch        - Fixed-memory approximate counter
+#   2. HeavyHitters          - Sketch + top-K heap of the most searched keys
+#        .add()              - Count one search
+#        .top()              - Most searched keys with their counts
+#   3. RouteWarmer           - Keeps the top routes fresh in the search cache
+#        .run_once()         - One warming pass within the call budget
+#        .start()/.stop()    - Background thread control
+#        .reset_after_fork() - Forget the parent's thread in a forked worker
+# ──────────────────────────────────────────────────────────────
@@ -1,7 +1,8 @@
 import sys
 import os
 import time
-import schedule
+import logging
+import argparse
 from datetime import datetime, date
 
 # ──────────────────────────────────────────────────────────────
@@ -10,13 +11,69 @@ from datetime import datetime, date
 # the Travelpayouts API wrapper.
 # ──────────────────────────────────────────────────────────────
 
-from db import get_connection, update_last_checked, delete_alert, update_price_threshold
-from email_service import send_price_drop_notification, send_alert_expired_notification
-from sms_service import send_price_drop_sms, send_alert_expired_sms
-
 # Add parent directory to path
+# Done before the local imports because the core modules import
+# each other through the src.core package.
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-from src.api.travelpayouts import prices_for_dates
+
+from db import (get_connection, update_last_checked, delete_alert, update_price_threshold, record_price_point,
+                get_alerts_by_ids, get_alert_changes, get_latest_change_seq, prune_alert_changes, DB_SECONDS)
+from email_service import send_price_drop_notification, send_alert_expired_notification, NOTIFICATION_SECONDS
+from sms_service import send_price_drop_sms, send_alert_expired_sms
+from notification_dedup import NotificationDedupStore, make_idempotency_key, deliver_once, RUN_WINDOW_HOURS
+from alert_schedule import AlertSchedule
+from src.core.search_cache import SearchCache, SearchParams, search_key
+from src.core.search_store import get_search_store
+from src.api.travelpayouts import prices_for_dates, AMADEUS_MAX_RESULTS, UPSTREAM_SECONDS, OFFER_PARSE_SECONDS
+from src.core import metrics
+from src.core.logs import configure_logging, run_id_var, new_id, mask_email, mask_phone
+from src.core.profiling import PROFILE_CHECKER, profiled_run
+
+logger = logging.getLogger(__name__)
+
+# Result sets shared with the web app through the on-disk store,
+# so a route someone just searched isn't fetched again here (and
+# the checker's fetches warm /search).
+_search_cache = None
+
+
+def get_search_cache():
+    """Return the checker's search cache."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache(store=get_search_store())
+    return _search_cache
+
+
+CHECKER_POLL_SECONDS = float(os.getenv('CHECKER_POLL_SECONDS', 5))  # how often the change feed is polled
+CHECKER_ALERT_DELAY = float(os.getenv('CHECKER_ALERT_DELAY', 2))  # seconds between alert checks (0 = no pause)
+CHANGE_FEED_BATCH = 500  # change rows read per query
+CHECKER_HOUSEKEEPING_SECONDS = 3600  # dedup/change-feed pruning interval
+CHECKER_METRICS_ADDR = os.getenv('CHECKER_METRICS_ADDR', '127.0.0.1:9102')  # /metrics listener (empty disables)
+
+# Time per alert check (fetch, compare, notify) by how it ended
+CHECKER_ALERT_SECONDS = metrics.histogram('checker_alert_seconds', 'Checking one alert, by result', ('result',))
+
+# How a profiled run splits each alert's time (see profiling.py);
+# whatever these don't cover (cache, dedup store) counts as "other"
+ALERT_PHASES = {
+    'api': UPSTREAM_SECONDS,
+    'parse': OFFER_PARSE_SECONDS,
+    'db': DB_SECONDS,
+    'notify': NOTIFICATION_SECONDS,
+}
+
+# Shared dedup store for every notification the checker sends.
+# Opened lazily so importing this module doesn't touch disk.
+_dedup_store = None
+
+
+def get_dedup_store():
+    """Return the process-wide notification dedup store."""
+    global _dedup_store
+    if _dedup_store is None:
+        _dedup_store = NotificationDedupStore()
+    return _dedup_store
 
 
 # ──────────────────────────────────────────────────────────────
@@ -42,12 +99,37 @@ def get_verified_active_alerts():
             """)
             return cursor.fetchall()
     except Exception as e:
-        print(f"Error fetching alerts: {e}")
+        logger.error("Error fetching alerts: %s", e)
         return []
     finally:
         connection.close()
 
 
+# Fetches the same result set /search would for this route, or
+# reuses it if anyone fetched it within SEARCH_CACHE_TTL. Offers
+# come back cheapest first.
+def fetch_alert_offers(alert):
+    """Current offers for an alert's route and dates."""
+    one_way = (alert['trip_type'] == 'one-way')
+    params = SearchParams(
+        alert['origin'], alert['destination'], str(alert['departure_date']),
+        str(alert['return_date']) if not one_way and alert['return_date'] else None,
+        one_way, 1, 0, 0,
+    )
+
+    cache = get_search_cache()
+    key = search_key(params)
+    entry = cache.get(key) or cache.refresh(key, lambda: prices_for_dates(
+        origin=params.origin,
+        destination=params.destination,
+        departure_at=params.departure_date,
+        return_at=params.return_date,
+        one_way=one_way,
+        limit=AMADEUS_MAX_RESULTS,
+    ))
+    return entry.offers
+
+
 # ──────────────────────────────────────────────────────────────
 # Price Checking Logic
 # ──────────────────────────────────────────────────────────────
@@ -56,13 +138,23 @@ def get_verified_active_alerts():
 # The core function that processes a single alert:
 #   1. Checks if the departure date has already passed — if so,
 #      sends an expiration notice and deletes the alert.
-#   2. Otherwise, calls the Travelpayouts API for current prices.
+#   2. Otherwise, gets current prices (shared search cache or API).
 #   3. If any flight is below the user's threshold, sends a
 #      price-drop notification (email and/or SMS) and lowers
 #      the threshold to the new price so repeated notifications
 #      only fire on further drops.
-def check_prices_for_alert(alert):
-    """Check if current prices are below threshold for a specific alert."""
+# Every send goes through deliver_once() with an idempotency key,
+# so re-running a crashed check never repeats a notification.
+def check_prices_for_alert(alert, run_id=None):
+    """
+    Check if current prices are below threshold for a specific alert.
+
+    Returns:
+        How the check ended: "expired", "price_drop", "no_drop" or "error"
+    """
+    dedup_store = get_dedup_store()
+    start = time.perf_counter()
+    result = 'error'
     try:
         # ── Step 1: Check if departure date has passed ────────
 
@@ -74,7 +166,7 @@ def check_prices_for_alert(alert):
             departure_date = datetime.strptime(departure_date, '%Y-%m-%d').date()
 
         if departure_date < date.today():
-            print(f"Alert ID {alert['id']} departure date passed. Deleting alert.")
+            logger.info("Alert %s departure date passed. Deleting alert.", alert['id'], extra={'alert_id': alert['id']})
 
             # send expired notification
             alert_details = {
@@ -86,41 +178,46 @@ def check_prices_for_alert(alert):
                 'trip_type': alert['trip_type'],
             }
 
+            # Expiry happens once per alert, so the key has no price or run id
             # for email
             if alert['email']:
-                send_alert_expired_notification(alert['email'], alert_details)
+                key = make_idempotency_key(alert['id'], 'expired', 'email')
+                deliver_once(dedup_store, key, send_alert_expired_notification, alert['email'], alert_details)
 
             # for phone
             if alert['phone']:
-                send_alert_expired_sms(alert['phone'], alert_details)
+                key = make_idempotency_key(alert['id'], 'expired', 'sms')
+                deliver_once(dedup_store, key, send_alert_expired_sms, alert['phone'], alert_details)
 
             # Remove the alert entirely since it's no longer relevant
             delete_alert(alert['id'])
-            return
+            result = 'expired'
+            return result
 
         # ── Step 2: Fetch current prices from the API ─────────
 
-        print(f"Checking alert ID {alert['id']}: {alert['origin']} -> {alert['destination']}")
+        logger.debug("Checking alert %s: %s -> %s", alert['id'], alert['origin'], alert['destination'],
+                     extra={'alert_id': alert['id']})
 
-        # determine if one-way
-        one_way = (alert['trip_type'] == 'one-way')
+        # call amadeus api (or the shared search cache) to get current prices
+        flights = fetch_alert_offers(alert)
 
-        # call amadeus api to get current prices
-        flights = prices_for_dates(
-            origin=alert['origin'],
-            destination=alert['destination'],
-            departure_at=str(alert['departure_date']),
-            return_at=str(alert['return_date']) if not one_way and alert['return_date'] else None,
-            one_way=one_way,
-            limit=10,
-        )
+        # keep the alert's price history (offers are cheapest first); a
+        # failed insert only loses the history point, not the notification
+        if flights:
+            try:
+                record_price_point(alert['id'], flights[0]['price'], flights[0].get('airline'))
+            except Exception as e:
+                logger.warning("Error recording price history for alert %s: %s", alert['id'], e,
+                               extra={'alert_id': alert['id']})
 
         # ── Step 3: Compare prices against the threshold ──────
 
         # check if any flights are below the threshold
         for flight in flights:
             if flight['price'] < alert['price_threshold']:
-                print(f"Price drop found! ${flight['price']} <= ${alert['price_threshold']}")
+                logger.info("Price drop found for alert %s: $%s < $%s", alert['id'], flight['price'],
+                            alert['price_threshold'], extra={'alert_id': alert['id']})
 
                 # Build alert and flight detail dicts for the notification templates
                 # send notification email
@@ -141,35 +238,52 @@ def check_prices_for_alert(alert):
 
                 # Send email notification if email exists and is verified
                 if alert['email'] and alert['email_verified']:
-                    if send_price_drop_notification(alert['email'], alert_details, flight_details):
-                        print(f"Email notification sent to {alert['email']}")
+                    key = make_idempotency_key(alert['id'], 'price_drop', 'email', flight['price'], run_id)
+                    if deliver_once(dedup_store, key, send_price_drop_notification,
+                                    alert['email'], alert_details, flight_details):
+                        logger.info("Email notification sent to %s", mask_email(alert['email']),
+                                    extra={'alert_id': alert['id']})
                     else:
-                        print(f"Failed to send email to {alert['email']}")
+                        logger.warning("Failed to send email to %s", mask_email(alert['email']),
+                                       extra={'alert_id': alert['id']})
 
                 # Send SMS if phone exists and is verified
                 if alert['phone'] and alert['phone_verified']:
-                    if send_price_drop_sms(alert['phone'], alert_details, flight_details):
-                        print(f"SMS notification sent to {alert['phone']}")
+                    key = make_idempotency_key(alert['id'], 'price_drop', 'sms', flight['price'], run_id)
+                    if deliver_once(dedup_store, key, send_price_drop_sms,
+                                    alert['phone'], alert_details, flight_details):
+                        logger.info("SMS notification sent to %s", mask_phone(alert['phone']),
+                                    extra={'alert_id': alert['id']})
                     else:
-                        print(f"Failed to send SMS to {alert['phone']}")
+                        logger.warning("Failed to send SMS to %s", mask_phone(alert['phone']),
+                                       extra={'alert_id': alert['id']})
 
                 # update the price threshold to the new lower price
                 # This way the user only gets notified again if the
                 # price drops even further.
                 update_price_threshold(alert['id'], flight['price'])
-                print(f"Price threshold updated to ${flight['price']}")
+                logger.debug("Price threshold for alert %s updated to $%s", alert['id'], flight['price'],
+                             extra={'alert_id': alert['id']})
+                result = 'price_drop'
 
                 # only send one notification per alert check
                 break
         else:
             # This else belongs to the for-loop — it runs only when
             # no flight triggered a break (i.e., no price drop found).
-            print(f"No prices below ${alert['price_threshold']} found")
+            logger.debug("No prices below $%s found for alert %s", alert['price_threshold'], alert['id'],
+                         extra={'alert_id': alert['id']})
             # update last checked timestamp
             update_last_checked(['id'])
+            result = 'no_drop'
 
     except Exception as e:
-        print(f"Error checking prices for alert {alert['id']}: {e}")
+        logger.exception("Error checking prices for alert %s: %s", alert['id'], e, extra={'alert_id': alert['id']})
+
+    finally:
+        CHECKER_ALERT_SECONDS.observe(time.perf_counter() - start, result=result)
+
+    return result
 
 
 # ──────────────────────────────────────────────────────────────
@@ -180,77 +294,186 @@ def check_prices_for_alert(alert):
 
 
 # Runs a single pass over all verified alerts.
-# Called both on startup and on the recurring schedule.
+# Handy for a one-off manual run; run_scheduler() checks alerts
+# incrementally instead.
 # Prints a timestamped header/footer so you can see each
 # run in the console output.
-def check_all_alerts():
+# With `profile` the whole pass is profiled (see profiling.py).
+def check_all_alerts(profile=PROFILE_CHECKER):
     """Main function to check all active alerts."""
-    print(f"\n{'='*50}")
-    print(f"Price Check Run - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*50}\n")
+    # Log lines from this pass share a run id; its notifications
+    # share the dedup run, which a re-run after a crash resumes
+    # (see notification_dedup.py)
+    dedup_store = get_dedup_store()
+    run_id_var.set(new_id())
+    run_id = dedup_store.begin_run()
+    logger.info("Price check run started", extra={'dedup_window': run_id})
+
+    # Keep the dedup file small by dropping keys past the retention
+    # window; best effort, a locked file shouldn't stop the run
+    try:
+        dedup_store.prune()
+    except Exception as e:
+        logger.error("Error pruning the notification dedup store: %s", e)
 
     alerts = get_verified_active_alerts()
-    print(f"Found {len(alerts)} active verified alerts\n")
+    logger.info("Found %d active verified alerts", len(alerts))
 
     if not alerts:
-        print("No alerts to check")
+        dedup_store.finish_run(run_id)
         return
 
-    for alert in alerts:
-        check_prices_for_alert(alert)
-        time.sleep(2)  # wait 2 sec between api calls to avoid rate limiting
+    with profiled_run('checker', run_id_var.get(), profile, ALERT_PHASES) as run_profile:
+        check = run_profile.timed_alert_check(check_prices_for_alert) if run_profile else check_prices_for_alert
+        for alert in alerts:
+            check(alert, run_id)
+            if CHECKER_ALERT_DELAY:
+                time.sleep(CHECKER_ALERT_DELAY)  # wait between api calls to avoid rate limiting
 
-    print(f"\n{'='*50}")
-    print(f"Price check completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"{'='*50}\n")
+    # only a pass that got through every alert counts as finished (a
+    # no-op when the run belongs to a daemon this pass joined)
+    dedup_store.finish_run(run_id)
+    logger.info("Price check run completed", extra={'alerts': len(alerts)})
 
 
 # ──────────────────────────────────────────────────────────────
 # Scheduler
-# Uses the `schedule` library to run check_all_alerts() on a
-# fixed interval. The while-loop keeps the process alive and
-# polls every 60 seconds for pending jobs.
+# Loads the verified alerts once, then follows the alert_changes
+# feed: new and newly verified alerts are checked within a few
+# seconds, deleted ones are dropped, and every alert is checked
+# again CHECKER_INTERVAL_HOURS after its last check.
 # ──────────────────────────────────────────────────────────────
 
 
-# Sets up the recurring schedule and kicks off the first run
-# immediately. This function blocks forever (until Ctrl+C).
-def run_scheduler():
-    """Run the price checker on a schedule."""
-    # Schedule the job to run every 6 hours
-    schedule.every(6).hours.do(check_all_alerts)
-
-    # Also run immediately on startuo
-    check_all_alerts()
-
-    print("\nPrice checker is running...")
-    print("Checking prices every 6 hours")
-    print("Press Ctrl+C to stop\n")
-
-    # keep the script running
+# Applies any alert changes since the schedule's watermark.
+def poll_alert_changes(alert_schedule):
+    """Pull new alert changes into the schedule. Returns (added, removed)."""
+    added = removed = 0
+    while True:
+        changes = get_alert_changes(alert_schedule.poll_from, CHANGE_FEED_BATCH)
+        batch_added, batch_removed = alert_schedule.apply_changes(changes, get_alerts_by_ids)
+        added += batch_added
+        removed += batch_removed
+        # a full page means there may be more waiting
+        if len(changes) < CHANGE_FEED_BATCH:
+            break
+    if added or removed:
+        logger.info("Change feed: %d alert(s) added, %d removed (%d scheduled)", added, removed, len(alert_schedule))
+    return added, removed
+
+
+def _housekeeping():
+    get_dedup_store().prune()
+    prune_alert_changes()
+
+
+# Starts the checker and blocks forever (until Ctrl+C). The
+# watermark is read before the startup load so no change made
+# during the load is missed (re-applying one is harmless).
+# Notifications are deduplicated per dedup run: the scheduler
+# takes over the run it left unfinished before a restart (which
+# checks every alert right away) and starts a new one every
+# RUN_WINDOW_HOURS (see NotificationDedupStore.begin_run()).
+# With `profile` each batch of due alerts is profiled as a run.
+def run_scheduler(profile=PROFILE_CHECKER):
+    """Run the price checker, following the alert change feed."""
+    # metrics are optional: a taken port (or a bad address) shouldn't stop the checker
+    if CHECKER_METRICS_ADDR:
+        try:
+            metrics.start_metrics_server(CHECKER_METRICS_ADDR)
+            logger.info("Metrics at http://%s/metrics", CHECKER_METRICS_ADDR)
+        except (OSError, ValueError) as e:
+            logger.error("Could not serve metrics on %s, continuing without them: %s", CHECKER_METRICS_ADDR, e)
+
+    alert_schedule = AlertSchedule()
+    watermark = get_latest_change_seq()
+    alert_schedule.load(get_verified_active_alerts(), watermark)
+    metrics.register_stats('checker', lambda: {'scheduled_alerts': len(alert_schedule)})
+
+    logger.info("Price checker is running with %d alert(s), checking each every %g hours "
+                "and new alerts within %g seconds (Ctrl+C to stop)",
+                len(alert_schedule), alert_schedule.interval / 3600, CHECKER_POLL_SECONDS)
+
+    dedup_store = get_dedup_store()
+    dedup_run = dedup_store.begin_run()
+    dedup_run_started = time.time()
+
+    last_housekeeping = 0
     while True:
-        schedule.run_pending()
-        time.sleep(60)  # check every minute if a scheduled task needs to run
+        # each pass through the loop gets its own run id in the logs
+        run_id_var.set(new_id())
+        if time.time() - dedup_run_started >= RUN_WINDOW_HOURS * 3600:
+            try:
+                dedup_store.finish_run(dedup_run)
+                dedup_run = dedup_store.begin_run()
+            except Exception as e:
+                logger.error("Error starting a new dedup run: %s", e)
+            dedup_run_started = time.time()
+
+        if time.time() - last_housekeeping >= CHECKER_HOUSEKEEPING_SECONDS:
+            try:
+                _housekeeping()
+            except Exception as e:
+                logger.error("Error during housekeeping: %s", e)
+            # advanced either way: a failing prune is retried next interval, not every poll
+            last_housekeeping = time.time()
+
+        try:
+            poll_alert_changes(alert_schedule)
+        except Exception as e:
+            logger.error("Error polling alert changes: %s", e)
+
+        # check whatever is due, polling the feed between alerts so a
+        # long batch doesn't delay newly verified alerts
+        due = alert_schedule.pop_due()
+        with profiled_run('checker', run_id_var.get(), profile and bool(due), ALERT_PHASES) as run_profile:
+            check = run_profile.timed_alert_check(check_prices_for_alert) if run_profile else check_prices_for_alert
+            for alert in due:
+                check(alert, dedup_run)
+                alert_schedule.reschedule(alert['id'])
+                if CHECKER_ALERT_DELAY:
+                    time.sleep(CHECKER_ALERT_DELAY)  # wait between api calls to avoid rate limiting
+                try:
+                    poll_alert_changes(alert_schedule)
+                except Exception as e:
+                    logger.error("Error polling alert changes: %s", e)
+
+        time.sleep(CHECKER_POLL_SECONDS)
 
 
 # ──────────────────────────────────────────────────────────────
 # Entry Point
 # Run this file directly (python price_checker.py) to start
-# the background price checker. It will run immediately and
-# then repeat every 6 hours until stopped with Ctrl+C.
+# the background price checker. It checks every alert right
+# away, then each one every 6 hours (and new alerts within
+# seconds) until stopped with Ctrl+C. --once does a single
+# pass over every alert and exits.
 # ──────────────────────────────────────────────────────────────
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check alert prices and send price-drop notifications.")
+    parser.add_argument('--once', action='store_true', help="check every alert once, then exit")
+    parser.add_argument('--profile', action='store_true', help="profile each run (same as PROFILE_CHECKER=1)")
+    args = parser.parse_args()
+
+    configure_logging()
     try:
-        run_scheduler()
+        if args.once:
+            check_all_alerts(profile=args.profile or PROFILE_CHECKER)
+        else:
+            run_scheduler(profile=args.profile or PROFILE_CHECKER)
     except KeyboardInterrupt:
-        print("\n\n Price checker stopped by user")
+        logger.info("Price checker stopped by user")
 
 
 # ──────────────────────────────────────────────────────────────
 # Function Reference
-#   1. get_verified_active_alerts() - Fetches all active alerts with at least one verified contact
-#   2. check_prices_for_alert()     - Checks a single alert: expires it or sends price-drop notices
-#   3. check_all_alerts()           - Loops through every alert and checks prices (one full pass)
-#   4. run_scheduler()              - Starts the recurring 6-hour schedule and blocks forever
+#   1. get_search_cache()           - Returns the checker's search cache (shared on-disk store)
+#   2. get_dedup_store()            - Returns the shared notification dedup store
+#   3. get_verified_active_alerts() - Fetches all active alerts with at least one verified contact
+#   4. fetch_alert_offers()         - Current offers for an alert, reusing cached result sets
+#   5. check_prices_for_alert()     - Checks a single alert: expires it or sends price-drop notices
+#   6. check_all_alerts()           - Loops through every alert and checks prices (one full pass, optionally profiled)
+#   7. poll_alert_changes()         - Applies new alert_changes rows to the in-memory schedule
+#   8. run_scheduler()              - Follows the change feed and checks alerts as they come due; blocks forever
 # ──────────────────────────────────────────────────────────────
@@ -0,0 +1,252 @@
+import os
+import sys
+import json
+import time
+import random
+import logging
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Profiling
+# Opt-in profiles of a full price checker run (PROFILE_CHECKER=1
+# or `price_checker.py --profile`) or of a random fraction of web
+# requests (PROFILE_WEB_SAMPLE). Each profiled run writes, under
+# PROFILE_DIR:
+#   <name>.prof          cProfile stats (python -m pstats, snakeviz)
+#   <name>.collapsed     sampled wall-clock stacks of the profiled
+#                        thread, one "frame;frame;... count" line
+#                        per stack (flamegraph.pl, speedscope)
+#   <name>-alerts.jsonl  checker runs only: per-alert wall time
+#                        split into api/parse/db/notify/other
+#
+# The per-alert split is read off the latency histograms the code
+# already records (metrics.py), so checking an alert runs exactly
+# the same code whether or not it's profiled. With profiling off
+# nothing here is started: the web hooks aren't installed and the
+# checker makes one boolean check per run.
+#
+# Since Python 3.12 cProfile hooks every thread and only one
+# profiler can be active per process, so one run is profiled at a
+# time (a sampled request that finds one in progress is skipped)
+# and a web profile includes whatever other threads did meanwhile.
+# The collapsed stacks only cover the profiled thread.
+# ──────────────────────────────────────────────────────────────
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'profiles')
+
+PROFILE_CHECKER = os.getenv('PROFILE_CHECKER', '0') == '1'  # profile every price checker run
+PROFILE_WEB_SAMPLE = float(os.getenv('PROFILE_WEB_SAMPLE', 0))  # fraction of web requests profiled (0 disables)
+PROFILE_DIR = os.getenv('PROFILE_DIR', DEFAULT_PROFILE_DIR)
+PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', 0.005))  # seconds between stack samples
+
+# Frames are labelled relative to the project root when they're ours
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')) + os.sep
+
+# Held by the run being profiled
+_active = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────────
+# Stack Sampler
+# ──────────────────────────────────────────────────────────────
+
+
+class StackSampler:
+    """Counts one thread's call stacks every `interval` seconds from a background thread."""
+
+    def __init__(self, thread_id, interval=PROFILE_SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()  # "outer;...;inner" -> samples
+        self._labels = {}  # code object -> frame label
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            path = code.co_filename
+            if path.startswith(PROJECT_ROOT):
+                path = path[len(PROJECT_ROOT):]
+            else:
+                # site-packages/flask/app.py -> flask/app.py
+                path = path.rpartition('site-packages' + os.sep)[2]
+            label = self._labels[code] = f"{code.co_name} ({path}:{code.co_firstlineno})"
+        return label
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[';'.join(reversed(labels))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# ──────────────────────────────────────────────────────────────
+# Profiled Runs
+# ──────────────────────────────────────────────────────────────
+
+
+class RunProfile:
+    """cProfile plus stack samples for one checker run or web request, written on stop()."""
+
+    def __init__(self, kind, name, phases=None, directory=None):
+        """
+        Args:
+            kind: "checker" or "web" (file name prefix)
+            name: Identifies the run in file names (run id, endpoint + request id)
+            phases: {phase: Histogram} whose totals split each timed alert
+                    (see timed_alert_check)
+            directory: Where files go (default PROFILE_DIR)
+        """
+        self.kind = kind
+        self.phases = phases or {}
+        self.directory = directory or PROFILE_DIR
+        self.basename = f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}-{name}"
+        self.alerts = []  # per-alert breakdowns, in check order
+        self._profiler = cProfile.Profile()
+        self._sampler = StackSampler(threading.get_ident())
+        self._started = None
+
+    def start(self):
+        """
+        Start profiling the calling thread.
+
+        Returns:
+            False (and nothing is started) if another run holds the
+            profiler or another profiling tool is active
+        """
+        if not _active.acquire(blocking=False):
+            return False
+        try:
+            self._profiler.enable()
+        except ValueError as e:
+            # e.g. "Another profiling tool is already active" (a debugger or coverage)
+            _active.release()
+            logger.warning("Profiling not started: %s", e)
+            return False
+        self._sampler.start()
+        self._started = time.perf_counter()
+        return True
+
+    def stop(self):
+        """Stop profiling and write the files. Returns the paths written."""
+        elapsed = time.perf_counter() - self._started
+        self._profiler.disable()
+        self._sampler.stop()
+        _active.release()
+
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.basename)
+        paths = [base + '.prof', base + '.collapsed']
+        self._profiler.dump_stats(paths[0])
+        self._sampler.write_collapsed(paths[1])
+        if self.alerts:
+            paths.append(base + '-alerts.jsonl')
+            with open(paths[2], 'w', encoding='utf-8') as f:
+                for breakdown in self.alerts:
+                    f.write(json.dumps(breakdown) + '\n')
+
+        summary = {'seconds': round(elapsed, 3), 'samples': sum(self._sampler.stacks.values())}
+        if self.alerts:
+            summary.update(alerts=len(self.alerts), phase_seconds=self.phase_totals())
+        logger.info("Profile written to %s", base, extra=summary)
+        return paths
+
+    def phase_totals(self):
+        """Seconds per phase summed over the timed alerts."""
+        totals = {}
+        for breakdown in self.alerts:
+            for phase in (*self.phases, 'other'):
+                totals[phase] = round(totals.get(phase, 0.0) + breakdown[phase], 4)
+        return totals
+
+    def timed_alert_check(self, check):
+        """
+        Wrap check(alert, ...) so each call appends a breakdown to
+        self.alerts: total seconds, the growth of each phase
+        histogram during the call, and the rest as "other".
+        """
+        def timed_check(alert, *args, **kwargs):
+            before = {phase: histogram.total() for phase, histogram in self.phases.items()}
+            start = time.perf_counter()
+            result = check(alert, *args, **kwargs)
+            seconds = time.perf_counter() - start
+            breakdown = {'alert_id': alert['id'], 'result': result, 'seconds': round(seconds, 4)}
+            for phase, histogram in self.phases.items():
+                breakdown[phase] = round(histogram.total() - before[phase], 4)
+            breakdown['other'] = round(max(0.0, seconds - sum(breakdown[phase] for phase in self.phases)), 4)
+            self.alerts.append(breakdown)
+            return result
+        return timed_check
+
+
+@contextmanager
+def profiled_run(kind, name, enabled, phases=None):
+    """
+    Profile the block when `enabled`.
+
+    Yields:
+        The RunProfile, or None when disabled or another run is
+        being profiled
+    """
+    if not enabled:
+        yield None
+        return
+    profile = RunProfile(kind, name, phases)
+    if not profile.start():
+        yield None
+        return
+    try:
+        yield profile
+    finally:
+        profile.stop()
+
+
+def sample_request(endpoint, request_id):
+    """
+    Start profiling this request with probability PROFILE_WEB_SAMPLE.
+
+    Returns:
+        The started RunProfile, or None
+    """
+    if random.random() >= PROFILE_WEB_SAMPLE:
+        return None
+    profile = RunProfile('web', f"{endpoint or 'unmatched'}-{request_id}")
+    return profile if profile.start() else None
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. StackSampler                - Samples one thread's stacks into collapsed-stack counts
+#   2. RunProfile                  - cProfile + samples for one run; writes .prof/.collapsed
+#        .timed_alert_check()      - Wraps the alert check to record per-alert phase times
+#   3. profiled_run()              - Context manager profiling a block when enabled
+#   4. sample_request()            - Starts a profile for a sampled web request
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,213 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# ──────────────────────────────────────────────────────────────
+# Rate Limiting & Load Shedding
+# Every /search can cost an Amadeus call and every
+# /alerts/create sends an email and/or SMS, so both are
+# throttled per client with token buckets: a client may burst up
+# to `burst` requests, then gets `rate` more per `per` seconds.
+# Buckets are one (tokens, updated_at) tuple per key in a dict;
+# a bucket that has refilled is the same as no bucket, so the
+# periodic sweep simply drops those.
+#
+# ConcurrencyGate caps upstream searches in flight across the
+# whole process. When it's full, new misses are turned away
+# with a 503 right away instead of queueing behind Amadeus.
+# ──────────────────────────────────────────────────────────────
+
+SEARCH_RATE_PER_MINUTE = float(os.getenv('SEARCH_RATE_PER_MINUTE', 20))  # searches per IP (0 disables)
+SEARCH_RATE_BURST = int(os.getenv('SEARCH_RATE_BURST', 10))
+ALERT_RATE_PER_HOUR = float(os.getenv('ALERT_RATE_PER_HOUR', 10))  # alerts created per IP (0 disables)
+ALERT_RATE_BURST = int(os.getenv('ALERT_RATE_BURST', 5))
+CONTACT_RATE_PER_DAY = float(os.getenv('CONTACT_RATE_PER_DAY', 5))  # alerts per email/phone (0 disables)
+CONTACT_RATE_BURST = int(os.getenv('CONTACT_RATE_BURST', 3))
+SEARCH_MAX_UPSTREAM = int(os.getenv('SEARCH_MAX_UPSTREAM', 32))  # upstream searches in flight (0 = no cap)
+RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 100000))  # buckets kept per limiter
+RATE_LIMIT_SWEEP_SECONDS = 60  # how often idle buckets are evicted
+
+
+class Overloaded(RuntimeError):
+    """Raised when the upstream concurrency cap is reached."""
+    pass
+
+
+# ──────────────────────────────────────────────────────────────
+# Token Buckets
+# ──────────────────────────────────────────────────────────────
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets with periodic eviction of idle keys."""
+
+    def __init__(self, name, rate, per, burst, max_keys=RATE_LIMIT_MAX_KEYS,
+                 sweep_interval=RATE_LIMIT_SWEEP_SECONDS):
+        """
+        Args:
+            name: Label for stats ("search_ip", ...)
+            rate: Tokens added per `per` seconds (0 disables the limiter)
+            per: Refill window in seconds
+            burst: Bucket size, i.e. requests allowed back to back
+            max_keys: Bucket count above which the least recently used are dropped
+            sweep_interval: Seconds between eviction sweeps
+        """
+        self.name = name
+        self.rate = rate
+        self.per = per
+        self.burst = burst
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._refill = rate / per if per else 0.0  # tokens per second
+        self._buckets = {}  # key -> (tokens, updated_at); insertion order = least recently used first
+        self._last_sweep = time.monotonic()
+        self._stats = {'allowed': 0, 'limited': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.rate > 0 and self.burst > 0
+
+    def _tokens(self, key, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return float(self.burst)
+        tokens, updated_at = bucket
+        return min(float(self.burst), tokens + (now - updated_at) * self._refill)
+
+    # Drops buckets that have refilled (indistinguishable from new
+    # ones). Runs every sweep_interval seconds.
+    def _sweep(self, now):
+        full_after = self.burst / self._refill
+        idle = [key for key, (_, updated_at) in self._buckets.items() if now - updated_at >= full_after]
+        for key in idle:
+            del self._buckets[key]
+        self._stats['evicted'] += len(idle)
+        self._last_sweep = now
+
+    # Over max_keys, the least recently used tenth goes in one batch
+    # so a flood of new keys doesn't pay for an eviction per request.
+    def _evict_oldest(self):
+        count = len(self._buckets) - self.max_keys + max(1, self.max_keys // 10)
+        for key in list(islice(self._buckets, count)):
+            del self._buckets[key]
+        self._stats['evicted'] += count
+
+    def allow(self, key, cost=1):
+        """
+        Take `cost` tokens from the key's bucket.
+
+        Returns:
+            (allowed, retry_after) where retry_after is the seconds
+            until the request would be allowed (0 when allowed)
+        """
+        if not self.enabled or key is None:
+            return True, 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+            if len(self._buckets) >= self.max_keys:
+                self._evict_oldest()
+
+            tokens = self._tokens(key, now)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            # re-insert so the dict stays ordered by last use
+            self._buckets.pop(key, None)
+            self._buckets[key] = (tokens, now)
+            self._stats['allowed' if allowed else 'limited'] += 1
+        return allowed, 0.0 if allowed else (cost - tokens) / self._refill
+
+    def inspect(self, key):
+        """Tokens currently available to a key."""
+        with self._lock:
+            return self._tokens(key, time.monotonic())
+
+    def most_limited(self, n=10):
+        """[(key, tokens), ...] for the n keys with the fewest tokens left."""
+        now = time.monotonic()
+        with self._lock:
+            levels = [(key, self._tokens(key, now)) for key in self._buckets]
+        levels.sort(key=lambda item: item[1])
+        return [(key, round(tokens, 2)) for key, tokens in levels[:n] if tokens < self.burst]
+
+    def stats(self):
+        """Counters and configuration for the rate-limit endpoint."""
+        with self._lock:
+            return dict(self._stats, name=self.name, enabled=self.enabled, keys=len(self._buckets),
+                        rate=self.rate, per=self.per, burst=self.burst, max_keys=self.max_keys)
+
+    def reset_after_fork(self):
+        """Fresh lock in a forked worker (the buckets carry over)."""
+        self._lock = threading.Lock()
+
+
+# ──────────────────────────────────────────────────────────────
+# Upstream Concurrency Cap
+# ──────────────────────────────────────────────────────────────
+
+
+class ConcurrencyGate:
+    """Non-blocking cap on concurrent operations; rejects instead of queueing."""
+
+    def __init__(self, limit=SEARCH_MAX_UPSTREAM, retry_after=5):
+        """
+        Args:
+            limit: Operations allowed at once (0 = unlimited)
+            retry_after: Seconds suggested to clients that were turned away
+        """
+        self.limit = limit
+        self.retry_after = retry_after
+        self._in_use = 0
+        self._stats = {'admitted': 0, 'rejected': 0, 'peak': 0}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for the duration of the block. Raises Overloaded when full."""
+        with self._lock:
+            if self.limit and self._in_use >= self.limit:
+                self._stats['rejected'] += 1
+                raise Overloaded("Too many searches in progress")
+            self._in_use += 1
+            self._stats['admitted'] += 1
+            self._stats['peak'] = max(self._stats['peak'], self._in_use)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use -= 1
+
+    def saturated(self):
+        """True when every slot is taken (a new slot() would raise)."""
+        return bool(self.limit) and self._in_use >= self.limit
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, in_use=self._in_use, limit=self.limit)
+
+    def reset_after_fork(self):
+        """The parent's in-flight operations don't exist in a forked worker."""
+        self._lock = threading.Lock()
+        self._in_use = 0
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. TokenBucketLimiter    - Per-key token buckets with idle eviction
+#        .allow()            - Take tokens; returns (allowed, retry_after)
+#        .most_limited()     - Keys closest to their limit (inspection)
+#   2. ConcurrencyGate       - Caps concurrent upstream searches
+#        .slot()             - Context manager; raises Overloaded when full
+#        .saturated()        - Whether a new slot would be refused
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,236 @@
+import os
+import sys
+import json
+import pickle
+from types import MappingProxyType
+from collections import namedtuple
+
+# ──────────────────────────────────────────────────────────────
+# Reference Data
+# Airports and airlines loaded once per process and shared by
+# the web app, the email/SMS services, the price checker and
+# the CLI. Records are namedtuples held in read-only mappings,
+# so they are compact (no per-record dict) and can be shared
+# copy-on-write between forked workers.
+#
+# Loading can skip JSON parsing entirely by using a pickled
+# snapshot (build it with `python src/core/reference.py`).
+# The snapshot is only used while it matches the JSON files'
+# size and modification time.
+# ──────────────────────────────────────────────────────────────
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'web', 'static')
+AIRPORTS_PATH = os.path.join(STATIC_DIR, 'airports.json')
+AIRLINES_PATH = os.path.join(STATIC_DIR, 'airlines.json')
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'reference.pickle'
+)
+REFERENCE_SNAPSHOT = os.getenv('REFERENCE_SNAPSHOT', DEFAULT_SNAPSHOT_PATH)
+
+SNAPSHOT_VERSION = 1  # bump when the record layout changes
+
+Airport = namedtuple('Airport', 'code city state state_abbr country name')
+Airline = namedtuple('Airline', 'code name img')
+
+# Offer keys added by ReferenceData.enrich_offers(); anything that
+# stores offers can drop these and re-enrich on load
+ENRICHED_FIELDS = frozenset((
+    'origin_city', 'origin_country', 'destination_city', 'destination_country',
+    'airline_name', 'airline_img', 'return_airline_name', 'return_airline_img',
+))
+
+
+# ──────────────────────────────────────────────────────────────
+# Reference Data Container
+# ──────────────────────────────────────────────────────────────
+
+
+class ReferenceData:
+    """Immutable airport/airline lookups plus batch enrichment helpers."""
+
+    def __init__(self, airports, airlines):
+        """
+        Args:
+            airports: Sequence of Airport records, busiest first
+            airlines: Sequence of Airline records
+        """
+        self.airports = tuple(airports)
+        self.airlines = tuple(airlines)
+        self._airports_by_code = MappingProxyType({a.code: a for a in self.airports})
+        self._airlines_by_code = MappingProxyType({a.code: a for a in self.airlines})
+
+    # ── Single lookups (all O(1)) ─────────────────────────────
+
+    def airport(self, code):
+        """Airport record for an IATA code, or None."""
+        return self._airports_by_code.get(code)
+
+    def airline(self, code):
+        """Airline record for a carrier code, or None."""
+        return self._airlines_by_code.get(code)
+
+    def airport_city(self, code):
+        """City for an airport code, falling back to the code itself."""
+        airport = self._airports_by_code.get(code)
+        return airport.city if airport else code
+
+    def airport_country(self, code, default=''):
+        """Country for an airport code."""
+        airport = self._airports_by_code.get(code)
+        return airport.country if airport else default
+
+    def airline_name(self, code):
+        """Airline name for a carrier code, falling back to the code itself."""
+        airline = self._airlines_by_code.get(code)
+        return airline.name if airline else code
+
+    # "Los Angeles, CA (LAX)" - used in notifications instead of raw codes
+    def airport_label(self, code):
+        """Human-readable "City (CODE)" label for an airport code."""
+        airport = self._airports_by_code.get(code)
+        return f"{airport.city} ({code})" if airport else code
+
+    def airport_dicts(self):
+        """Airports as plain dicts, e.g. for building the autocomplete index."""
+        return [a._asdict() for a in self.airports]
+
+    # ── Batch enrichment ──────────────────────────────────────
+
+    # Adds city/country/airline name/logo fields to every offer in
+    # one pass. Offers are the dicts returned by prices_for_dates().
+    # Lookups are bound to locals once for the whole batch.
+    def enrich_offers(self, offers):
+        """
+        Add display fields to a list of offers in place.
+
+        Adds origin_city, origin_country, destination_city,
+        destination_country, airline_name, airline_img and, for
+        round trips, return_airline_name and return_airline_img.
+
+        Returns:
+            The same list, for convenience
+        """
+        airports = self._airports_by_code
+        airlines = self._airlines_by_code
+
+        for offer in offers:
+            origin = airports.get(offer['origin'])
+            destination = airports.get(offer['destination'])
+            offer['origin_city'] = origin.city if origin else offer['origin']
+            offer['origin_country'] = origin.country if origin else offer['origin']
+            offer['destination_city'] = destination.city if destination else offer['destination']
+            offer['destination_country'] = destination.country if destination else offer['destination']
+
+            airline = airlines.get(offer['airline'])
+            offer['airline_name'] = airline.name if airline else offer['airline']
+            offer['airline_img'] = airline.img if airline else None
+
+            if offer.get('return_airline'):
+                return_airline = airlines.get(offer['return_airline'])
+                offer['return_airline_name'] = return_airline.name if return_airline else offer['return_airline']
+                offer['return_airline_img'] = return_airline.img if return_airline else None
+
+        return offers
+
+
+# ──────────────────────────────────────────────────────────────
+# Loading
+# ──────────────────────────────────────────────────────────────
+
+
+def _source_signature():
+    """Size and mtime of the JSON sources, used to validate a snapshot."""
+    signature = []
+    for path in (AIRPORTS_PATH, AIRLINES_PATH):
+        stat = os.stat(path)
+        signature.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+    return (SNAPSHOT_VERSION, tuple(signature))
+
+
+def _load_json():
+    """Parse airports.json and airlines.json into record tuples."""
+    with open(AIRPORTS_PATH) as f:
+        airports = [
+            Airport(a['code'], a.get('city', ''), a.get('state', ''), a.get('state_abbr', ''),
+                    a.get('country', ''), a.get('name', ''))
+            for a in json.load(f)
+        ]
+    with open(AIRLINES_PATH) as f:
+        airlines = [Airline(a['code'], a.get('name', a['code']), a.get('img')) for a in json.load(f)]
+    return airports, airlines
+
+
+# Writes a pickled snapshot of the parsed records so the next
+# process can skip JSON parsing. Returns the snapshot path.
+def build_snapshot(path=REFERENCE_SNAPSHOT):
+    """Parse the JSON sources and write a pickled snapshot."""
+    airports, airlines = _load_json()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        # Plain tuples keep the pickle independent of the namedtuple classes
+        pickle.dump({
+            'signature': _source_signature(),
+            'airports': [tuple(a) for a in airports],
+            'airlines': [tuple(a) for a in airlines],
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _load_snapshot(path):
+    """Return (airports, airlines) from a snapshot, or None if it's missing or stale."""
+    try:
+        with open(path, 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if snapshot.get('signature') != _source_signature():
+        return None
+    return (
+        [Airport._make(a) for a in snapshot['airports']],
+        [Airline._make(a) for a in snapshot['airlines']],
+    )
+
+
+def load_reference(snapshot_path=REFERENCE_SNAPSHOT):
+    """Load reference data, preferring a fresh snapshot over the JSON files."""
+    loaded = _load_snapshot(snapshot_path) if snapshot_path else None
+    airports, airlines = loaded or _load_json()
+    return ReferenceData(airports, airlines)
+
+
+_reference = None
+
+
+# Every subsystem calls this rather than loading the files itself,
+# so the data is parsed once per process.
+def get_reference():
+    """Return the process-wide ReferenceData, loading it on first use."""
+    global _reference
+    if _reference is None:
+        _reference = load_reference()
+    return _reference
+
+
+# ──────────────────────────────────────────────────────────────
+# Entry Point
+# Run this file directly to (re)build the reference snapshot.
+# ──────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    snapshot_path = sys.argv[1] if len(sys.argv) > 1 else REFERENCE_SNAPSHOT
+    print(f"Reference snapshot written to {build_snapshot(snapshot_path)}")
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. ReferenceData           - Immutable airport/airline lookups
+#        .airport()/.airline() - O(1) record lookups
+#        .airport_label()      - "City (CODE)" for notifications
+#        .enrich_offers()      - Adds city/airline display fields to a list of offers
+#   2. build_snapshot()        - Writes a pickled snapshot for fast loading
+#   3. load_reference()        - Loads from a fresh snapshot or the JSON files
+#   4. get_reference()         - Shared per-process instance
+# ──────────────────────────────────────────────────────────────
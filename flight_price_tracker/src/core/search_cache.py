@@ -0,0 +1,410 @@
+import os
+import time
+import hashlib
+import threading
+import logging
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Search Result Cache
+# A search fetches the provider maximum once and keeps the
+# parsed offers as a "result set" under a short search id.
+# Paging, sorting and filtering are then served from that set
+# (see select_offers) without another upstream call.
+#
+# Entries are served stale-while-revalidate: once an entry is
+# older than SEARCH_CACHE_TTL it is still returned immediately
+# while a background task refreshes it. If the upstream keeps
+# failing, stale entries keep being served until they reach
+# SEARCH_CACHE_MAX_STALE, after which a search must succeed.
+#
+# With a SearchStore attached (see search_store.py) every result
+# set is also written to a file shared by all local processes,
+# and memory misses (or stale hits) are checked against it first.
+# ──────────────────────────────────────────────────────────────
+
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 900))  # seconds a result set is considered fresh
+SEARCH_CACHE_MAX_STALE = int(os.getenv('SEARCH_CACHE_MAX_STALE', 6 * 3600))  # hard max age for serving stale results
+SEARCH_CACHE_MAX = int(os.getenv('SEARCH_CACHE_MAX', 256))  # result sets held in memory
+SEARCH_REFRESH_WORKERS = int(os.getenv('SEARCH_REFRESH_WORKERS', 2))  # background refresh threads
+SEARCH_REFRESH_BACKOFF = int(os.getenv('SEARCH_REFRESH_BACKOFF', 60))  # seconds to wait after a failed refresh
+RENDER_CACHE_MAX = int(os.getenv('RENDER_CACHE_MAX', 128))  # rendered result pages held in memory
+SEARCH_CACHE_PRIME = int(os.getenv('SEARCH_CACHE_PRIME', 64))  # result sets loaded from the store at startup
+
+SearchParams = namedtuple(
+    'SearchParams',
+    'origin destination departure_date return_date one_way adults children infants',
+)
+
+
+# ──────────────────────────────────────────────────────────────
+# Keys
+# ──────────────────────────────────────────────────────────────
+
+
+# Canonical cache key for a search, e.g.
+# "LAX|JFK|2026-03-01|2026-03-08|rt|1|0|0"
+def search_key(params):
+    """Build the cache key for a SearchParams tuple."""
+    return '|'.join((
+        params.origin.upper(),
+        params.destination.upper(),
+        params.departure_date or '',
+        (params.return_date or '') if not params.one_way else '',
+        'ow' if params.one_way else 'rt',
+        str(params.adults),
+        str(params.children),
+        str(params.infants),
+    ))
+
+
+# Inverse of search_key(), used to re-run a search from its key
+# (e.g. when warming popular routes).
+def params_from_key(key):
+    """Rebuild SearchParams from a cache key."""
+    origin, destination, departure_date, return_date, trip, adults, children, infants = key.split('|')
+    return SearchParams(origin, destination, departure_date, return_date or None,
+                        trip == 'ow', int(adults), int(children), int(infants))
+
+
+def search_id_for(key):
+    """Short, URL-safe id for a cache key (same key -> same id)."""
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+# ──────────────────────────────────────────────────────────────
+# Cache Entries
+# ──────────────────────────────────────────────────────────────
+
+
+class CacheEntry:
+    """One cached result set: the offers for a search and when they were fetched."""
+
+    __slots__ = ('key', 'search_id', 'offers', 'fetched_at')
+
+    def __init__(self, key, offers, fetched_at=None):
+        self.key = key
+        self.search_id = search_id_for(key)
+        self.offers = tuple(offers)
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+
+    @property
+    def age(self):
+        """Seconds since the offers were fetched."""
+        return time.time() - self.fetched_at
+
+
+class SearchCache:
+    """Bounded in-memory LRU of result sets with stale-while-revalidate expiry."""
+
+    def __init__(self, ttl=SEARCH_CACHE_TTL, max_stale=SEARCH_CACHE_MAX_STALE,
+                 max_entries=SEARCH_CACHE_MAX, refresh_workers=SEARCH_REFRESH_WORKERS,
+                 store=None, on_load=None):
+        """
+        Args:
+            store: Optional SearchStore shared with other processes
+            on_load: Optional function applied to offers read from the
+                     store (e.g. ReferenceData.enrich_offers)
+        """
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.max_entries = max_entries
+        self.refresh_workers = refresh_workers
+        self.store = store
+        self.on_load = on_load
+        self._entries = OrderedDict()  # key -> CacheEntry, most recently used last
+        self._ids = {}  # search_id -> key
+        self._in_flight = {}  # key -> Future, so concurrent misses share one fetch
+        self._refreshing = set()  # keys with a background refresh queued or running
+        self._refresh_failed_at = {}  # key -> time of the last failed refresh (cached keys only)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def is_stale(self, entry):
+        """True if the entry is past its TTL (but may still be served)."""
+        return entry.age >= self.ttl
+
+    def _is_usable(self, entry):
+        return entry.age < self.max_stale
+
+    def _remember(self, entry):
+        with self._lock:
+            self._entries[entry.key] = entry
+            self._entries.move_to_end(entry.key)
+            self._ids[entry.search_id] = entry.key
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._ids.pop(evicted.search_id, None)
+                self._refresh_failed_at.pop(evicted.key, None)
+        return entry
+
+    # Newer copy of a key from the shared store (another worker or the
+    # checker may have fetched it), or None.
+    def _load(self, key, current):
+        try:
+            row = self.store.get(key, newer_than=current.fetched_at if current else 0)
+        except Exception as e:
+            logger.warning("Error reading search store: %s", e)
+            return None
+        if row is None:
+            return None
+        offers, fetched_at = row
+        if self.on_load:
+            offers = self.on_load(offers)
+        return self._remember(CacheEntry(key, offers, fetched_at))
+
+    # Loads the newest result sets from the shared store, so a fresh
+    # worker starts with the routes everyone searched recently.
+    def prime(self, limit=SEARCH_CACHE_PRIME):
+        """Fill the cache from the store. Returns the number of entries loaded."""
+        if self.store is None or limit <= 0:
+            return 0
+        try:
+            rows = self.store.recent(min(limit, self.max_entries))
+        except Exception as e:
+            logger.warning("Error reading search store: %s", e)
+            return 0
+        # oldest first, so the newest end up most recently used
+        for key, offers, fetched_at in reversed(rows):
+            if self.on_load:
+                offers = self.on_load(offers)
+            self._remember(CacheEntry(key, offers, fetched_at))
+        return len(rows)
+
+    def _lookup(self, key, touch=True):
+        """Usable (fresh or stale) entry for a key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._is_usable(entry):
+                entry = None
+            if entry is not None and touch:
+                self._entries.move_to_end(key)
+
+        if self.store is not None and (entry is None or self.is_stale(entry)):
+            entry = self._load(key, entry) or entry
+        return entry
+
+    def peek(self, key):
+        """Usable entry for a key without touching its LRU position, or None."""
+        return self._lookup(key, touch=False)
+
+    def get(self, key):
+        """Fresh entry for a key, or None."""
+        entry = self._lookup(key)
+        return entry if entry is not None and not self.is_stale(entry) else None
+
+    # Paging through a result set is fine even while it's stale.
+    def get_by_id(self, search_id):
+        """Fresh or stale entry for a search id, or None."""
+        with self._lock:
+            key = self._ids.get(search_id)
+        # Paging requests may land on a worker that didn't run the search
+        if key is None and self.store is not None:
+            try:
+                key = self.store.key_for_id(search_id)
+            except Exception as e:
+                logger.warning("Error reading search store: %s", e)
+        return self._lookup(key) if key else None
+
+    def put(self, key, offers, fetched_at=None):
+        """Store a result set and return its entry."""
+        entry = self._remember(CacheEntry(key, offers, fetched_at))
+        if self.store is not None:
+            try:
+                self.store.put(key, entry.search_id, entry.offers, entry.fetched_at)
+            except Exception as e:
+                logger.warning("Error writing search store: %s", e)
+        return entry
+
+    # Calls fetch() once per key no matter how many threads ask at
+    # the same time; the others wait for the same result.
+    def _fetch_once(self, key, fetch):
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            entry = self.put(key, fetch())
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def refresh(self, key, fetch):
+        """Fetch a key now (sharing any fetch already in flight) and return the new entry."""
+        return self._fetch_once(key, fetch)
+
+    def _refresh(self, key, fetch):
+        try:
+            self._fetch_once(key, fetch)
+            with self._lock:
+                self._refresh_failed_at.pop(key, None)
+        except Exception as e:
+            logger.warning("Background refresh failed for %s: %s", key, e)
+            with self._lock:
+                # a key evicted meanwhile has nothing to back off from
+                if key in self._entries:
+                    self._refresh_failed_at[key] = time.time()
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    # Queues a background refresh unless one is already running or
+    # the last one failed less than SEARCH_REFRESH_BACKOFF ago.
+    def refresh_in_background(self, key, fetch):
+        """Refresh a key on the background pool. Returns True if a refresh was queued."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            failed_at = self._refresh_failed_at.get(key)
+            if failed_at and time.time() - failed_at < SEARCH_REFRESH_BACKOFF:
+                return False
+            self._refreshing.add(key)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.refresh_workers, thread_name_prefix='search-refresh'
+                )
+            executor = self._executor
+        executor.submit(self._refresh, key, fetch)
+        return True
+
+    # Fresh entry -> returned as is. Stale entry -> returned right away
+    # and refreshed in the background. Missing or too old -> fetched
+    # now (concurrent callers share the fetch).
+    def get_or_fetch(self, key, fetch):
+        """Entry for `key`, serving stale results while they are revalidated."""
+        entry = self._lookup(key)
+        if entry is None:
+            return self._fetch_once(key, fetch)
+        if self.is_stale(entry):
+            self.refresh_in_background(key, fetch)
+        return entry
+
+    # Cached entries stay (they're shared copy-on-write with the
+    # parent); the refresh pool and in-flight fetches belonged to
+    # the parent's threads, which don't exist in the child.
+    def reset_after_fork(self):
+        """Drop thread state inherited from the parent process."""
+        self._lock = threading.Lock()
+        self._executor = None
+        self._in_flight = {}
+        self._refreshing = set()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Rendered pages only change when their result set does, so they
+# are keyed by (search key, entry.fetched_at, ...) and never need
+# invalidating; old versions simply age out of the LRU.
+class FragmentCache:
+    """Small LRU of rendered HTML keyed by search key and result-set version."""
+
+    def __init__(self, max_entries=RENDER_CACHE_MAX):
+        self.max_entries = max_entries
+        self._fragments = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Rendered HTML for a key, or None."""
+        with self._lock:
+            html = self._fragments.get(key)
+            if html is not None:
+                self._fragments.move_to_end(key)
+            return html
+
+    def put(self, key, html):
+        """Store rendered HTML and return it."""
+        with self._lock:
+            self._fragments[key] = html
+            self._fragments.move_to_end(key)
+            while len(self._fragments) > self.max_entries:
+                self._fragments.popitem(last=False)
+        return html
+
+    def __len__(self):
+        return len(self._fragments)
+
+
+# ──────────────────────────────────────────────────────────────
+# Result Set Helpers
+# ──────────────────────────────────────────────────────────────
+
+SORT_KEYS = {
+    'price': lambda o: o['price'],
+    'duration': lambda o: (o.get('duration_minutes') or 0, o['price']),
+    'stops': lambda o: (o['transfers'] + o.get('return_transfers', 0), o['price']),
+}
+
+
+# Sorts, filters and pages a cached result set. Offers are
+# already sorted by price, so the default sort is free.
+def select_offers(offers, sort='price', airline=None, max_stops=None, offset=0, limit=10):
+    """
+    Return one page of a result set.
+
+    Args:
+        offers: Offers from a CacheEntry
+        sort: "price", "duration" or "stops"
+        airline: Only offers flown by this carrier code (either leg)
+        max_stops: Only offers with at most this many stops on each leg
+        offset: Index of the first offer to return
+        limit: Page size
+
+    Returns:
+        (page, total) where total is the number of offers after filtering
+    """
+    selected = offers
+    if airline:
+        selected = [o for o in selected if o['airline'] == airline or o.get('return_airline') == airline]
+    if max_stops is not None:
+        selected = [o for o in selected
+                    if o['transfers'] <= max_stops and o.get('return_transfers', 0) <= max_stops]
+    if sort != 'price' and sort in SORT_KEYS:
+        selected = sorted(selected, key=SORT_KEYS[sort])
+
+    offset = max(0, offset)
+    return list(selected[offset:offset + limit]), len(selected)
+
+
+# Distinct carriers in a result set, for the airline filter.
+def airline_options(offers):
+    """Return [(code, name), ...] for every airline in the offers, by name."""
+    names = {}
+    for offer in offers:
+        names.setdefault(offer['airline'], offer.get('airline_name', offer['airline']))
+        if offer.get('return_airline'):
+            names.setdefault(offer['return_airline'], offer.get('return_airline_name', offer['return_airline']))
+    return sorted(names.items(), key=lambda item: item[1])
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. SearchParams        - Normalised search parameters
+#   2. search_key()        - Canonical cache key for a search
+#   3. params_from_key()   - SearchParams back from a cache key
+#   4. search_id_for()     - Short id used in result-set URLs
+#   5. SearchCache         - In-memory LRU of result sets, stale-while-revalidate, single-flight fetches
+#        .prime()          - Loads the newest result sets from the store at startup
+#        .reset_after_fork() - Drops the parent's refresh pool and in-flight fetches
+#   6. FragmentCache       - LRU of rendered result pages
+#   7. select_offers()     - Sort / filter / page a result set
+#   8. airline_options()   - Carriers present in a result set
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,228 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import threading
+
+from dotenv import load_dotenv
+
+from src.core.reference import ENRICHED_FIELDS
+from src.core.search_cache import SEARCH_CACHE_MAX_STALE
+
+# Load environment variables from .env file
+load_dotenv()
+
+# ──────────────────────────────────────────────────────────────
+# Shared Search Result Store
+# The in-memory SearchCache lives and dies with one process, so
+# every web worker and the price checker used to fetch the same
+# routes separately, and a deploy started everyone cold. This
+# store keeps result sets in a local SQLite file (WAL mode, so
+# readers never block the writer) that all of them share:
+# a checker fetch warms /search and a search warms the checker.
+#
+# Payloads are the raw provider offers (display fields added by
+# ReferenceData.enrich_offers are stripped) as compact JSON,
+# zlib-compressed. Rows expire after max_age and the oldest rows
+# are evicted once the file holds more than max_bytes of payload.
+# ──────────────────────────────────────────────────────────────
+
+DEFAULT_STORE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'search_cache.sqlite3'
+)
+
+SEARCH_STORE_PATH = os.getenv('SEARCH_STORE_PATH', DEFAULT_STORE_PATH)  # empty disables the store
+SEARCH_STORE_MAX_MB = float(os.getenv('SEARCH_STORE_MAX_MB', 64))  # payload bytes kept on disk
+SEARCH_STORE_PRUNE_INTERVAL = 60  # seconds between expiry/eviction sweeps
+
+
+# ──────────────────────────────────────────────────────────────
+# Payload Encoding
+# ──────────────────────────────────────────────────────────────
+
+
+def encode_offers(offers):
+    """Compress a list of offers, dropping enrichment fields."""
+    raw = [{k: v for k, v in offer.items() if k not in ENRICHED_FIELDS} for offer in offers]
+    return zlib.compress(json.dumps(raw, separators=(',', ':')).encode('utf-8'), 6)
+
+
+def decode_offers(payload):
+    """Inverse of encode_offers()."""
+    return json.loads(zlib.decompress(payload))
+
+
+# ──────────────────────────────────────────────────────────────
+# Store
+# ──────────────────────────────────────────────────────────────
+
+
+class SearchStore:
+    """SQLite-backed result sets shared by every local process."""
+
+    def __init__(self, path=SEARCH_STORE_PATH, max_age=None, max_bytes=None):
+        """
+        Args:
+            path: SQLite file shared by the web workers and the checker
+            max_age: Seconds a row is kept (defaults to SEARCH_CACHE_MAX_STALE)
+            max_bytes: Payload bytes kept before the oldest rows are evicted
+        """
+        self.path = path
+        self.max_age = max_age if max_age is not None else SEARCH_CACHE_MAX_STALE
+        self.max_bytes = max_bytes if max_bytes is not None else int(SEARCH_STORE_MAX_MB * 1024 * 1024)
+        self._last_prune = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = self._connect()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # a lost cache row is harmless
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS search_results (
+                key TEXT PRIMARY KEY,
+                search_id TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_results_search_id ON search_results (search_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_search_results_fetched_at ON search_results (fetched_at)"
+        )
+        conn.commit()
+        return conn
+
+    def get(self, key, newer_than=0):
+        """
+        Return (offers, fetched_at) for a key, or None.
+
+        Rows past max_age, or not newer than `newer_than`, are
+        skipped without decoding the payload.
+        """
+        cutoff = max(time.time() - self.max_age, newer_than)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at FROM search_results WHERE key = ? AND fetched_at > ?",
+                (key, cutoff),
+            ).fetchone()
+        if row is None:
+            return None
+        return decode_offers(row[0]), row[1]
+
+    def recent(self, limit):
+        """Return [(key, offers, fetched_at), ...] for the newest rows, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, payload, fetched_at FROM search_results WHERE fetched_at > ? "
+                "ORDER BY fetched_at DESC LIMIT ?",
+                (time.time() - self.max_age, limit),
+            ).fetchall()
+        return [(key, decode_offers(payload), fetched_at) for key, payload, fetched_at in rows]
+
+    def key_for_id(self, search_id):
+        """Cache key for a search id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key FROM search_results WHERE search_id = ?", (search_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, search_id, offers, fetched_at):
+        """Store (or replace) a result set."""
+        payload = encode_offers(offers)
+        with self._lock:
+            # Another process may have stored a newer copy meanwhile
+            self._conn.execute("""
+                INSERT INTO search_results (key, search_id, fetched_at, size, payload)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET
+                    fetched_at = excluded.fetched_at,
+                    size = excluded.size,
+                    payload = excluded.payload
+                WHERE excluded.fetched_at > search_results.fetched_at
+            """, (key, search_id, fetched_at, len(payload), payload))
+            self._conn.commit()
+
+        if time.time() - self._last_prune >= SEARCH_STORE_PRUNE_INTERVAL:
+            self.prune()
+
+    # Deletes expired rows, then the oldest rows until the payloads
+    # fit in max_bytes.
+    def prune(self):
+        """Expire and evict rows. Returns the number of rows removed."""
+        with self._lock:
+            self._last_prune = time.time()
+            removed = self._conn.execute(
+                "DELETE FROM search_results WHERE fetched_at <= ?", (time.time() - self.max_age,)
+            ).rowcount
+
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM search_results").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                evict = []
+                for key, size in self._conn.execute(
+                        "SELECT key, size FROM search_results ORDER BY fetched_at ASC"):
+                    evict.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self._conn.executemany("DELETE FROM search_results WHERE key = ?", evict)
+                removed += len(evict)
+
+            self._conn.commit()
+            return removed
+
+    def stats(self):
+        """Row count and payload bytes currently stored."""
+        with self._lock:
+            rows, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_results"
+            ).fetchone()
+        return {'rows': rows, 'bytes': size, 'max_bytes': self.max_bytes}
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    # SQLite connections must not be used across fork(); the child
+    # abandons the inherited one (closing it could disturb the
+    # parent's locks) and opens its own.
+    def reset_after_fork(self):
+        """Give a forked worker its own connection."""
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+
+_store = None
+
+
+# Opened lazily so importing this module doesn't touch disk.
+# Returns None when SEARCH_STORE_PATH is set to an empty string.
+def get_search_store():
+    """Return the process-wide SearchStore, or None if disabled."""
+    global _store
+    if _store is None and SEARCH_STORE_PATH:
+        _store = SearchStore()
+    return _store
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. encode_offers()       - Compact zlib/JSON payload for a result set
+#   2. decode_offers()       - Payload back to a list of offers
+#   3. SearchStore           - SQLite (WAL) result sets shared across processes
+#        .get()/.put()       - Read / write a result set by cache key
+#        .key_for_id()       - Cache key for a search id (paging on another worker)
+#        .recent()           - Newest result sets (startup priming)
+#        .prune()            - TTL expiry and size-bounded eviction
+#        .reset_after_fork() - New connection in a forked worker
+#   4. get_search_store()    - Shared per-process instance
+# ──────────────────────────────────────────────────────────────
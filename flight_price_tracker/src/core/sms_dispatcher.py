@@ -0,0 +1,227 @@
+import os
+import time
+import zlib
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# ──────────────────────────────────────────────────────────────
+# Dispatcher Configuration
+# Long-code numbers can only send about 1 SMS per second, so a
+# burst of price-drop alerts sent from a single number gets
+# queued or rejected by the carrier. The dispatcher spreads
+# messages over a pool of sender numbers, paces each one with
+# its own token bucket, and queues overflow with backpressure.
+# ──────────────────────────────────────────────────────────────
+
+# Comma-separated list of Twilio numbers. Falls back to the single
+# TWILIO_PHONE_NUMBER used before the pool existed.
+TWILIO_SENDER_POOL = [
+    n.strip() for n in os.getenv('TWILIO_SENDER_POOL', os.getenv('TWILIO_PHONE_NUMBER') or '').split(',')
+    if n.strip()
+]
+SMS_SENDER_RATE = float(os.getenv('SMS_SENDER_RATE', 1.0))  # messages per second per sender
+SMS_SENDER_BURST = int(os.getenv('SMS_SENDER_BURST', 1))  # messages a sender may send back-to-back
+SMS_QUEUE_MAX = int(os.getenv('SMS_QUEUE_MAX', 500))  # queued messages per sender before backpressure
+SMS_THROUGHPUT_WINDOW = 60  # seconds of history used for throughput stats
+
+
+# ──────────────────────────────────────────────────────────────
+# Custom Exception
+# ──────────────────────────────────────────────────────────────
+
+
+class SmsQueueFull(RuntimeError):
+    """Raised when a sender's queue stays full past the submit timeout."""
+    pass
+
+
+# ──────────────────────────────────────────────────────────────
+# Rate Limiter
+# ──────────────────────────────────────────────────────────────
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, up to `burst` saved."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    # Takes one token if available. Otherwise returns how many
+    # seconds the caller should wait before trying again.
+    def acquire(self):
+        """Take a token. Returns 0 on success or the seconds to wait."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+
+    def wait(self):
+        """Block until a token is available, then take it."""
+        delay = self.acquire()
+        while delay:
+            time.sleep(delay)
+            delay = self.acquire()
+
+
+# ──────────────────────────────────────────────────────────────
+# Per-Sender Lane
+# One bounded queue, one token bucket and one worker thread per
+# sender number. The worker sends messages strictly in order.
+# ──────────────────────────────────────────────────────────────
+
+
+class _SenderLane:
+    """Queue, rate limiter and counters for a single sender number."""
+
+    def __init__(self, number, send_func, rate, burst, queue_max):
+        self.number = number
+        self.send_func = send_func
+        self.bucket = TokenBucket(rate, burst)
+        self.queue = queue.Queue(maxsize=queue_max)
+        self.sent = 0
+        self.failed = 0
+        self.recent = deque()  # monotonic timestamps of recent sends
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"sms-sender-{self.number}", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            future, to_phone, body = self.queue.get()
+            self.bucket.wait()
+            try:
+                future.set_result(self.send_func(self.number, to_phone, body))
+                self.sent += 1
+                self.recent.append(time.monotonic())
+            except Exception as e:
+                self.failed += 1
+                future.set_exception(e)
+            finally:
+                self.queue.task_done()
+
+    def throughput(self):
+        """Messages per second over the last SMS_THROUGHPUT_WINDOW seconds."""
+        cutoff = time.monotonic() - SMS_THROUGHPUT_WINDOW
+        while self.recent and self.recent[0] < cutoff:
+            self.recent.popleft()
+        return len(self.recent) / SMS_THROUGHPUT_WINDOW
+
+
+# ──────────────────────────────────────────────────────────────
+# Dispatcher
+# ──────────────────────────────────────────────────────────────
+
+
+class SmsDispatcher:
+    """Spreads outgoing SMS across a pool of paced sender numbers."""
+
+    def __init__(self, send_func, senders=None, rate=SMS_SENDER_RATE,
+                 burst=SMS_SENDER_BURST, queue_max=SMS_QUEUE_MAX):
+        """
+        Args:
+            send_func: Callable (from_number, to_phone, body) that performs the send
+            senders: List of sender numbers (default TWILIO_SENDER_POOL)
+            rate: Messages per second allowed per sender
+            burst: Messages a sender may send back-to-back
+            queue_max: Max queued messages per sender
+        """
+        senders = senders if senders is not None else TWILIO_SENDER_POOL
+        if not senders:
+            raise ValueError("No SMS sender numbers configured (set TWILIO_PHONE_NUMBER or TWILIO_SENDER_POOL)")
+        self.lanes = [_SenderLane(n, send_func, rate, burst, queue_max) for n in senders]
+
+    # Sticky assignment: the same recipient always hashes to the same
+    # sender, so a user sees one consistent number and their messages
+    # arrive in order. No per-recipient state is kept.
+    def sender_for(self, to_phone):
+        """Return the sender number assigned to a recipient."""
+        return self._lane_for(to_phone).number
+
+    def _lane_for(self, to_phone):
+        return self.lanes[zlib.crc32(to_phone.encode('utf-8')) % len(self.lanes)]
+
+    # Queues a message on the recipient's sender. Blocks while that
+    # sender's queue is full (backpressure); raises SmsQueueFull if it
+    # is still full after `timeout` seconds.
+    def submit(self, to_phone, body, timeout=None):
+        """
+        Queue an SMS for delivery.
+
+        Returns:
+            Future resolving to the provider's message object
+        """
+        lane = self._lane_for(to_phone)
+        lane.start()
+        future = Future()
+        try:
+            lane.queue.put((future, to_phone, body), timeout=timeout)
+        except queue.Full:
+            raise SmsQueueFull(f"SMS queue for sender {lane.number} is full")
+        return future
+
+    def send(self, to_phone, body, timeout=None):
+        """Queue an SMS and wait for it to be sent. Returns the message object."""
+        return self.submit(to_phone, body, timeout=timeout).result()
+
+    def queue_depth(self):
+        """Total messages waiting across all senders."""
+        return sum(lane.queue.qsize() for lane in self.lanes)
+
+    def stats(self):
+        """Queue depth and throughput for every sender in the pool."""
+        return {
+            'queue_depth': self.queue_depth(),
+            'senders': [
+                {
+                    'number': lane.number,
+                    'queue_depth': lane.queue.qsize(),
+                    'sent': lane.sent,
+                    'failed': lane.failed,
+                    'messages_per_sec': round(lane.throughput(), 3),
+                }
+                for lane in self.lanes
+            ],
+        }
+
+    def join(self):
+        """Block until every queued message has been handled."""
+        for lane in self.lanes:
+            lane.queue.join()
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. SmsQueueFull      - Raised when backpressure times out
+#   2. TokenBucket       - Per-sender rate limiter
+#   3. SmsDispatcher     - Sender pool with sticky assignment, pacing and queue stats
+#        .sender_for()   - Sender number assigned to a recipient
+#        .submit()       - Queue a message, returns a Future
+#        .send()         - Queue a message and wait for the result
+#        .stats()        - Queue depth and per-sender throughput
+#        .join()         - Wait for all queues to drain
+# ──────────────────────────────────────────────────────────────
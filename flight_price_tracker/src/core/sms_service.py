@@ -1,12 +1,24 @@
 import os
+import re
 import random
+import logging
+import threading
+from urllib.parse import urlencode
 
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
 from dotenv import load_dotenv
 
+from src.core.sms_dispatcher import SmsDispatcher
+from src.core.reference import get_reference
+from src.core import metrics
+from src.core.logs import mask_phone
+
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # ──────────────────────────────────────────────────────────────
 # Twilio Configuration
 # Pulls Twilio credentials from environment variables.
@@ -19,6 +31,96 @@ TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = os.getenv('TWILIO_AUTH_TOKEN')
 TWILIO_PHONE_NUMBER = os.getenv('TWILIO_PHONE_NUMBER')
 BASE_URL = os.getenv('BASE_URL', 'http://localhost:5000')  # used to build unsubscribe links in SMS messages
+TWILIO_API_BASE_URL = os.getenv('TWILIO_API_BASE_URL')  # point at a local sink for benchmarks (optional)
+
+NOTIFICATION_SECONDS = metrics.histogram('notification_send_seconds', 'Email and SMS provider calls',
+                                         ('channel', 'outcome'))
+
+
+# ──────────────────────────────────────────────────────────────
+# Shared Client + Dispatcher
+# One Twilio client is reused for every message. All sends go
+# through an SmsDispatcher, which picks a sender number from the
+# pool (TWILIO_SENDER_POOL, or just TWILIO_PHONE_NUMBER) and
+# paces each number to stay under the carrier's rate limit.
+#
+# Every send_*_sms() waits for its message to go out, so the pool
+# only spreads messages that are sent concurrently: web-triggered
+# sends from the notification queue's workers. The price checker
+# sends one message at a time and so uses one sender at a time;
+# the pool keeps it under each number's rate but doesn't speed a
+# batch of checker notifications up.
+# ──────────────────────────────────────────────────────────────
+
+_client = None
+_dispatcher = None
+_lock = threading.Lock()  # one client and one dispatcher (lanes, token buckets) per process
+
+
+class _RedirectingHttpClient(TwilioHttpClient):
+    """Sends Twilio API requests to TWILIO_API_BASE_URL instead of api.twilio.com."""
+
+    def request(self, method, url, *args, **kwargs):
+        url = re.sub(r'^https://[^/]+', TWILIO_API_BASE_URL.rstrip('/'), url)
+        return super().request(method, url, *args, **kwargs)
+
+
+def _get_client():
+    """Return the shared Twilio client, creating it on first use."""
+    global _client
+    with _lock:
+        if _client is None:
+            http_client = _RedirectingHttpClient() if TWILIO_API_BASE_URL else None
+            _client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN, http_client=http_client)
+        return _client
+
+
+def _twilio_send(from_number, to_phone, body):
+    """Send one SMS through Twilio. Used by the dispatcher's sender lanes."""
+    return _get_client().messages.create(body=body, from_=from_number, to=to_phone)
+
+
+def get_dispatcher():
+    """Return the shared SMS dispatcher."""
+    global _dispatcher
+    with _lock:
+        if _dispatcher is None:
+            _dispatcher = SmsDispatcher(_twilio_send)
+        return _dispatcher
+
+
+# The Twilio client's connection pool and the dispatcher's sender
+# threads don't survive fork(); a forked worker builds new ones.
+def reset_after_fork():
+    """Drop the parent's Twilio client and dispatcher."""
+    global _client, _dispatcher, _lock
+    _lock = threading.Lock()
+    _client = None
+    _dispatcher = None
+
+
+# Queues the message on the recipient's sender and waits for it
+# to go out (so the recorded time includes pacing). Raises if
+# Twilio rejects the message. Waiting here is what limits a single
+# caller to one sender at a time (see the note above).
+def _send_sms(to_phone, body):
+    """Send an SMS via the dispatcher and return the Twilio message."""
+    with NOTIFICATION_SECONDS.time(channel='sms'):
+        return get_dispatcher().send(to_phone, body)
+
+
+# Queue depth and per-sender throughput for monitoring.
+def get_sms_stats():
+    """Return the dispatcher's queue depth and per-sender throughput."""
+    return get_dispatcher().stats()
+
+
+# Short "City (CODE) → City (CODE)" route label for message bodies
+def _route_label(alert_details):
+    """Return the alert's route with city names instead of bare codes."""
+    reference = get_reference()
+    return (f"{reference.airport_label(alert_details['origin'])} → "
+            f"{reference.airport_label(alert_details['destination'])}")
 
 
 # ──────────────────────────────────────────────────────────────
@@ -37,8 +139,8 @@ def generate_verification_code():
 
 # ──────────────────────────────────────────────────────────────
 # SMS Sending Functions
-# Each function below creates a Twilio Client, builds a short
-# text message, and sends it via the Twilio API.
+# Each function below builds a short text message and sends it
+# through the shared dispatcher (see _send_sms above).
 # They all return True on success, False on failure.
 # ──────────────────────────────────────────────────────────────
 
@@ -50,20 +152,56 @@ def generate_verification_code():
 def send_verification_sms(to_phone, verification_code):
     """Send SMS with verification code to user's phone."""
     try:
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+        message = _send_sms(
+            to_phone,
+            f"Your Flight Price Tracker verification code is: {verification_code}",
+        )
+
+        logger.info("Verification SMS sent to %s", mask_phone(to_phone), extra={'sid': message.sid})
+        return True
+
+    except Exception as e:
+        logger.error("Error sending verification SMS: %s", e)
+        return False
+
 
-        message = client.messages.create(
-            body=f"Your Flight Price Tracker verification code is: {verification_code}",
-            from_=TWILIO_PHONE_NUMBER,
-            to=to_phone,
+# Bulk-import version of the above: one code for all of a phone's
+# new alerts, plus a link to the form (it was never shown to the
+# phone's owner, since the alerts came from an import).
+def send_bulk_verification_sms(to_phone, verification_code, alert_id, alert_count):
+    """Send one verification code covering several alerts."""
+    try:
+        verify_link = f"{BASE_URL}/verify-phone?{urlencode({'alert_id': alert_id, 'phone': to_phone})}"
+        message = _send_sms(
+            to_phone,
+            f"Your Flight Price Tracker code is: {verification_code}\n"
+            f"Enter it to activate {alert_count} price alerts: {verify_link}",
         )
 
-        print(f"Verification SMS sent to {to_phone}")
-        print(f"Message SID: {message.sid}")
+        logger.info("Bulk verification SMS (%d alerts) sent to %s", alert_count, mask_phone(to_phone),
+                    extra={'sid': message.sid})
         return True
 
     except Exception as e:
-        print(f"Error sending verification SMS: {e}")
+        logger.error("Error sending bulk verification SMS: %s", e)
+        return False
+
+
+# Sends the signed "my alerts" link requested on /my-alerts
+def send_my_alerts_link_sms(to_phone, link_token, link_days):
+    """Send a link to the dashboard of all alerts for this phone."""
+    try:
+        message = _send_sms(
+            to_phone,
+            f"Your Flight Price Tracker alerts (link valid {link_days} days):\n"
+            f"{BASE_URL}/my-alerts/{link_token}",
+        )
+
+        logger.info("My alerts link SMS sent to %s", mask_phone(to_phone), extra={'sid': message.sid})
+        return True
+
+    except Exception as e:
+        logger.error("Error sending my alerts link SMS: %s", e)
         return False
 
 
@@ -73,8 +211,6 @@ def send_verification_sms(to_phone, verification_code):
 def send_price_drop_sms(to_phone, alert_details, flight_details):
     """Send SMS when price drops below threshold."""
     try:
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-
         # Calculate how much cheaper this flight is vs. the threshold
         savings = alert_details['price_threshold'] - flight_details['price']
 
@@ -92,22 +228,17 @@ def send_price_drop_sms(to_phone, alert_details, flight_details):
         # Keep the message short — SMS has a 160-character limit per segment
         message_body = (
             f"PRICE DROP!\n"
-            f"{alert_details['origin']} → {alert_details['destination']} "
+            f"{_route_label(alert_details)} "
             f"${flight_details['price']} (Save ${savings:.0f})\n"
         )
 
-        message = client.messages.create(
-            body=message_body,
-            from_=TWILIO_PHONE_NUMBER,
-            to=to_phone,
-        )
+        message = _send_sms(to_phone, message_body)
 
-        print(f"Price drop SMS sent to {to_phone}")
-        print(f"Message SID: {message.sid}")
+        logger.info("Price drop SMS sent to %s", mask_phone(to_phone), extra={'sid': message.sid})
         return True
 
     except Exception as e:
-        print(f"Error sending price drop SMS: {e}")
+        logger.error("Error sending price drop SMS: %s", e)
         return False
 
 
@@ -117,29 +248,23 @@ def send_price_drop_sms(to_phone, alert_details, flight_details):
 def send_alert_activated_sms(to_phone, alert_details):
     """Send SMS confirmation when alert is activated."""
     try:
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-
         # build unsubscribe link
         unsubscribe_link = f"{BASE_URL}/unsubscribe?alert_id={alert_details['alert_id']}"
 
         message_body = (
             f"Alert Active!\n"
-            f"{alert_details['origin']} → {alert_details['destination']}\n"
+            f"{_route_label(alert_details)}\n"
             f"Watching prices under ${alert_details['price_threshold']}\n"
             f"Stop: {unsubscribe_link}"
         )
 
-        message = client.messages.create(
-            body=message_body,
-            from_=TWILIO_PHONE_NUMBER,
-            to=to_phone,
-        )
+        message = _send_sms(to_phone, message_body)
 
-        print(f"Alert activated SMS sent to {to_phone}")
+        logger.info("Alert activated SMS sent to %s", mask_phone(to_phone), extra={'sid': message.sid})
         return True
 
     except Exception as e:
-        print(f"Error sending alert activated SMS: {e}")
+        logger.error("Error sending alert activated SMS: %s", e)
         return False
 
 
@@ -149,25 +274,19 @@ def send_alert_activated_sms(to_phone, alert_details):
 def send_alert_deleted_sms(to_phone, alert_details):
     """Send SMS confirmation when alert is deleted."""
     try:
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-
         message_body = (
             f"Alert Deleted\n"
-            f"{alert_details['origin']} → {alert_details['destination']}\n"
+            f"{_route_label(alert_details)}\n"
             f"Unsubscribed - info removed.\n"
         )
 
-        message = client.messages.create(
-            body=message_body,
-            from_=TWILIO_PHONE_NUMBER,
-            to=to_phone,
-        )
+        message = _send_sms(to_phone, message_body)
 
-        print(f"Alert deleted SMS sent to {to_phone}")
+        logger.info("Alert deleted SMS sent to %s", mask_phone(to_phone), extra={'sid': message.sid})
         return True
 
     except Exception as e:
-        print(f"Error sending alert deleted SMS: {e}")
+        logger.error("Error sending alert deleted SMS: %s", e)
         return False
 
 
@@ -177,34 +296,33 @@ def send_alert_deleted_sms(to_phone, alert_details):
 def send_alert_expired_sms(to_phone, alert_details):
     """Send SMS when alert expires"""
     try:
-        client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
-
         message_body = (
             f"Alert Expired\n"
-            f"{alert_details['origin']} → {alert_details['destination']}\n"
+            f"{_route_label(alert_details)}\n"
             f"Alert removed - departure date passed.\n"
         )
 
-        message = client.messages.create(
-            body=message_body,
-            from_=TWILIO_PHONE_NUMBER,
-            to=to_phone,
-        )
+        message = _send_sms(to_phone, message_body)
 
-        print(f"Alert expired SMS sent to {to_phone}")
+        logger.info("Alert expired SMS sent to %s", mask_phone(to_phone), extra={'sid': message.sid})
         return True
 
     except Exception as e:
-        print(f"Error sending alert expired SMS: {e}")
+        logger.error("Error sending alert expired SMS: %s", e)
         return False
 
 
 # ──────────────────────────────────────────────────────────────
 # Function Reference
-#   1. generate_verification_code()  - Creates a random 6-digit numeric code
-#   2. send_verification_sms()       - Sends the verification code to the user's phone
-#   3. send_price_drop_sms()         - Alerts the user that a price dropped below threshold
-#   4. send_alert_activated_sms()    - Confirms the alert is now active after phone verification
-#   5. send_alert_deleted_sms()      - Confirms the alert was unsubscribed/deleted
-#   6. send_alert_expired_sms()      - Tells the user their alert expired (departure date passed)
+#   1. get_dispatcher()              - Returns the shared sender-pool dispatcher
+#   2. get_sms_stats()               - Queue depth and per-sender throughput
+#   3. generate_verification_code()  - Creates a random 6-digit numeric code
+#   4. send_verification_sms()       - Sends the verification code to the user's phone
+#   5. send_bulk_verification_sms()  - One code (and form link) for a phone's imported alerts
+#   6. send_my_alerts_link_sms()     - Sends the signed link to a phone's alert dashboard
+#   7. send_price_drop_sms()         - Alerts the user that a price dropped below threshold
+#   8. send_alert_activated_sms()    - Confirms the alert is now active after phone verification
+#   9. send_alert_deleted_sms()      - Confirms the alert was unsubscribed/deleted
+#  10. send_alert_expired_sms()      - Tells the user their alert expired (departure date passed)
+#  11. reset_after_fork()            - New Twilio client and dispatcher in a forked worker
 # ──────────────────────────────────────────────────────────────
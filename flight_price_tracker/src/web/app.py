@@ -1,34 +1,26 @@
 import sys
 import os
-import json
-
-from flask import Flask, render_template, request, redirect, url_for, flash
+import io
+import re
+import gzip
+import hmac
+import math
+import time
+import logging
+import mimetypes
+from datetime import datetime, timezone, date
+
+import pymysql
+from flask import (Flask, render_template, request, redirect, url_for, flash, jsonify, make_response,
+                   stream_template, send_from_directory, g, session, before_render_template, template_rendered)
+from markupsafe import Markup
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
-# ──────────────────────────────────────────────────────────────
-# Static Data Loading
-# Load airport and airline lookup data once at startup so it
-# can be reused across requests without repeated file I/O.
-# ──────────────────────────────────────────────────────────────
-
-# load airport data at startup
-base_dir = os.path.dirname(os.path.abspath(__file__))
-airports_path = os.path.join(base_dir, 'static', 'airports.json')
-airlines_path = os.path.join(base_dir, 'static', 'airlines.json')
-
-# airports
-with open(airports_path) as f:
-    airports_data = json.load(f)
-    airports = {a['code']: a for a in airports_data}  # key by IATA code for O(1) lookup
-
-# airlines
-with open(airlines_path) as f:
-    airlines_data = json.load(f)
-    airlines = {a['code']: a for a in airlines_data}  # key by airline code for O(1) lookup
-
 # ──────────────────────────────────────────────────────────────
 # Module Imports
 # ──────────────────────────────────────────────────────────────
@@ -36,8 +28,91 @@ with open(airlines_path) as f:
 # add parent directory to path to import from src.core
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))  # shows where to find db.py
 
-from src.core.db import create_alert, get_active_alerts
+from src.core.db import (create_alert, get_active_alerts, record_price_point, get_latest_price_point,
+                         list_alerts, first_contact_alert_id, get_contact_alerts, ALERT_PUBLIC_COLUMNS)
 from src.core.email_service import generate_verification_token, send_verification_email
+from src.core.notification_queue import NotificationQueue, notification_queue
+from src.core.airport_index import AirportIndex, MAX_LIMIT as AIRPORT_MAX_LIMIT
+from src.core.reference import get_reference
+from src.core.search_cache import (SearchCache, FragmentCache, SearchParams, search_key, params_from_key,
+                                   select_offers, airline_options, SORT_KEYS)
+from src.core.search_store import get_search_store
+from src.core.popular_routes import HeavyHitters, RouteWarmer
+from src.core.async_search import SEARCH_ASYNC, get_async_search
+from src.core.json_api import (API_TOKEN, GZIP_MIN_BYTES, CursorError, dumps, encode_cursor, decode_cursor,
+                               parse_fields, select_fields, clamp_limit)
+from src.core.alert_import import AlertImportError, IMPORT_FORMATS, detect_format, iter_rows, import_alerts
+from src.core.rate_limit import (TokenBucketLimiter, ConcurrencyGate, Overloaded, SEARCH_RATE_PER_MINUTE,
+                                 SEARCH_RATE_BURST, ALERT_RATE_PER_HOUR, ALERT_RATE_BURST, CONTACT_RATE_PER_DAY,
+                                 CONTACT_RATE_BURST)
+from src.core import metrics, logs
+from src.core.profiling import PROFILE_WEB_SAMPLE, sample_request
+from src.core.logs import mask_email, mask_phone
+from src.web.assets import get_asset_manifest, negotiate, DIST_DIR, ASSET_MAX_AGE
+
+logger = logging.getLogger(__name__)
+
+# ──────────────────────────────────────────────────────────────
+# Static Data Loading
+# Airport and airline lookups come from the shared reference
+# module, loaded once at startup and reused across requests.
+# ──────────────────────────────────────────────────────────────
+
+reference = get_reference()
+
+# How long adding display fields takes, by where the offers came from
+ENRICH_SECONDS = metrics.histogram('enrich_seconds', 'Adding city/airline display fields to offers', ('source',))
+
+# Autocomplete index over the airport list, built once at startup
+airport_index = AirportIndex(reference.airport_dicts())
+
+# Parsed search results, shared by /search and /search/<id>/offers.
+# Backed by the on-disk store shared with other workers and the
+# price checker; offers read from it are re-enriched on load.
+search_cache = SearchCache(store=get_search_store(),
+                           on_load=metrics.timed(ENRICH_SECONDS, source='store')(reference.enrich_offers))
+RESULTS_PAGE_SIZE = 10  # flights per page on the results page
+
+# Rendered results pages, keyed by search key + result-set version
+results_pages = FragmentCache()
+MAX_PAGE_SIZE = 50  # largest page the offers endpoint will return
+
+# Most searched routes; the warmer (see fetch_offers below) keeps
+# their result sets fresh so most searches are cache hits
+popular_routes = HeavyHitters()
+POPULAR_ROUTES_MAX = 50  # most routes /api/popular-routes will return
+
+# Hashed/precompressed static files from `python src/web/assets.py`
+# (empty until a build exists, and then every lookup falls through)
+asset_manifest = get_asset_manifest()
+
+# Per-client throttles (by IP, and by email/phone for alerts) and
+# the cap on upstream searches in flight; see rate_limit.py
+search_limiter = TokenBucketLimiter('search_ip', SEARCH_RATE_PER_MINUTE, 60, SEARCH_RATE_BURST)
+alert_limiter = TokenBucketLimiter('alert_ip', ALERT_RATE_PER_HOUR, 3600, ALERT_RATE_BURST)
+contact_limiter = TokenBucketLimiter('alert_contact', CONTACT_RATE_PER_DAY, 86400, CONTACT_RATE_BURST)
+link_limiter = TokenBucketLimiter('my_alerts_link', CONTACT_RATE_PER_DAY, 86400, CONTACT_RATE_BURST)  # by IP and contact
+upstream_gate = ConcurrencyGate()
+
+# Route prefetches for new alerts get their own small pool: they wait
+# on Amadeus, and on the notification queue they'd hold up the
+# verification emails and SMS queued behind them.
+PREFETCH_WORKERS = int(os.getenv('PREFETCH_WORKERS', 2))  # concurrent new-alert route prefetches
+prefetch_queue = NotificationQueue(max_workers=PREFETCH_WORKERS, name='prefetch')
+
+# Request and page render timings, scraped from /metrics
+HTTP_SECONDS = metrics.histogram('http_request_seconds', 'Requests by route, method and status',
+                                 ('route', 'method', 'status'))
+TEMPLATE_SECONDS = metrics.histogram('template_render_seconds', 'Jinja page renders', ('template',))
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # bearer token required for /metrics (unset = open)
+
+# Existing stats() counters, read on each scrape
+metrics.register_stats('upstream_gate', upstream_gate.stats)
+for _limiter in (search_limiter, alert_limiter, contact_limiter, link_limiter):
+    metrics.register_stats(f'rate_limit_{_limiter.name}', _limiter.stats, ('allowed', 'limited', 'evicted', 'keys'))
+if SEARCH_ASYNC:
+    metrics.register_stats('async_search', lambda: get_async_search().stats())
+metrics.register_stats('log', logs.logging_stats)
 
 # ──────────────────────────────────────────────────────────────
 # Flask App Initialization
@@ -47,6 +122,185 @@ from src.core.email_service import generate_verification_token, send_verificatio
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'default-dev-key')
 
+# Behind a reverse proxy every request comes from the proxy's
+# address, so the client IP (which the rate limits key on) is read
+# from X-Forwarded-For instead. Only set this to the number of
+# proxies actually in front of the app; otherwise clients can
+# spoof the header.
+TRUSTED_PROXIES = int(os.getenv('TRUSTED_PROXIES', 0))
+if TRUSTED_PROXIES:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES)
+
+
+# ──────────────────────────────────────────────────────────────
+# Rate Limiting
+# Over-limit clients get a 429 and an over-capacity upstream a
+# 503, both with Retry-After, before any upstream call or send.
+# ──────────────────────────────────────────────────────────────
+
+
+def with_retry_after(response, seconds):
+    """Set Retry-After (whole seconds, at least 1) on a response."""
+    response.headers['Retry-After'] = str(max(1, math.ceil(seconds)))
+    return response
+
+
+# Flashes the message and re-renders a form page with the status
+def throttled_page(template, message, retry_after, status=429):
+    flash(message, 'error')
+    return with_retry_after(make_response(render_template(template), status), retry_after)
+
+
+# One bucket per address the alert would message
+def contact_keys(email, phone):
+    keys = []
+    if email:
+        keys.append('email:' + email.strip().lower())
+    if phone:
+        keys.append('phone:' + ''.join(ch for ch in phone if ch.isdigit()))
+    return keys
+
+
+# ──────────────────────────────────────────────────────────────
+# Metrics
+# Every request is timed by its URL rule ("/search/<search_id>/
+# offers", not the concrete path, so the label set stays small).
+# The time is until the view returns: for streamed pages that's
+# before the body is sent. Page renders are timed through Flask's
+# template signals.
+# ──────────────────────────────────────────────────────────────
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+# A request id from the proxy is kept so log lines can be joined
+# across services; anything unexpected in it is replaced.
+REQUEST_ID_PATTERN = re.compile(r'[A-Za-z0-9._-]{1,64}')
+
+
+@app.before_request
+def assign_request_id():
+    request_id = request.headers.get('X-Request-ID', '')
+    if not REQUEST_ID_PATTERN.fullmatch(request_id):
+        request_id = logs.new_id()
+    g.request_id = request_id
+    logs.request_id_var.set(request_id)
+
+
+@app.after_request
+def add_request_id_header(response):
+    if 'request_id' in g:
+        response.headers['X-Request-ID'] = g.request_id
+    return response
+
+
+# so a worker thread's next log lines don't carry a finished request's id
+@app.teardown_request
+def clear_request_id(exc):
+    logs.request_id_var.set(None)
+
+
+@app.after_request
+def record_request_time(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        HTTP_SECONDS.observe(
+            time.perf_counter() - started,
+            route=request.url_rule.rule if request.url_rule else '<unmatched>',
+            method=request.method,
+            status=response.status_code,
+        )
+    return response
+
+
+def _template_render_started(sender, template, context, **extra):
+    g.setdefault('render_started', {})[template.name] = time.perf_counter()
+
+
+def _template_render_finished(sender, template, context, **extra):
+    started = g.get('render_started', {}).pop(template.name, None)
+    if started is not None:
+        TEMPLATE_SECONDS.observe(time.perf_counter() - started, template=template.name)
+
+
+before_render_template.connect(_template_render_started, app)
+template_rendered.connect(_template_render_finished, app)
+
+
+# PROFILE_WEB_SAMPLE profiles that fraction of requests (see
+# profiling.py). The hooks are only installed when it's set. The
+# profile is written at teardown, which for streamed pages is after
+# the body has been sent.
+if PROFILE_WEB_SAMPLE > 0:
+    @app.before_request
+    def start_request_profile():
+        g.request_profile = sample_request(request.endpoint, g.request_id)
+
+    @app.teardown_request
+    def finish_request_profile(exc):
+        profile = g.pop('request_profile', None)
+        if profile is not None:
+            profile.stop()
+
+
+# Prometheus text format for this worker's process
+@app.route('/metrics')
+def metrics_endpoint():
+    if METRICS_TOKEN:
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+            return make_response('Unauthorized\n', 401, {'WWW-Authenticate': 'Bearer'})
+    response = make_response(metrics.render())
+    response.headers['Content-Type'] = metrics.CONTENT_TYPE
+    response.cache_control.no_store = True
+    return response
+
+
+# ──────────────────────────────────────────────────────────────
+# Static Assets
+# url_for('static', filename='style.css') points at the hashed
+# build output when there is one. Hashed files are served from
+# /static/dist/ with far-future caching, brotli/gzip variants
+# picked per request.
+# ──────────────────────────────────────────────────────────────
+
+
+@app.url_defaults
+def hashed_static_urls(endpoint, values):
+    if endpoint == 'static' and 'filename' in values:
+        if app.debug:
+            asset_manifest.reload()  # pick up rebuilds without a restart
+        values['filename'] = asset_manifest.resolve(values['filename'])
+
+
+# hashed build output: the name changes whenever the content does
+@app.route('/static/dist/<path:filename>')
+def static_dist(filename):
+    path, encoding = negotiate(filename, request.accept_encodings)
+    response = send_from_directory(DIST_DIR, path, mimetype=mimetypes.guess_type(filename)[0],
+                                   max_age=ASSET_MAX_AGE)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+# Logo for a flight card: a slice of the sprite when the build has
+# one for this airline, otherwise its own image file.
+@app.template_global()
+def airline_logo(code, img, name):
+    """Markup for an airline logo."""
+    if asset_manifest.has_sprite(code):
+        return Markup('<span class="airline-logo airline-sprite airline-sprite-{0}" role="img" '
+                      'aria-label="{1}" title="{1}"></span>').format(code, name)
+    src = url_for('static', filename=asset_manifest.logo_file(code, img))
+    return Markup('<img src="{0}" alt="{1}" class="airline-logo">').format(src, name)
+
 
 # ──────────────────────────────────────────────────────────────
 # Routes
@@ -59,104 +313,589 @@ def home():
     return render_template('index.html')
 
 
+# Fetches the provider maximum for a search and enriches it once.
+# The result set is cached, so paging/sorting/filtering later on
+# never needs another upstream call. With SEARCH_ASYNC=1 the
+# upstream call runs on the async search service's event loop.
+def fetch_offers(params):
+    """Fetch and enrich every offer Amadeus returns for a search."""
+    # import API function
+    from src.api.travelpayouts import prices_for_dates, AMADEUS_MAX_RESULTS
+
+    if SEARCH_ASYNC:
+        prices_for_dates = get_async_search().prices_for_dates
+
+    # raises Overloaded when SEARCH_MAX_UPSTREAM searches are already in flight
+    with upstream_gate.slot():
+        flights = prices_for_dates(
+            origin=params.origin,
+            destination=params.destination,
+            departure_at=params.departure_date,
+            return_at=params.return_date if not params.one_way else None,
+            one_way=params.one_way,
+            limit=AMADEUS_MAX_RESULTS,
+            adults=params.adults,
+            children=params.children,
+            infants=params.infants,
+        )
+
+    # assign cities and airline info in one batch
+    with ENRICH_SECONDS.time(source='search'):
+        return reference.enrich_offers(flights)
+
+
+# Started on the first search, once there is something to warm
+route_warmer = RouteWarmer(search_cache, popular_routes, fetch_offers)
+
+
+IATA_CODE_PATTERN = re.compile(r'[A-Z]{3}')
+ISO_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+MAX_PASSENGERS = 9  # per type, as on the search form
+
+
+def _iata_code(value, name):
+    code = (value or '').strip().upper()
+    if not IATA_CODE_PATTERN.fullmatch(code):
+        raise ValueError(f"{name} must be a 3-letter airport code")
+    return code
+
+
+def _iso_date(value, name):
+    try:
+        if ISO_DATE_PATTERN.fullmatch(value or ''):
+            date.fromisoformat(value)  # rejects e.g. 2026-02-30
+            return value
+    except ValueError:
+        pass
+    raise ValueError(f"{name} must be a date (YYYY-MM-DD)")
+
+
+def _passengers(value, name, minimum=0):
+    count = int(value)
+    if not minimum <= count <= MAX_PASSENGERS:
+        raise ValueError(f"{name} must be between {minimum} and {MAX_PASSENGERS}")
+    return count
+
+
+# Reads the search parameters shared by /search, /search/stream and
+# /api/v1/search from a query string. Returns (SearchParams, trip_type).
+# Everything is validated here because the parameters become the
+# search/cache key (see search_key), which other code decodes again.
+def parse_search_args(args):
+    """Build SearchParams from request args (raises ValueError on missing/invalid values)."""
+    trip_type = args.get('trip_type')
+    one_way = (trip_type == 'one-way')
+    return_date = args.get('return_date') or None
+    params = SearchParams(
+        origin=_iata_code(args.get('origin'), 'origin'),
+        destination=_iata_code(args.get('destination'), 'destination'),
+        departure_date=_iso_date(args.get('departure_date'), 'departure_date'),
+        return_date=_iso_date(return_date, 'return_date') if return_date else None,
+        one_way=one_way,
+        adults=_passengers(args.get('adults', 1), 'adults', minimum=1),
+        children=_passengers(args.get('children', 0), 'children'),
+        infants=_passengers(args.get('infant', args.get('infants', 0)), 'infants'),
+    )
+    return params, trip_type
+
+
 # handle flight search
+# Searches are plain GETs so the results page can be cached by the
+# browser (ETag / Last-Modified from the result set, 304s on repeat
+# views) and its rendered HTML reused from results_pages.
 @app.route('/search', methods=['GET', 'POST'])
 def search():
+    # older forms/bookmarks may still POST; send them to the GET url
+    if request.method == 'POST':
+        return redirect(url_for('search', **request.form.to_dict()), code=303)
+
+    allowed, retry_after = search_limiter.allow(request.remote_addr)
+    if not allowed:
+        return throttled_page('index.html', 'Too many searches. Please wait a moment and try again.', retry_after)
+
     try:
-        # import API function
-        from src.api.travelpayouts import prices_for_dates
-
-        # --- Extract form parameters from GET or POST ---
-        # get form data (email first)
-        if request.method == 'GET':
-            origin = request.args.get('origin').upper()
-            destination = request.args.get('destination').upper()
-            departure_date = request.args.get('departure_date')
-            return_date = request.args.get('return_date')
-            trip_type = request.args.get('trip_type')
-            adults = int(request.args.get('adults', 1))
-            children = int(request.args.get('children', 0))
-            infant = int(request.args.get('infant', 0))
+        # --- Extract search parameters ---
+        params, trip_type = parse_search_args(request.args)
+
+        # --- Fetch flight data (cached result set) ---
+
+        key = search_key(params)
+        route_warmer.start()
+        entry = search_cache.get_or_fetch(key, lambda: fetch_offers(params))
+        popular_routes.add(key)  # only searches that returned results count
+
+        # stale results are shown right away while they refresh in the background
+        stale = search_cache.is_stale(entry)
+        results_age_minutes = int(entry.age // 60) if stale else None
+
+        # --- Render (or reuse) the page ---
+        # The page only depends on the result set and these params, so
+        # the fetch time (plus the age notice when stale) versions it.
+        version = f"{entry.search_id}-{int(entry.fetched_at)}"
+        if stale:
+            version += f"-{results_age_minutes}"
+        page_key = (key, trip_type, version)
+
+        html = results_pages.get(page_key)
+        if html is None:
+            html = results_pages.put(page_key, render_results_page(
+                entry, params, trip_type, results_age_minutes,
+            ))
+
+        # --- HTTP caching headers ---
+        response = make_response(html)
+        response.set_etag(version, weak=True)
+        response.last_modified = datetime.fromtimestamp(entry.fetched_at, timezone.utc)
+        response.cache_control.private = True
+        if stale:
+            response.cache_control.no_cache = True  # always revalidate while refreshing
         else:
-            origin = request.form.get('origin').upper()
-            destination = request.form.get('destination').upper()
-            departure_date = request.form.get('departure_date')
-            return_date = request.form.get('return_date')
-            trip_type = request.form.get('trip_type')
-            adults = int(request.form.get('adults', 1))
-            children = int(request.form.get('children', 0))
-            infant = int(request.form.get('infant', 0))
+            response.cache_control.max_age = max(0, int(search_cache.ttl - entry.age))
+        return response.make_conditional(request)
 
-        # determine if it's one way
-        one_way = (trip_type == 'one-way')
+    except Overloaded:
+        return throttled_page('index.html', 'We are getting a lot of searches right now. Please try again shortly.',
+                              upstream_gate.retry_after, 503)
 
-        # --- Fetch flight data from the API ---
+    except Exception as e:
+        flash(f'Error searching flights: {str(e)}', 'error')
+        return redirect(url_for('home'))
 
-        # calls the Travelpayouts API
-        flights = prices_for_dates(
-            origin=origin,
-            destination=destination,
-            departure_at=departure_date,
-            return_at=return_date if not one_way else None,
-            one_way=one_way,
-            limit=10,
-            adults=adults,
-            children=children,
-            infants=infant
-        )
 
-        # --- Enrich each flight with human-readable city/airline info ---
-
-        # assign cities and airline info
-        for flight in flights:
-            # Map airport codes to city and country names
-            flight['origin_city'] = airports.get(flight['origin'], {}).get('city', flight['origin'])
-            flight['destination_city'] = airports.get(flight['destination'], {}).get('city', flight['destination'])
-            flight['origin_country'] = airports.get(flight['origin'], {}).get('country', flight['origin'])
-            flight['destination_country'] = airports.get(flight['destination'], {}).get('country', flight['destination'])
-
-            # Map airline code to name and logo
-            airline_info = airlines.get(flight['airline'], {})
-            flight['airline_name'] = airline_info.get('name', flight['airline'])
-            flight['airline_img'] = airline_info.get('img', None)
-
-            # return airline info
-            if flight.get('return_airline'):
-                return_airline_info = airlines.get(flight['return_airline'], {})
-                flight['return_airline_name'] = return_airline_info.get('name', flight['return_airline'])
-                flight['return_airline_img'] = return_airline_info.get('img', None)
-
-        # --- Build template context ---
-
-        # calculate total passengers
-        total_passengers = adults + children + infant
-
-        # Look up city names for the search summary
-        origin_city = airports.get(origin, {}).get('city', origin)
-        origin_country = airports.get(origin, {}).get('country', '')
-        destination_city = airports.get(destination, {}).get('city', destination)
-        destination_country = airports.get(destination, {}).get('country', '')
-
-        # pass data to the template
-        return render_template(
-            'results.html',
-            flights=flights,
-            origin=origin,
-            destination=destination,
-            origin_city=origin_city,
-            origin_country=origin_country,
-            destination_city=destination_city,
-            destination_country=destination_country,
-            departure_date=departure_date,
-            return_date=return_date,
-            trip_type=trip_type,
-            total_passengers=total_passengers,
-        )
+# Renders results.html for the first page of a result set.
+def render_results_page(entry, params, trip_type, results_age_minutes):
+    """Render the results page for a cached result set."""
+    # first page, cheapest first
+    flights, total_flights = select_offers(entry.offers, limit=RESULTS_PAGE_SIZE)
+
+    # calculate total passengers
+    total_passengers = params.adults + params.children + params.infants
+
+    # Look up city names for the search summary
+    origin_city = reference.airport_city(params.origin)
+    origin_country = reference.airport_country(params.origin)
+    destination_city = reference.airport_city(params.destination)
+    destination_country = reference.airport_country(params.destination)
+
+    # pass data to the template
+    return render_template(
+        'results.html',
+        flights=flights,
+        total_flights=total_flights,
+        search_id=entry.search_id,
+        airline_options=airline_options(entry.offers),
+        results_age_minutes=results_age_minutes,
+        origin=params.origin,
+        destination=params.destination,
+        origin_city=origin_city,
+        origin_country=origin_country,
+        destination_city=destination_city,
+        destination_country=destination_country,
+        departure_date=params.departure_date,
+        return_date=params.return_date,
+        trip_type=trip_type,
+        total_passengers=total_passengers,
+    )
+
+
+# Yields enriched offers for the streamed results page. A cached
+# result set is replayed as is; otherwise offers are enriched and
+# sent one by one as Amadeus's response is parsed, then cached as
+# a whole so paging/sorting and repeat searches reuse them.
+def stream_offers(key, params, status):
+    """Generate offers for results_stream.html, recording count/error in `status`."""
+    # runs while the body is sent, after the view has returned
+    logs.request_id_var.set(g.get('request_id'))
+
+    entry = search_cache.peek(key)
+    if entry is not None:
+        if search_cache.is_stale(entry):
+            search_cache.refresh_in_background(key, lambda: fetch_offers(params))
+        status['count'] = len(entry.offers)
+        popular_routes.add(key)
+        yield from entry.offers
+        return
+
+    from src.api.travelpayouts import iter_prices_for_dates, AMADEUS_MAX_RESULTS
+
+    offers = []
+    enrich_seconds = 0.0
+    try:
+        with upstream_gate.slot():
+            for offer in iter_prices_for_dates(
+                origin=params.origin,
+                destination=params.destination,
+                departure_at=params.departure_date,
+                return_at=params.return_date if not params.one_way else None,
+                one_way=params.one_way,
+                limit=AMADEUS_MAX_RESULTS,
+                adults=params.adults,
+                children=params.children,
+                infants=params.infants,
+            ):
+                start = time.perf_counter()
+                reference.enrich_offers([offer])
+                enrich_seconds += time.perf_counter() - start
+                offers.append(offer)
+                status['count'] = len(offers)
+                yield offer
+    except Exception as e:
+        status['error'] = str(e)
+        return
+
+    ENRICH_SECONDS.observe(enrich_seconds, source='stream')
+    offers.sort(key=lambda offer: offer['price'])
+    search_cache.put(key, offers)
+    popular_routes.add(key)
+
+
+# streamed flight search
+# Same parameters as /search. The page shell and search summary
+# (local lookups only) go out immediately and the flight cards
+# follow as they are parsed, so the first byte never waits on
+# the flight API. Cards are sorted on the client.
+@app.route('/search/stream')
+def search_stream():
+    allowed, retry_after = search_limiter.allow(request.remote_addr)
+    if not allowed:
+        return throttled_page('index.html', 'Too many searches. Please wait a moment and try again.', retry_after)
 
+    try:
+        params, trip_type = parse_search_args(request.args)
     except Exception as e:
         flash(f'Error searching flights: {str(e)}', 'error')
         return redirect(url_for('home'))
 
+    key = search_key(params)
+    route_warmer.start()
+
+    # Shed a miss before the page starts; once streaming, a full
+    # gate can only show up as the page's error message.
+    if upstream_gate.saturated() and search_cache.peek(key) is None:
+        return throttled_page('index.html', 'We are getting a lot of searches right now. Please try again shortly.',
+                              upstream_gate.retry_after, 503)
+
+    status = {'count': 0, 'error': None}
+    response = app.response_class(stream_template(
+        'results_stream.html',
+        flights=stream_offers(key, params, status),
+        status=status,
+        origin=params.origin,
+        destination=params.destination,
+        origin_city=reference.airport_city(params.origin),
+        origin_country=reference.airport_country(params.origin),
+        destination_city=reference.airport_city(params.destination),
+        destination_country=reference.airport_country(params.destination),
+        departure_date=params.departure_date,
+        return_date=params.return_date,
+        trip_type=trip_type,
+        total_passengers=params.adults + params.children + params.infants,
+    ), mimetype='text/html')
+    response.headers['X-Accel-Buffering'] = 'no'  # don't let a proxy buffer the stream
+    response.cache_control.no_store = True
+    return response
+
+
+# An optional integer query parameter. Unlike request.args.get(...,
+# type=int), a value that isn't an integer raises ValueError instead
+# of quietly becoming the default.
+def int_arg(name, default=None):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+
+
+# pages, sorts and filters a cached result set
+# Used by "Show More" and the sort/filter controls on the results
+# page. Returns the rendered flight cards plus paging info, and
+# never calls the flight API. limit is kept within 1..MAX_PAGE_SIZE
+# and offset at 0 or more, so next_offset always moves forward.
+@app.route('/search/<search_id>/offers')
+def search_offers(search_id):
+    entry = search_cache.get_by_id(search_id)
+    if entry is None:
+        return jsonify({'error': 'These results have expired. Please search again.'}), 404
+
+    try:
+        offset = max(0, int_arg('offset', 0))
+        limit = clamp_limit(int_arg('limit'), default=RESULTS_PAGE_SIZE, maximum=MAX_PAGE_SIZE)
+        max_stops = int_arg('max_stops')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    flights, total = select_offers(
+        entry.offers,
+        sort=request.args.get('sort', 'price'),
+        airline=request.args.get('airline') or None,
+        max_stops=max_stops,
+        offset=offset,
+        limit=limit,
+    )
+
+    next_offset = offset + len(flights)
+    return jsonify({
+        'html': render_template('flight_cards.html', flights=flights),
+        'total': total,
+        'next_offset': next_offset if next_offset < total else None,
+    })
+
+
+# airport autocomplete
+# Returns a handful of ranked matches for what the user has typed
+# (code, city, state, country or airport name) so the browser
+# never has to download the full airport list.
+@app.route('/api/airports')
+def airport_autocomplete():
+    query = request.args.get('q', '')
+    try:
+        limit = clamp_limit(int_arg('limit'), default=5, maximum=AIRPORT_MAX_LIMIT)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    response = jsonify(airport_index.search(query, limit))
+    response.cache_control.public = True
+    response.cache_control.max_age = 3600  # airport data only changes on deploy
+    return response
+
+
+# most searched routes, plus what the cache warmer has been doing
+@app.route('/api/popular-routes')
+def popular_routes_api():
+    limit = min(request.args.get('limit', 10, type=int), POPULAR_ROUTES_MAX)
+
+    routes = []
+    for key, searches in popular_routes.top(limit):
+        try:
+            params = params_from_key(key)
+        except ValueError:
+            continue  # not a key search_key() built; nothing to show
+        entry = search_cache.peek(key)
+        routes.append({
+            'origin': params.origin,
+            'destination': params.destination,
+            'origin_city': reference.airport_city(params.origin),
+            'destination_city': reference.airport_city(params.destination),
+            'departure_date': params.departure_date,
+            'return_date': params.return_date,
+            'one_way': params.one_way,
+            'searches': searches,
+            'cached_age_seconds': int(entry.age) if entry else None,
+        })
+
+    return jsonify({'routes': routes, 'warmer': route_warmer.stats()})
+
+
+# ──────────────────────────────────────────────────────────────
+# JSON API Routes (v1)
+# Machine-readable search and alert data for internal
+# integrations: compact JSON (orjson when installed), opaque
+# cursors for pagination, ?fields= selection and gzip.
+# ──────────────────────────────────────────────────────────────
+
+# Fields an offer can have in /api/v1/search responses
+OFFER_FIELDS = frozenset((
+    'price', 'origin', 'destination', 'depart_date', 'departure_time', 'arrival_time',
+    'return_date', 'return_departure_time', 'return_arrival_time', 'airline', 'return_airline',
+    'transfers', 'return_transfers', 'layover_stops', 'return_layover_stops', 'duration',
+    'return_duration', 'duration_minutes', 'flight_number', 'link', 'origin_city', 'origin_country',
+    'destination_city', 'destination_country', 'airline_name', 'airline_img',
+    'return_airline_name', 'return_airline_img',
+))
+
+
+# Serializes a payload and gzips it when the client accepts it and
+# it's big enough to be worth it.
+def json_response(payload, status=200):
+    """Build a JSON response from any JSON-serializable payload."""
+    body = dumps(payload)
+    response = app.response_class(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if len(body) >= GZIP_MIN_BYTES and 'gzip' in request.accept_encodings:
+        response.set_data(gzip.compress(body, compresslevel=5))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+def api_error(message, status=400):
+    return json_response({'error': message}, status)
+
+
+# Cursors are only base64 JSON, so a client can send back anything;
+# check every field before it reaches the cache or a query.
+def _cursor_int(value, allow_none=False):
+    if value is None and allow_none:
+        return True
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def check_search_cursor(state):
+    """Raise CursorError unless `state` is a cursor api_search() could have made."""
+    if not (isinstance(state.get('id'), str)
+            and isinstance(state.get('at'), (int, float)) and not isinstance(state['at'], bool)
+            and _cursor_int(state.get('o', 0))
+            and state.get('sort', 'price') in SORT_KEYS
+            and (state.get('airline') is None or isinstance(state['airline'], str))
+            and _cursor_int(state.get('stops'), allow_none=True)):
+        raise CursorError('Invalid cursor')
+    return state
+
+
+# fetched_at as stored in a cursor (ms is plenty to tell fetches apart)
+def cursor_fetched_at(entry):
+    return round(entry.fetched_at, 3)
+
+
+def check_alerts_cursor(state):
+    """Return the `after` id of an api_alerts() cursor (CursorError if invalid)."""
+    if not _cursor_int(state.get('after')):
+        raise CursorError('Invalid cursor')
+    return state['after']
+
+
+# search results as JSON
+# First page: same query parameters as /search, plus sort, airline,
+# max_stops, limit and fields. Later pages: just ?cursor= (and
+# optionally fields), which pins the result set and filters. The
+# search id names a route, not one fetch of it, so the cursor also
+# carries the entry's fetched_at: once a refresh has replaced the
+# offers the old offsets mean nothing, and the client gets a 410.
+@app.route('/api/v1/search')
+def api_search():
+    try:
+        fields = parse_fields(request.args.get('fields'), OFFER_FIELDS)
+        limit = clamp_limit(request.args.get('limit', type=int))
+    except ValueError as e:
+        return api_error(str(e))
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            state = check_search_cursor(decode_cursor(cursor))
+        except CursorError as e:
+            return api_error(str(e) or 'Invalid cursor')
+        entry = search_cache.get_by_id(state['id'])
+        if entry is None:
+            return api_error('These results have expired. Please search again.', 410)
+        if cursor_fetched_at(entry) != state['at']:
+            return api_error('These results have been updated. Please search again.', 410)
+    else:
+        try:
+            params, _ = parse_search_args(request.args)
+        except (ValueError, TypeError) as e:
+            return api_error(str(e) or 'origin, destination and departure_date are required')
+        allowed, retry_after = search_limiter.allow(request.remote_addr)
+        if not allowed:
+            return with_retry_after(api_error('Too many searches', 429), retry_after)
+        try:
+            key = search_key(params)
+            route_warmer.start()
+            entry = search_cache.get_or_fetch(key, lambda: fetch_offers(params))
+            popular_routes.add(key)
+        except Overloaded as e:
+            return with_retry_after(api_error(str(e), 503), upstream_gate.retry_after)
+        except Exception as e:
+            return api_error(f'Error searching flights: {str(e)}', 502)
+        state = {
+            'id': entry.search_id,
+            'at': cursor_fetched_at(entry),
+            'o': 0,
+            'sort': request.args.get('sort', 'price'),
+            'airline': request.args.get('airline') or None,
+            'stops': request.args.get('max_stops', type=int),
+        }
+        if state['sort'] not in SORT_KEYS:
+            return api_error(f"sort must be one of: {', '.join(SORT_KEYS)}")
+        if state['stops'] is not None and state['stops'] < 0:
+            return api_error('max_stops must be 0 or more')
+
+    offset = state.get('o', 0)
+    offers, total = select_offers(
+        entry.offers,
+        sort=state.get('sort', 'price'),
+        airline=state.get('airline'),
+        max_stops=state.get('stops'),
+        offset=offset,
+        limit=limit,
+    )
+    next_offset = offset + len(offers)
+
+    return json_response({
+        'search_id': entry.search_id,
+        'fetched_at': datetime.fromtimestamp(entry.fetched_at, timezone.utc),
+        'stale': search_cache.is_stale(entry),
+        'total': total,
+        'offers': select_fields(offers, fields),
+        'next_cursor': encode_cursor(dict(state, o=next_offset)) if next_offset < total else None,
+    })
+
+
+# Constant-time check of "Authorization: Bearer <API_TOKEN>".
+def _api_authorized():
+    if not API_TOKEN:
+        return False
+    header = request.headers.get('Authorization', '')
+    scheme, _, token = header.partition(' ')
+    return scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), API_TOKEN.encode())
+
+
+# alert records as JSON (contact details, so a bearer token is required)
+# Filters: email, phone, active=1. Keyset-paginated by id.
+@app.route('/api/v1/alerts')
+def api_alerts():
+    if not _api_authorized():
+        return api_error('Unauthorized', 401)
+
+    try:
+        fields = parse_fields(request.args.get('fields'), ALERT_PUBLIC_COLUMNS)
+        limit = clamp_limit(request.args.get('limit', type=int))
+        after_id = check_alerts_cursor(decode_cursor(request.args['cursor'])) if request.args.get('cursor') else 0
+    except ValueError as e:
+        return api_error(str(e) or 'Invalid cursor')
+
+    # read one extra row to know whether there's a next page
+    try:
+        rows = list_alerts(
+            after_id=after_id,
+            limit=limit + 1,
+            email=request.args.get('email') or None,
+            phone=request.args.get('phone') or None,
+            active_only=request.args.get('active') == '1',
+            columns=fields or ALERT_PUBLIC_COLUMNS,
+        )
+    except pymysql.Error as e:
+        logger.error("Error listing alerts: %s", e)
+        return api_error('Alerts are unavailable right now. Please try again later.', 503)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return json_response({
+        'alerts': select_fields(rows, fields),
+        'next_cursor': encode_cursor({'after': rows[-1]['id']}) if has_more else None,
+    })
+
+
+# rate limiter and upstream gate state (keys are IPs and contact
+# details, so a bearer token is required)
+@app.route('/api/rate-limits')
+def rate_limits_api():
+    if not _api_authorized():
+        return api_error('Unauthorized', 401)
+
+    top = min(request.args.get('top', 10, type=int), 100)
+    return json_response({
+        'limiters': [
+            dict(limiter.stats(), most_limited=[
+                {'key': key, 'tokens': tokens} for key, tokens in limiter.most_limited(top)
+            ])
+            for limiter in (search_limiter, alert_limiter, contact_limiter, link_limiter)
+        ],
+        'upstream': upstream_gate.stats(),
+    })
+
 
 # ──────────────────────────────────────────────────────────────
 # Alert Routes
@@ -164,9 +903,75 @@ def search():
 
 
 # display alerts signup form
+# After an alert is created we land back here with ?alert_id=...
+# so the page can poll the background verification send (anything
+# that isn't an id just skips the status box).
 @app.route('/alerts')
 def alerts():
-    return render_template('alerts.html')
+    return render_template('alerts.html', delivery_alert_id=request.args.get('alert_id', type=int))
+
+
+# delivery status of the background verification/activation messages
+# for an alert, e.g. {"verification_email": "sent"}. Polled by script.js.
+# The status lives in the worker that queued the send, so with several
+# workers a poll can get {} (see notification_queue.py).
+@app.route('/alerts/<int:alert_id>/delivery-status')
+def alert_delivery_status(alert_id):
+    return jsonify(notification_queue.status(alert_id))
+
+
+# Runs on the prefetch queue right after an alert is created.
+# Seeds the search cache for the alert's route (so the checker and
+# later searches reuse it) and records the baseline price point.
+def prefetch_alert_route(alert_id, params):
+    """Fetch an alert's route and record its current lowest price."""
+    key = search_key(params)
+    entry = search_cache.get(key) or search_cache.refresh(key, lambda: fetch_offers(params))
+    if not entry.offers:
+        return False
+
+    cheapest = entry.offers[0]
+    record_price_point(alert_id, cheapest['price'], cheapest.get('airline'))
+    return True
+
+
+# The alerts this browser created recently, kept in the (signed)
+# session so their confirmation pages can read them back without
+# exposing every alert to anyone counting ids.
+CREATED_ALERTS_REMEMBERED = 5
+
+
+def remember_created_alert(alert_id):
+    session['created_alerts'] = (session.get('created_alerts', []) + [alert_id])[-CREATED_ALERTS_REMEMBERED:]
+
+
+def created_by_visitor(alert_id):
+    return alert_id in session.get('created_alerts', [])
+
+
+# current lowest price for a new alert's route, from the prefetch above.
+# Polled by script.js on the confirmation page. The prefetch status is
+# per worker, so "no status" here usually means another worker queued
+# it: that's "pending" until a price point shows up, like {} on the
+# delivery-status poll. Only a failure this worker saw stops the poll.
+@app.route('/alerts/<int:alert_id>/baseline-price')
+def alert_baseline_price(alert_id):
+    if not created_by_visitor(alert_id):
+        return jsonify({'status': 'unavailable'}), 404
+
+    status = prefetch_queue.status(alert_id).get('price_prefetch')
+    if status == 'queued':
+        return jsonify({'status': 'pending'})
+
+    point = get_latest_price_point(alert_id) if status != 'failed' else None
+    if point is None:
+        return jsonify({'status': 'unavailable' if status else 'pending'})
+
+    return jsonify({
+        'status': 'ready',
+        'price': float(point['price']),
+        'airline': reference.airline_name(point['airline']) if point['airline'] else None,
+    })
 
 
 # handle alert form submission
@@ -175,9 +980,11 @@ def create_alert_route():
 
     from src.core.sms_service import generate_verification_code, send_verification_sms
 
-    try:
-        print("DEBUG: Form submitted")
+    allowed, retry_after = alert_limiter.allow(request.remote_addr)
+    if not allowed:
+        return throttled_page('alerts.html', 'Too many alerts created. Please try again later.', retry_after)
 
+    try:
         # --- Parse contact info ---
         phone = request.form.get('phone') or None  # Convert empty string to None
         email = request.form.get('email')
@@ -188,7 +995,6 @@ def create_alert_route():
             return redirect(url_for('alerts'))
 
         # --- Parse flight parameters ---
-        print(f"DEBUG: Email = {email}, Phone = {phone}")
         origin = request.form.get('origin').upper()
         destination = request.form.get('destination').upper()
         departure_date = request.form.get('departure_date')
@@ -205,23 +1011,28 @@ def create_alert_route():
             flash('Phone number must include country code (e.g., +15551234567)', 'error')
             return redirect(url_for('alerts'))
 
+        # --- Per-contact limit ---
+        # Caps verification messages to any one address, whichever
+        # IPs the requests come from.
+        for contact in contact_keys(email, phone):
+            allowed, retry_after = contact_limiter.allow(contact)
+            if not allowed:
+                return throttled_page('alerts.html', 'Too many alerts for this email or phone number. '
+                                      'Please try again later.', retry_after)
+
         # --- Generate verification tokens ---
 
         # Generate verification token for email
-        print("DEBUG: Generating token")
         verification_token = generate_verification_token()
-        print(f"DEBUG: Token = {verification_token}")
 
         # generate verification code for phone
         phone_verification_code = None
         if phone:
             phone_verification_code = generate_verification_code()
-            print(f"DEBUG: Phone verification code = {phone_verification_code}")
 
         # --- Persist the alert ---
 
         # Save to database
-        print("DEBUG: Saving to database")
         alert_id = create_alert(
             phone=phone,
             origin=origin,
@@ -234,9 +1045,22 @@ def create_alert_route():
             verification_token=verification_token,
             phone_verification_code=phone_verification_code,
         )
-        print(f"DEBUG: Alert created with ID = {alert_id}")
-
-        # --- Send verification notifications ---
+        logger.info("Alert %s created: %s -> %s", alert_id, origin, destination, extra={
+            'alert_id': alert_id, 'email': mask_email(email), 'phone': mask_phone(phone),
+        })
+        remember_created_alert(alert_id)
+
+        # --- Prefetch the route ---
+        # Warms the search cache and records a baseline price in the
+        # background; the confirmation page polls for the result.
+        params = SearchParams(origin, destination, departure_date, return_date,
+                              trip_type == 'one-way', 1, 0, 0)
+        prefetch_queue.submit(alert_id, 'price_prefetch', prefetch_alert_route, alert_id, params)
+
+        # --- Queue verification notifications ---
+        # Sends happen on the background notification queue so the
+        # redirect only waits on the database insert. The next page
+        # polls /alerts/<id>/delivery-status for the outcome.
 
         # send verification mail
         if email:
@@ -249,36 +1073,181 @@ def create_alert_route():
                 'trip_type': trip_type,
             }
 
-            print("DEBUG: Sending verification email")
-            if send_verification_email(email, verification_token, alert_details):
-                print("DEBUG: Email sent successfully")
-                flash(f"Verification email sent to {email}. Please check your inbox to activate your alert.", 'success')
-            else:
-                print("DEBUG: Email failed to send")
-                flash(f"Alert created bbut failed to send verification email. Please contact support.", 'warning')
+            notification_queue.submit(alert_id, 'verification_email', send_verification_email,
+                                      email, verification_token, alert_details)
+            flash(f"Verification email is on its way to {email}. Please check your inbox to activate your alert.", 'success')
 
         # send phone verification
         if phone:
-            print("DEBUG: Sending verification SMS")
-            if send_verification_sms(phone, phone_verification_code):
-                print("DEBUG: SMS sent successfully")
-                return redirect(url_for('verify_phone_submit', alert_id=alert_id, phone=phone))
-            else:
-                print("DEBUG: SMS failed to send")
-                flash(f"Alert created but failed to send verification SMS> Please contact support.", 'warning')
-
-        # if email and not phone:
-        if email and not phone:
-            flash(f"Verification email sent to {email}. Please check your inbox to activate your alert.", 'success')
+            notification_queue.submit(alert_id, 'verification_sms', send_verification_sms,
+                                      phone, phone_verification_code)
+            return redirect(url_for('verify_phone_submit', alert_id=alert_id, phone=phone))
 
-        return redirect(url_for('alerts'))
+        return redirect(url_for('alerts', alert_id=alert_id))
 
     except Exception as e:
-        print(f"DEBUG: Exception caught: {e}")
+        logger.exception("Error creating alert: %s", e)
         flash(f'Error creating alert: {str(e)}', 'error')
         return redirect(url_for('alerts'))
 
 
+# bulk alert import (CSV, JSON array or JSON Lines)
+# Takes the file as the request body or as a multipart `file`
+# field; ?format= overrides the content type / file extension and
+# ?dry_run=1 only validates. Rows are validated and inserted as
+# they're read (see alert_import.py), and each contact gets one
+# verification message for all of their new alerts. Anyone with
+# the token can message any address, so it's required.
+@app.route('/alerts/import', methods=['POST'])
+def import_alerts_route():
+    if not _api_authorized():
+        return api_error('Unauthorized', 401)
+
+    upload = request.files.get('file')
+    if upload is not None:
+        stream = upload.stream
+        fmt = request.args.get('format') or detect_format(upload.filename, upload.content_type)
+    else:
+        stream = request.stream
+        fmt = request.args.get('format') or detect_format(content_type=request.content_type)
+    if fmt not in IMPORT_FORMATS:
+        return api_error(f"Unknown format; pass ?format= ({', '.join(IMPORT_FORMATS)})")
+
+    text = io.TextIOWrapper(io.BufferedReader(stream) if upload is None else stream,
+                            encoding='utf-8-sig', newline='')
+    try:
+        result = import_alerts(iter_rows(text, fmt), dry_run=request.args.get('dry_run') == '1')
+    except (AlertImportError, UnicodeDecodeError) as e:
+        return api_error(str(e))
+    except pymysql.Error:
+        logger.exception("Alert import failed")
+        return api_error('Database unavailable, please try again later', 503)
+    # a failed insert is a server-side problem; the body says what was imported
+    status = 503 if result['failed'] else 400 if result.get('error') else 200
+    return json_response(result, status)
+
+
+# ──────────────────────────────────────────────────────────────
+# My Alerts
+# Every alert for an email or phone, reached through a signed,
+# expiring link sent to that address (there are no accounts).
+# The link's token is the contact itself, signed with
+# MY_ALERTS_SECRET, so opening it needs no lookup beyond the page
+# query.
+#
+# The key is separate from FLASK_SECRET_KEY, which falls back to a
+# public default: links signed with that could be forged for any
+# address. Without MY_ALERTS_SECRET no link is issued or accepted
+# (create_app logs an error at startup).
+# ──────────────────────────────────────────────────────────────
+
+MY_ALERTS_PAGE_SIZE = 25  # alerts per dashboard page
+MY_ALERTS_LINK_DAYS = int(os.getenv('MY_ALERTS_LINK_DAYS', 7))  # how long a dashboard link works
+MY_ALERTS_SECRET = os.getenv('MY_ALERTS_SECRET')  # signs dashboard links (unset disables them)
+
+
+def _link_serializer():
+    if not MY_ALERTS_SECRET:
+        raise RuntimeError("MY_ALERTS_SECRET is not set")
+    return URLSafeTimedSerializer(MY_ALERTS_SECRET, salt='my-alerts')
+
+
+def make_my_alerts_token(email=None, phone=None):
+    """Signed token for the dashboard of an email or phone."""
+    return _link_serializer().dumps(['email', email] if email else ['phone', phone])
+
+
+def read_my_alerts_token(token):
+    """(kind, contact) from a dashboard token, or None if it's invalid or expired."""
+    if not MY_ALERTS_SECRET:
+        return None
+    try:
+        kind, contact = _link_serializer().loads(token, max_age=MY_ALERTS_LINK_DAYS * 86400)
+    except (BadSignature, ValueError, TypeError):
+        return None
+    if kind not in ('email', 'phone') or not contact:
+        return None
+    return kind, contact
+
+
+# asks for an email/phone and sends the dashboard link there
+# The response is the same whether or not the address has alerts,
+# so the form can't be used to find out who is signed up.
+@app.route('/my-alerts', methods=['GET', 'POST'])
+def my_alerts_request():
+    if request.method == 'GET':
+        return render_template('my_alerts.html', alerts=None)
+
+    from src.core.email_service import send_my_alerts_link_email
+    from src.core.sms_service import send_my_alerts_link_sms
+
+    if not MY_ALERTS_SECRET:
+        flash('Alert links are not available right now. Please try again later.', 'error')
+        return redirect(url_for('my_alerts_request'))
+
+    email = (request.form.get('email') or '').strip() or None
+    phone = (request.form.get('phone') or '').strip() or None
+    if not email and not phone:
+        flash('Please provide either an email address or phone number.', 'error')
+        return redirect(url_for('my_alerts_request'))
+    if phone and not phone.startswith('+'):
+        flash('Phone number must include country code (e.g., +15551234567)', 'error')
+        return redirect(url_for('my_alerts_request'))
+    if email:
+        phone = None  # one link per request
+
+    for key in ['ip:' + str(request.remote_addr)] + contact_keys(email, phone):
+        allowed, retry_after = link_limiter.allow(key)
+        if not allowed:
+            return throttled_page('my_alerts.html', 'Too many link requests. Please try again later.', retry_after)
+
+    alert_id = first_contact_alert_id(email=email, phone=phone)
+    if alert_id is not None:
+        token = make_my_alerts_token(email=email, phone=phone)
+        if email:
+            notification_queue.submit(alert_id, 'my_alerts_link', send_my_alerts_link_email,
+                                      email, token, MY_ALERTS_LINK_DAYS)
+        else:
+            notification_queue.submit(alert_id, 'my_alerts_link', send_my_alerts_link_sms,
+                                      phone, token, MY_ALERTS_LINK_DAYS)
+
+    flash(f"If there are alerts for {email or phone}, a link to them is on its way.", 'success')
+    return redirect(url_for('my_alerts_request'))
+
+
+# all alerts for the contact in a signed link, newest price for each
+# Keyset-paginated by alert id (?after=<last id on the previous page>).
+@app.route('/my-alerts/<token>')
+def my_alerts(token):
+    contact = read_my_alerts_token(token)
+    if contact is None:
+        flash('This link is invalid or has expired. Request a new one below.', 'error')
+        return redirect(url_for('my_alerts_request'))
+    kind, value = contact
+
+    after_id = request.args.get('after', 0, type=int)
+    # read one extra row to know whether there's a next page
+    rows = get_contact_alerts(**{kind: value}, after_id=after_id, limit=MY_ALERTS_PAGE_SIZE + 1)
+    has_more = len(rows) > MY_ALERTS_PAGE_SIZE
+    rows = rows[:MY_ALERTS_PAGE_SIZE]
+
+    response = make_response(render_template(
+        'my_alerts.html',
+        alerts=rows,
+        contact=value,
+        token=token,
+        first_page=after_id == 0,
+        next_after=rows[-1]['id'] if has_more else None,
+        airport_label=reference.airport_label,
+        airline_name=reference.airline_name,
+    ))
+    # personal data, and the token is in the URL
+    response.cache_control.private = True
+    response.cache_control.no_store = True
+    response.headers['Referrer-Policy'] = 'no-referrer'
+    return response
+
+
 # ──────────────────────────────────────────────────────────────
 # Verification Routes
 # ──────────────────────────────────────────────────────────────
@@ -287,12 +1256,9 @@ def create_alert_route():
 # handles email verification
 @app.route('/verify-email')
 def verify_email():
-    print("DEBUG: Verify email route hit")
     token = request.args.get('token')
-    print(f"DEBUG: Token received = {token}")
 
     if not token:
-        print("DEBUG: No token provided")
         flash('Invalid verification link.', 'error')
         return redirect(url_for('home'))
 
@@ -301,23 +1267,24 @@ def verify_email():
     from src.core.email_service import send_alert_activated_notification
 
     # Attempt to verify the token against the database
-    print("DEBUG: Calling verify_email_token")
     result = verify_email_token(token)
-    print(f"DEBUG: verify_email_token returned {result}")
 
     if result:
-        print("DEBUG: Verification successful")
-        print("DEBUG: About to fetch alert with token")
-
-        # Look up the alert ID associated with this token
+        # Look up the alert ID(s) associated with this token
         connection = get_connection()
         cursor = connection.cursor()
         cursor.execute("SELECT id FROM price_alerts WHERE verification_token = %s", (token,))
-        alert = cursor.fetchone()
-        alert_id = alert['id']
+        alert_ids = [row['id'] for row in cursor.fetchall()]
+        alert_id = alert_ids[0]
         connection.close()
 
-        print(f"DEBUG: Found alert_id = {alert_id}")
+        logger.info("Email verified for %d alert(s)", len(alert_ids), extra={'alert_id': alert_id})
+
+        # A bulk-imported token covers many alerts; their verification
+        # email already listed them, so skip the per-alert activation emails
+        if len(alert_ids) > 1:
+            flash(f'Email verified successfully! Your {len(alert_ids)} price alerts are now active.', 'success')
+            return render_template('email_verified.html')
 
         # Fetch full alert details to include in the activation email
         alert = get_alert_by_id(alert_id)
@@ -334,21 +1301,16 @@ def verify_email():
 
         user_email = alert['email']
 
-        # Send the "alert is now active" confirmation email
-        print(f"DEBUG: Alert details = {alert_details}")
-        print(f"DEBUG: Sending activation email to {user_email}")
-
-        send_alert_activated_notification(user_email, alert_details)
-
-        print("DEBUG: After sending activation email")
+        # Queue the "alert is now active" confirmation email
+        notification_queue.submit(alert_id, 'activation_email', send_alert_activated_notification,
+                                  user_email, alert_details)
 
         flash('Email verified successfully! Your price alert is now active.', 'success')
     else:
-        print("DEBUG: Verification failed")
+        logger.info("Email verification failed (invalid or expired token)")
         flash('Invalid or expired verification link.', 'error')
 
     # Redirect based on whether verification succeeded or failed
-    print("DEBUG: Redirecting to alerts")
     if result:
         return render_template('email_verified.html')
     else:
@@ -395,7 +1357,7 @@ def unsubscribe():
         return render_template('unsubscribe.html')
 
     except Exception as e:
-        print(f"Error unsubscribing: {e}")
+        logger.error("Error unsubscribing: %s", e)
         flash('Error unsubscribing from alert.', 'error')
         return redirect(url_for('home'))
 
@@ -414,7 +1376,8 @@ def verify_phone_submit():
             flash('Invalid verification link.', 'error')
             return redirect(url_for('home'))
 
-        return render_template('verify_phone.html', alert_id=alert_id, phone=phone)
+        return render_template('verify_phone.html', alert_id=alert_id, phone=phone,
+                               delivery_alert_id=request.args.get('alert_id', type=int))
 
     # --- POST: validate the submitted verification code ---
     else:  # POST method
@@ -429,10 +1392,7 @@ def verify_phone_submit():
             from src.core.db import get_alert_by_id
             from src.core.sms_service import send_alert_activated_sms
 
-            print("DEBUG: Phone verified successfully")
-
-            alert = get_alert_by_id(alert_id)
-            print(f"DEBUG: Retrieved alert = {alert}")
+            logger.info("Phone verified for alert %s", alert_id, extra={'alert_id': alert_id})
 
             alert = get_alert_by_id(alert_id)
             alert_details = {
@@ -445,10 +1405,9 @@ def verify_phone_submit():
                 'trip_type': alert['trip_type'],
             }
 
-            # Send activation confirmation via SMS
-            print(f"DEBUG: About to send activation SMS to {alert['phone']}")
-            send_alert_activated_sms(alert['phone'], alert_details)
-            print(f"DEBUG: After sending activation SMS")
+            # Queue activation confirmation via SMS
+            notification_queue.submit(alert_id, 'activation_sms', send_alert_activated_sms,
+                                      alert['phone'], alert_details)
 
             flash('Phone verified successfully! Your price alert is now active.', 'success')
             return render_template('phone_verified.html')
@@ -481,6 +1440,109 @@ def test_phone_verify():
     return render_template('verify_phone.html', phone='+15551234567', alert_id=123)
 
 
+# ──────────────────────────────────────────────────────────────
+# App Factory & Worker Lifecycle
+# Production servers import src/web/wsgi.py, which calls
+# create_app() once in the master process (gunicorn --preload).
+# warm_up() loads everything a request needs up front, so the
+# forked workers share it copy-on-write and none of them pays a
+# cold first request. reset_after_fork() runs in each worker
+# right after the fork and replaces anything that holds threads,
+# sockets or SQLite handles with fresh per-worker state.
+# ──────────────────────────────────────────────────────────────
+
+_fork_hooks_registered = False
+
+
+# Email bodies are read as plain files by email_service, not Jinja
+def _is_page_template(name):
+    return name.endswith('.html') and not name.endswith('_email.html')
+
+
+def warm_up():
+    """Load reference data, compile templates and prime caches. Returns timings (ms)."""
+    timings = {}
+
+    start = time.perf_counter()
+    get_reference()
+    airport_index.search('new york', 1)
+    timings['reference'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for name in app.jinja_env.list_templates(filter_func=_is_page_template):
+        app.jinja_env.get_template(name)
+    timings['templates'] = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    timings['primed_searches'] = search_cache.prime()
+    timings['search_cache'] = (time.perf_counter() - start) * 1000
+
+    # One request through the full stack builds Flask's lazily
+    # created pieces (URL map matcher, session interface, ...).
+    start = time.perf_counter()
+    with app.test_client() as client:
+        client.get('/')
+        client.get('/api/airports?q=new')
+    timings['first_request'] = (time.perf_counter() - start) * 1000
+
+    return timings
+
+
+def reset_after_fork():
+    """Give a freshly forked worker its own threads, sockets and DB handles."""
+    from src.core import email_service, sms_service
+
+    logs.reset_after_fork()
+    notification_queue.reset_after_fork()
+    prefetch_queue.reset_after_fork()
+    search_cache.reset_after_fork()
+    if search_cache.store is not None:
+        search_cache.store.reset_after_fork()
+    route_warmer.reset_after_fork()
+    get_async_search().reset_after_fork()
+    email_service.reset_after_fork()
+    sms_service.reset_after_fork()
+    for limiter in (search_limiter, alert_limiter, contact_limiter, link_limiter):
+        limiter.reset_after_fork()
+    upstream_gate.reset_after_fork()
+    metrics.reset_after_fork()
+
+
+# Routes are registered on the module-level app (one app per
+# process); the factory configures it, warms it up and installs
+# the fork hooks. Calling it again just applies more config.
+def create_app(config=None):
+    """
+    Configure and warm up the Flask app.
+
+    Args:
+        config: Optional mapping of Flask config values. WARM_UP=False
+                skips the warm-up (e.g. for quick scripts).
+
+    Returns:
+        The Flask app, ready to serve
+    """
+    global _fork_hooks_registered
+
+    app.config.from_mapping(config or {})
+
+    if not _fork_hooks_registered:
+        logs.configure_logging()
+        os.register_at_fork(after_in_child=reset_after_fork)
+        _fork_hooks_registered = True
+        if not MY_ALERTS_SECRET:
+            logger.error("MY_ALERTS_SECRET is not set: My Alerts links are disabled")
+        if not os.getenv('FLASK_SECRET_KEY'):
+            logger.warning("FLASK_SECRET_KEY is not set: sessions are signed with a development key")
+
+    if app.config.get('WARM_UP', True):
+        timings = warm_up()
+        logger.info("Warm-up complete", extra={'timings': {
+            name: round(value, 1) if isinstance(value, float) else value for name, value in timings.items()
+        }})
+    return app
+
+
 # ──────────────────────────────────────────────────────────────
 # App Entry Point
 # ──────────────────────────────────────────────────────────────
@@ -488,4 +1550,4 @@ def test_phone_verify():
 
 # runs the app
 if __name__ == '__main__':
-    app.run(debug=True, port=5000)
+    create_app().run(debug=True, port=5000)
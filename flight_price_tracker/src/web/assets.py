@@ -0,0 +1,353 @@
+import io
+import os
+import re
+import sys
+import json
+import gzip
+import hashlib
+import argparse
+
+from werkzeug.security import safe_join
+
+# brotli is optional: without it the build only writes .gz variants
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# ──────────────────────────────────────────────────────────────
+# Static Asset Pipeline
+# A build step (run this file) that writes production copies of
+# the static files into static/dist/:
+#   - content-hashed names (style.3f9c2a1b7e.css), so they can be
+#     cached forever and a changed file is simply a new URL
+#   - .gz and .br variants of text assets, served as-is by the
+#     /static/dist/ route in app.py (no compression per request)
+#   - the airline logos resized into one sprite (PNG + WebP)
+#     whose CSS map is appended to the hashed stylesheet, so a
+#     results page loads one image instead of one per airline
+#
+# At runtime AssetManifest maps logical names to the hashed ones.
+# Without a build (local development) every lookup falls through
+# to the original file.
+# ──────────────────────────────────────────────────────────────
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_PATH = os.path.join(DIST_DIR, 'manifest.json')
+
+LOGO_DIR = 'airline-images'
+PAGE_ASSETS = ('airplane.jpg', 'style.css', 'script.js')  # files pages link to; CSS after what it references
+COMPRESSIBLE = ('.css', '.js', '.json', '.svg', '.html')
+ASSET_MAX_AGE = 365 * 24 * 3600  # hashed files never change, so browsers may keep them a year
+
+LOGO_HEIGHT = 30  # CSS px, matches .airline-logo in style.css
+LOGO_MAX_WIDTH = 120  # CSS px, very wide logos are scaled down to fit
+SPRITE_SCALE = 2  # sprite pixels per CSS px, sharp on high-DPI screens
+SPRITE_GAP = 2  # transparent rows between logos so neighbours never bleed in
+
+CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+# ──────────────────────────────────────────────────────────────
+# Build Helpers
+# ──────────────────────────────────────────────────────────────
+
+
+def hashed_name(path, data):
+    """'style.css' + contents -> 'style.<10 hex digits>.css'."""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+
+def _compress_variants(data):
+    """{'.gz': bytes, '.br': bytes} for whichever encodings actually shrink `data`."""
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return {suffix: body for suffix, body in variants.items() if len(body) < len(data)}
+
+
+def _write_asset(logical, data, dist_dir, written):
+    """Write one hashed asset (plus compressed variants). Returns its path relative to dist/."""
+    rel = hashed_name(logical, data)
+    path = os.path.join(dist_dir, rel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    sizes = {'raw': len(data)}
+    if logical.endswith(COMPRESSIBLE):
+        for suffix, body in _compress_variants(data).items():
+            with open(path + suffix, 'wb') as f:
+                f.write(body)
+            sizes[suffix[1:]] = len(body)
+    written[logical] = sizes
+    return rel
+
+
+# Rewrites url(...) references in a stylesheet that lives in dist/
+# to the hashed copies of the files they point at.
+def _rewrite_css_urls(css, assets):
+    def replace(match):
+        quote, target = match.groups()
+        if target in assets:
+            return f"url({quote}{assets[target][len('dist/'):]}{quote})"
+        return match.group(0)
+    return CSS_URL.sub(replace, css)
+
+
+# ──────────────────────────────────────────────────────────────
+# Airline Logo Sprite
+# ──────────────────────────────────────────────────────────────
+
+
+def _logo_files(static_dir):
+    """{airline code: logical path} for every logo file, e.g. {'AA': 'airline-images/AA.png'}."""
+    logos = {}
+    for name in sorted(os.listdir(os.path.join(static_dir, LOGO_DIR))):
+        code, ext = os.path.splitext(name)
+        if ext.lower() in ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg'):
+            logos[code] = f"{LOGO_DIR}/{name}"
+    return logos
+
+
+# Stacks every raster logo vertically, each scaled to LOGO_HEIGHT
+# (times SPRITE_SCALE). Vector logos can't be rasterized without
+# extra libraries, so they stay separate files.
+def build_sprite(static_dir, logos):
+    """
+    Returns:
+        (png_bytes, webp_bytes or None, {code: (y, width, height)} in CSS px)
+    """
+    from PIL import Image
+
+    height = LOGO_HEIGHT * SPRITE_SCALE
+    tiles = []
+    for code, logical in logos.items():
+        if logical.endswith('.svg'):
+            continue
+        with Image.open(os.path.join(static_dir, logical)) as source:
+            image = source.convert('RGBA')
+        width = min(max(1, round(image.width * height / image.height)), LOGO_MAX_WIDTH * SPRITE_SCALE)
+        width += width % SPRITE_SCALE  # whole CSS px after scaling down
+        image.thumbnail((width, height), Image.LANCZOS)
+        tiles.append((code, image))
+
+    sprite_width = max(image.width for _, image in tiles)
+    sprite_height = sum(height + SPRITE_GAP * SPRITE_SCALE for _ in tiles)
+    sprite = Image.new('RGBA', (sprite_width, sprite_height), (0, 0, 0, 0))
+
+    positions = {}
+    y = 0
+    for code, image in tiles:
+        # centre vertically in case thumbnail() had to shrink the height to fit the width cap
+        top = y + (height - image.height) // 2
+        sprite.paste(image, (0, top))
+        positions[code] = (top // SPRITE_SCALE, -(-image.width // SPRITE_SCALE), image.height // SPRITE_SCALE)
+        y += height + SPRITE_GAP * SPRITE_SCALE
+
+    # A 256-colour palette is indistinguishable at logo size and
+    # roughly halves the file; the WebP is a lossless copy of it.
+    quantized = sprite.quantize(256, method=Image.Quantize.FASTOCTREE)
+    png = io.BytesIO()
+    quantized.save(png, 'PNG', optimize=True)
+
+    webp = None
+    try:
+        out = io.BytesIO()
+        quantized.convert('RGBA').save(out, 'WEBP', lossless=True, quality=100, method=6)
+        if out.tell() < png.tell():
+            webp = out.getvalue()
+    except (KeyError, OSError):
+        pass  # Pillow built without WebP support
+
+    return png.getvalue(), webp, positions
+
+
+def sprite_css(positions, png_rel, webp_rel, sprite_size):
+    """CSS for .airline-sprite-<CODE> classes (paths relative to dist/)."""
+    width, height = sprite_size
+    lines = [
+        "",
+        "/* Airline logo sprite (generated by src/web/assets.py) */",
+        ".airline-sprite {",
+        "    display: inline-block;",
+        f"    height: {LOGO_HEIGHT}px;",
+        "    vertical-align: middle;",
+        "    background-repeat: no-repeat;",
+        f"    background-image: url('{png_rel}');",
+    ]
+    if webp_rel:
+        # browsers without image-set() keep the PNG declaration above
+        lines.append(f"    background-image: image-set(url('{webp_rel}') type('image/webp'), "
+                     f"url('{png_rel}') type('image/png'));")
+    lines += [
+        f"    background-size: {width // SPRITE_SCALE}px {height // SPRITE_SCALE}px;",
+        "}",
+    ]
+    for code, (y, logo_width, logo_height) in sorted(positions.items()):
+        lines.append(f".airline-sprite-{code} {{ width: {logo_width}px; height: {logo_height}px; "
+                     f"background-position: 0 -{y}px; }}")
+    return "\n".join(lines) + "\n"
+
+
+# ──────────────────────────────────────────────────────────────
+# Build
+# ──────────────────────────────────────────────────────────────
+
+
+def build(static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """
+    Write hashed, precompressed assets and the logo sprite to dist_dir.
+
+    Earlier builds are left in place, so pages rendered by workers
+    that haven't restarted yet keep working.
+
+    Returns:
+        The manifest dict (also written to dist_dir/manifest.json)
+    """
+    os.makedirs(dist_dir, exist_ok=True)
+    assets, written = {}, {}
+
+    # --- Airline logos: one sprite, vector logos as separate files ---
+    logos = _logo_files(static_dir)
+    sprite_positions, extra_css = {}, ''
+    try:
+        png, webp, sprite_positions = build_sprite(static_dir, logos)
+    except ImportError:
+        print("Pillow is not installed (pip install Pillow); airline logos are hashed individually")
+        png = None
+
+    if png is not None:
+        from PIL import Image
+        with Image.open(io.BytesIO(png)) as image:
+            size = image.size
+        png_rel = _write_asset('airline-sprite.png', png, dist_dir, written)
+        webp_rel = _write_asset('airline-sprite.webp', webp, dist_dir, written) if webp else None
+        extra_css = sprite_css(sprite_positions, png_rel, webp_rel, size)
+
+    for code, logical in logos.items():
+        if code not in sprite_positions:
+            with open(os.path.join(static_dir, logical), 'rb') as f:
+                assets[logical] = 'dist/' + _write_asset(logical, f.read(), dist_dir, written)
+
+    # --- Page assets (stylesheet last so its url()s can be rewritten) ---
+    for logical in PAGE_ASSETS:
+        with open(os.path.join(static_dir, logical), 'rb') as f:
+            data = f.read()
+        if logical.endswith('.css'):
+            data = (_rewrite_css_urls(data.decode('utf-8'), assets) + extra_css).encode('utf-8')
+        assets[logical] = 'dist/' + _write_asset(logical, data, dist_dir, written)
+
+    manifest = {
+        'assets': assets,
+        'sprite': sorted(sprite_positions),
+        'logos': logos,
+        'sizes': written,
+    }
+    with open(os.path.join(dist_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return manifest
+
+
+# ──────────────────────────────────────────────────────────────
+# Runtime Manifest
+# ──────────────────────────────────────────────────────────────
+
+
+class AssetManifest:
+    """Logical static paths -> hashed build outputs (identity when there is no build)."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.assets = {}
+        self.sprite = frozenset()
+        self.logos = {}
+        self._mtime = None
+        self.reload()
+
+    def reload(self):
+        """(Re)read the manifest if it changed. Returns True if it was loaded."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self.assets, self.sprite, self.logos, self._mtime = {}, frozenset(), {}, None
+            return False
+        if mtime == self._mtime:
+            return False
+        with open(self.path) as f:
+            manifest = json.load(f)
+        self.assets = manifest.get('assets', {})
+        self.sprite = frozenset(manifest.get('sprite', ()))
+        self.logos = manifest.get('logos', {})
+        self._mtime = mtime
+        return True
+
+    def resolve(self, filename):
+        """Hashed path for a static file, or the file itself."""
+        return self.assets.get(filename, filename)
+
+    def logo_file(self, code, fallback=None):
+        """Logical path of an airline's logo file (airlines.json may name the wrong extension)."""
+        return self.logos.get(code, fallback)
+
+    def has_sprite(self, code):
+        return code in self.sprite
+
+
+# Picks the best precompressed copy of a dist/ file the client
+# accepts. Returns (relative path to send, Content-Encoding or None).
+def negotiate(filename, accepted_encodings, dist_dir=DIST_DIR):
+    """Choose filename.br / filename.gz / filename for a request."""
+    path = safe_join(dist_dir, filename)
+    if path is None:
+        return filename, None  # send_from_directory will 404 it
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if encoding in accepted_encodings and os.path.isfile(path + suffix):
+            return filename + suffix, encoding
+    return filename, None
+
+
+_manifest = None
+
+
+def get_asset_manifest():
+    """Return the process-wide AssetManifest."""
+    global _manifest
+    if _manifest is None:
+        _manifest = AssetManifest()
+    return _manifest
+
+
+# ──────────────────────────────────────────────────────────────
+# Entry Point
+# python flight_price_tracker/src/web/assets.py
+# ──────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build hashed, precompressed static assets.")
+    parser.add_argument('--dist', default=DIST_DIR, help="output directory")
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli is not installed (pip install brotli); writing gzip variants only", file=sys.stderr)
+
+    result = build(dist_dir=args.dist)
+    for logical, sizes in sorted(result['sizes'].items()):
+        variants = ", ".join(f"{name} {size / 1024:.1f}K" for name, size in sizes.items())
+        print(f"  {logical:32} {variants}")
+    print(f"{len(result['sprite'])} logos in the sprite, manifest written to "
+          f"{os.path.join(args.dist, 'manifest.json')}")
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. hashed_name()         - Content-hashed file name
+#   2. build_sprite()        - Packs the airline logos into one image
+#   3. sprite_css()          - .airline-sprite-<CODE> classes for the sprite
+#   4. build()               - Writes dist/ and its manifest
+#   5. AssetManifest         - Logical -> hashed paths at runtime
+#   6. negotiate()           - Picks the .br/.gz variant a client accepts
+#   7. get_asset_manifest()  - Shared per-process manifest
+# ──────────────────────────────────────────────────────────────
@@ -3,57 +3,62 @@
 // .toISOString() - converts to format 2025-12-29T14:30.45.123Z
 // .split('T')[0] - splits by 'T' and takes first part -> 2025-12-29
 
-// stores airport data
-let airports = [];
+// airport suggestions come from the server-side index at /api/airports
+// requests are debounced so we only ask once the user pauses typing
+const AUTOCOMPLETE_DELAY_MS = 150;
+const AUTOCOMPLETE_LIMIT = 5;
 
-// fetches airport data from JSON file
-// runs when page loads and gets airport data
-fetch('/static/airports.json')
-    .then(response => response.json()) // convert response to JSON
-    .then(data => {
-        airports = data; // store the data in our global variable
-        // setup autocomplete after data is loaded
+const originInput = document.getElementById('origin');
+const destinationInput = document.getElementById('destination');
 
-        const originInput = document.getElementById('origin');
-        const destinationInput = document.getElementById('destination');
-
-        if (originInput) { setupAutocomplete(originInput); }
-        if (destinationInput) { setupAutocomplete(destinationInput); }
-    })
-    .catch(error => console.error('Error loading airport data: ', error));
+if (originInput) { setupAutocomplete(originInput); }
+if (destinationInput) { setupAutocomplete(destinationInput); }
 
 // autocomplete function
 // inputElement - the input field to attach autocomplete to (input field as a parameter)
 function setupAutocomplete(inputElement) {
     let currentFocus = -1; // tracks which suggestion is highlighted -1 means nothing, 0 is first item, 1 is second
+    let debounceTimer = null; // pending lookup, reset on every keystroke
+    let latestRequest = 0; // ignores responses that arrive after a newer lookup was sent
 
     // Listen for when user types in the input field
     inputElement.addEventListener('input', function() {
-        const inputValue = this.value.toUpperCase(); // convert to uppercase for matching
-        closeAllLists(); // close any already open dropdown (doesn't show any suggestions)
+        const inputValue = this.value.trim();
+        clearTimeout(debounceTimer);
+
+        if (!inputValue) { // if the input is empty, don't show any suggestions
+            closeAllLists();
+            return;
+        }
+
+        debounceTimer = setTimeout(() => fetchSuggestions(inputValue), AUTOCOMPLETE_DELAY_MS);
+    });
 
-        if (!inputValue) { return; } // if the input is empty, don't show any suggestions
+    // asks the server for matching airports and shows them
+    function fetchSuggestions(query) {
+        const requestId = ++latestRequest;
+        fetch(`/api/airports?q=${encodeURIComponent(query)}&limit=${AUTOCOMPLETE_LIMIT}`)
+            .then(response => response.json())
+            .then(matches => {
+                if (requestId !== latestRequest) { return; } // a newer lookup is in flight
+                showSuggestions(matches);
+            })
+            .catch(error => console.error('Error loading airport suggestions: ', error));
+    }
 
+    function showSuggestions(matches) {
+        closeAllLists(); // close any already open dropdown (doesn't show any suggestions)
         currentFocus = -1; // resets highlighting when new suggestions appear
 
+        if (!matches.length) { return; }
+
         // create a div to hold the autocomplete suggestions
         const autocompleteList = document.createElement('div'); // creates a new HTML div element for each suggestion
-        autocompleteList.setAttribute('id', this.id + '-autocomplete-list'); // gives it an ID
+        autocompleteList.setAttribute('id', inputElement.id + '-autocomplete-list'); // gives it an ID
         autocompleteList.setAttribute('class', 'autocomplete-items'); // adds css class for styling
-        this.parentNode.appendChild(autocompleteList); // adds dropdown div as a child of form-group
-
-        // filter airports that match what user typed
-        // for each airport object, it checks if it matches airport code, city name, or airport name
-        const matches = airports.filter(airport => 
-            airport.code.includes(inputValue) ||
-            airport.city.toUpperCase().includes(inputValue) ||
-            airport.name.toUpperCase().includes(inputValue) ||
-            (airport.state && airport.state.toUpperCase().includes(inputValue)) ||
-            (airport.country && airport.country.toUpperCase().includes(inputValue))
-        );
-
-        // shows the first 5 matches
-        matches.slice(0, 5).forEach(airport => {
+        inputElement.parentNode.appendChild(autocompleteList); // adds dropdown div as a child of form-group
+
+        matches.forEach(airport => {
             const item = document.createElement('div'); // creates div for each suggestion
             item.innerHTML = `
             <div>
@@ -69,9 +74,8 @@ function setupAutocomplete(inputElement) {
             });
 
             autocompleteList.appendChild(item); // adds the suggestion item to the dropdown list
-
         });
-    });
+    }
 
     // handles keyboard navigation
     inputElement.addEventListener('keydown', function(e) {
@@ -166,56 +170,104 @@ tripTypeInputs.forEach(input => {
 });
 
 // setup autocomplete for results page search inputs (if they exist)
-console.log('Checking for results page inputs...');
 const resultsOrigin = document.getElementById('results-origin');
 const resultsDestination = document.getElementById('results-destination');
 
-console.log('Results origin:', resultsOrigin);
-console.log('Results destination:', resultsDestination);
-
 if (resultsOrigin && resultsDestination) {
-    console.log('Results inputs found! Waiting for airport data...');
-    // wait for airport data to load, then setup autocomplete
-    const checkAirportsLoaded = setInterval(() => {
-        console.log('Checking airports length:', airports.length);
-        if (airports.length > 0) {
-            console.log('Setting up autocomplete for results page...');
-            setupAutocomplete(resultsOrigin);
-            setupAutocomplete(resultsDestination);
-            console.log('Autocomplete setup complete!');
-            clearInterval(checkAirportsLoaded);
-        }
-    }, 100);
-} else {
-    console.log('Results inputs not found (probably on home page)');
+    setupAutocomplete(resultsOrigin);
+    setupAutocomplete(resultsDestination);
 }
 
-// Pagination for flight results
+// Pagination, sorting and filtering for flight results
+// the server keeps the full result set for this search, so these
+// only fetch rendered cards from /search/<id>/offers (no new search)
 const showMoreBtn = document.getElementById('showMoreBtn');
+const resultsControls = document.getElementById('results-controls');
+const flightsList = document.getElementById('flights-list');
+const flightCount = document.getElementById('flight-count');
+
+if (resultsControls && flightsList) {
+    // builds the offers URL from the current sort/filter choices
+    function offersUrl(offset) {
+        const params = new URLSearchParams(new FormData(resultsControls));
+        params.set('offset', offset);
+        return `${resultsControls.dataset.offersUrl}?${params.toString()}`;
+    }
 
-if (showMoreBtn) {
-    let currentlyShowing = 5; // starts w/ 5 flights
-    const flightCards = document.querySelectorAll('.flight-card');
-    const totalFlights = flightCards.length;
+    // replace = true swaps the list (sort/filter change), false appends (show more)
+    function loadOffers(offset, replace) {
+        fetch(offersUrl(offset))
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    flightCount.textContent = data.error;
+                    showMoreBtn.style.display = 'none';
+                    return;
+                }
+
+                if (replace) {
+                    flightsList.innerHTML = data.html;
+                } else {
+                    flightsList.insertAdjacentHTML('beforeend', data.html);
+                }
+                flightCount.textContent = `${data.total} flight(s) found`;
+
+                // hide the button once every matching flight is shown
+                if (data.next_offset === null) {
+                    showMoreBtn.style.display = 'none';
+                } else {
+                    showMoreBtn.dataset.nextOffset = data.next_offset;
+                    showMoreBtn.style.display = '';
+                }
+            })
+            .catch(error => console.error('Error loading flights: ', error));
+    }
 
     showMoreBtn.addEventListener('click', function() {
-        // show next 5 flights
-        const nextBatch = currentlyShowing + 5;
+        loadOffers(this.dataset.nextOffset, false);
+    });
 
-        for (let i = currentlyShowing; i < nextBatch && i < totalFlights; i++) {
-            flightCards[i].classList.remove('hidden');
-        }
+    resultsControls.addEventListener('change', function() {
+        loadOffers(0, true);
+    });
+}
 
-        currentlyShowing = Math.min(nextBatch, totalFlights);
+// Streamed results page
+// cards arrive in the order the flight API returns them, so they are
+// sorted here once the stream has finished (this script loads last)
+// and again whenever the sort choice changes, without a new request
+const streamStatus = document.getElementById('stream-status');
+const streamSort = document.getElementById('stream-sort');
+
+if (streamStatus && flightsList) {
+    const sortKeys = {
+        price: card => [parseFloat(card.dataset.price)],
+        duration: card => [parseInt(card.dataset.duration, 10), parseFloat(card.dataset.price)],
+        stops: card => [parseInt(card.dataset.stops, 10), parseFloat(card.dataset.price)],
+    };
+
+    function sortStreamedCards() {
+        const keyOf = sortKeys[streamSort.value] || sortKeys.price;
+        const cards = Array.from(flightsList.querySelectorAll('.flight-card'))
+            .map(card => ({ card, key: keyOf(card) }));
+
+        cards.sort((a, b) => {
+            for (let i = 0; i < a.key.length; i++) {
+                if (a.key[i] !== b.key[i]) return a.key[i] - b.key[i];
+            }
+            return 0;
+        });
+        cards.forEach(({ card }) => flightsList.appendChild(card));
+    }
 
-        // update button text with remaining count
-        const remaining = totalFlights - currentlyShowing;
-        if (remaining > 0) {
-            this.textContent = `Show More`;
-        } else {
-            this.style.display = 'none'; // hides button
-        }
-    });
+    const total = parseInt(streamStatus.dataset.total, 10) || 0;
+    flightCount.textContent = `${total} flight(s) found`;
+    if (total) {
+        sortStreamedCards();
+        streamSort.addEventListener('change', sortStreamedCards);
+    } else {
+        document.getElementById('stream-controls').style.display = 'none';
+    }
 }
 
 // Prevents letters in phone number input
@@ -286,4 +338,76 @@ document.addEventListener('DOMContentLoaded', function() {
     phoneRadio.addEventListener('change', toggleContactMethod);
 
     toggleContactMethod();
-});
\ No newline at end of file
+});
+
+// polls the background delivery status of verification messages
+// the server queues emails/SMS and returns right away, so this shows
+// the result once the send has actually happened
+const deliveryStatus = document.getElementById('delivery-status');
+if (deliveryStatus) {
+    const labels = {
+        verification_email: 'Verification email',
+        verification_sms: 'Verification code',
+    };
+    let attempts = 0;
+
+    function pollDeliveryStatus() {
+        attempts++;
+        fetch(deliveryStatus.dataset.statusUrl)
+            .then(response => response.json())
+            .then(statuses => {
+                const kinds = Object.keys(statuses).filter(kind => labels[kind]);
+                const pending = kinds.some(kind => statuses[kind] === 'queued');
+                const failed = kinds.filter(kind => statuses[kind] === 'failed');
+
+                if (kinds.length && !pending) {
+                    if (failed.length) {
+                        deliveryStatus.className = 'flash flash-error';
+                        deliveryStatus.textContent = failed.map(kind => labels[kind]).join(' and ') +
+                            ' failed to send. Please contact support.';
+                    } else {
+                        deliveryStatus.className = 'flash flash-success';
+                        deliveryStatus.textContent = kinds.map(kind => labels[kind]).join(' and ') + ' sent!';
+                    }
+                    return;
+                }
+
+                // keep polling for ~30 seconds, then stop quietly
+                if (attempts < 30) {
+                    setTimeout(pollDeliveryStatus, 1000);
+                } else {
+                    deliveryStatus.style.display = 'none';
+                }
+            })
+            .catch(error => console.error('Error checking delivery status: ', error));
+    }
+
+    pollDeliveryStatus();
+}
+
+// shows the current lowest price for a new alert's route
+// the server prefetches the route in the background after the alert
+// is created, so this polls until the baseline price is recorded
+const baselinePrice = document.getElementById('baseline-price');
+if (baselinePrice) {
+    let baselineAttempts = 0;
+
+    function pollBaselinePrice() {
+        baselineAttempts++;
+        fetch(baselinePrice.dataset.baselineUrl)
+            .then(response => response.json())
+            .then(result => {
+                if (result.status === 'ready') {
+                    baselinePrice.textContent = 'Current lowest price: $' + result.price.toFixed(2) +
+                        (result.airline ? ' on ' + result.airline : '') +
+                        ". We'll let you know when it drops below your target.";
+                    baselinePrice.hidden = false;
+                } else if (result.status === 'pending' && baselineAttempts < 30) {
+                    setTimeout(pollBaselinePrice, 1000);
+                }
+            })
+            .catch(error => console.error('Error checking baseline price: ', error));
+    }
+
+    pollBaselinePrice();
+}
@@ -0,0 +1,36 @@
+import gc
+import os
+import sys
+
+# ──────────────────────────────────────────────────────────────
+# WSGI Entry Point
+# For production servers, e.g. from the flight_price_tracker
+# directory:
+#
+#   gunicorn --preload -w 4 -b 0.0.0.0:8000 src.web.wsgi:app
+#
+# With --preload the app is created and warmed up once in the
+# master; workers are forked from it and share the loaded state.
+# Servers that fork outside Python (so os.register_at_fork hooks
+# don't fire) should call reset_after_fork() from their own
+# post-fork hook.
+# ──────────────────────────────────────────────────────────────
+
+# add the project root to the path so `src.` imports resolve
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.web.app import create_app, reset_after_fork
+
+app = create_app()
+
+# Everything loaded so far lives as long as the process. Moving it
+# out of the GC's generations means collections in the workers
+# don't write to (and so un-share) those copy-on-write pages.
+gc.freeze()
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. app                   - Warmed-up Flask app for the WSGI server
+#   2. reset_after_fork()    - Re-exported for servers' post-fork hooks
+# ──────────────────────────────────────────────────────────────
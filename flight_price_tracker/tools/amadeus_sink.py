@@ -0,0 +1,207 @@
+import json
+import time
+import random
+import argparse
+import uuid
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from notification_sinks import SinkConfig, make_server, start_in_background
+
+# ──────────────────────────────────────────────────────────────
+# Local Amadeus Stand-in
+# Mimics the two Amadeus endpoints the search code calls:
+#   - OAuth2 token:          POST /v1/security/oauth2/token
+#   - Flight Offers Search:  GET  /v2/shopping/flight-offers
+# Offers are synthetic but shaped like the real response, so
+# parse_offer() handles them unchanged. Latency, failures and
+# rate limiting come from the same SinkConfig as the
+# notification sinks.
+#
+# Point the async client at it with:
+#   AMADEUS_BASE_URL=http://127.0.0.1:8027
+# ──────────────────────────────────────────────────────────────
+
+CARRIERS = ('AA', 'DL', 'UA', 'B6', 'AS', 'WN', 'NK', 'F9')
+HUBS = ('ORD', 'DFW', 'ATL', 'DEN', 'PHX', 'CLT')
+
+
+# ──────────────────────────────────────────────────────────────
+# Synthetic Offers
+# ──────────────────────────────────────────────────────────────
+
+
+def _itinerary(rng, origin, destination, day):
+    """One itinerary with 0-2 stops leaving on `day` (YYYY-MM-DD)."""
+    stops = rng.choice((0, 0, 1, 1, 2))
+    airports = [origin] + rng.sample(HUBS, stops) + [destination]
+    carrier = rng.choice(CARRIERS)
+    at = datetime.fromisoformat(day) + timedelta(minutes=rng.randrange(5 * 60, 22 * 60, 5))
+    start = at
+
+    segments = []
+    for leg_from, leg_to in zip(airports, airports[1:]):
+        arrive = at + timedelta(minutes=rng.randrange(60, 330, 5))
+        segments.append({
+            'departure': {'iataCode': leg_from, 'at': at.isoformat()},
+            'arrival': {'iataCode': leg_to, 'at': arrive.isoformat()},
+            'carrierCode': carrier,
+            'number': str(rng.randrange(100, 9999)),
+        })
+        at = arrive + timedelta(minutes=rng.randrange(45, 180, 5))
+
+    minutes = int((datetime.fromisoformat(segments[-1]['arrival']['at']) - start).total_seconds() // 60)
+    return {'duration': f"PT{minutes // 60}H{minutes % 60}M", 'segments': segments}
+
+
+# Seeded by the query, so repeated searches return the same offers.
+def build_offers(query, count):
+    """Flight Offers Search `data` for a parsed query string."""
+    rng = random.Random(json.dumps(query, sort_keys=True))
+    origin = query.get('originLocationCode', 'LAX')
+    destination = query.get('destinationLocationCode', 'JFK')
+    departure = query.get('departureDate', '2030-01-01')
+    return_date = query.get('returnDate')
+
+    offers = []
+    for i in range(count):
+        itineraries = [_itinerary(rng, origin, destination, departure)]
+        if return_date:
+            itineraries.append(_itinerary(rng, destination, origin, return_date))
+        offers.append({
+            'type': 'flight-offer',
+            'id': str(i + 1),
+            'itineraries': itineraries,
+            'price': {'currency': query.get('currencyCode', 'USD'), 'total': f"{rng.uniform(79, 1400):.2f}"},
+        })
+    return offers
+
+
+# ──────────────────────────────────────────────────────────────
+# Handler
+# ──────────────────────────────────────────────────────────────
+
+
+class AmadeusSinkHandler(BaseHTTPRequestHandler):
+    """Token and Flight Offers Search endpoints (JSON like the real API)."""
+
+    config = None  # set per server in make_server()
+    offers_per_search = 50
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    _bodies = {}  # query -> encoded response; keeps the sink's CPU out of the benchmark
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+    def _send_json(self, status, body):
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/vnd.amadeus+json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Shared gate for both endpoints: rate limit, latency, failures.
+    # Returns True if the request should go on to be answered.
+    def _admit(self):
+        if not self.config.allow():
+            self._send_json(429, {'errors': [{'status': 429, 'code': 38194, 'title': 'Too many requests'}]})
+            return False
+        self.config.delay()
+        if self.config.should_fail():
+            self._send_json(500, {'errors': [{'status': 500, 'code': 141, 'title': 'SYSTEM ERROR HAS OCCURRED'}]})
+            return False
+        return True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length) if length else b''
+        if urlsplit(self.path).path != '/v1/security/oauth2/token':
+            return self._send_json(404, {'errors': [{'status': 404, 'title': 'Resource not found'}]})
+
+        form = {k: v[0] for k, v in parse_qs(raw.decode('utf-8')).items()}
+        if form.get('grant_type') != 'client_credentials' or not form.get('client_id'):
+            return self._send_json(401, {'error': 'invalid_client', 'error_description': 'Client credentials are invalid'})
+        if not self._admit():
+            return
+
+        self._send_json(200, {
+            'type': 'amadeusOAuth2Token',
+            'username': 'bench@example.com',
+            'application_name': 'bench',
+            'client_id': form['client_id'],
+            'token_type': 'Bearer',
+            'access_token': uuid.uuid4().hex,
+            'expires_in': 1799,
+            'state': 'approved',
+        })
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != '/v2/shopping/flight-offers':
+            return self._send_json(404, {'errors': [{'status': 404, 'title': 'Resource not found'}]})
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self._send_json(401, {'errors': [{'status': 401, 'code': 38191, 'title': 'Invalid access token'}]})
+
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if not query.get('originLocationCode') or not query.get('departureDate'):
+            return self._send_json(400, {'errors': [{'status': 400, 'code': 32171, 'title': 'MANDATORY DATA MISSING'}]})
+        if not self._admit():
+            return
+
+        key = url.query
+        body = self._bodies.get(key)
+        if body is None:
+            count = min(int(query.get('max', 250)), self.offers_per_search)
+            body = json.dumps({'meta': {'count': count}, 'data': build_offers(query, count)}).encode('utf-8')
+            self._bodies[key] = body
+        self._send_json(200, body)
+
+
+# Sink server for Amadeus; same SinkConfig knobs as the notification sinks.
+def make_amadeus_server(config, offers_per_search=50, host='127.0.0.1', port=0, backlog=1024):
+    """Create an Amadeus stand-in returning `offers_per_search` offers per search."""
+    handler = type('AmadeusSinkHandler', (AmadeusSinkHandler,), {
+        'offers_per_search': offers_per_search,
+        '_bodies': {},
+    })
+    return make_server(handler, config, host, port, backlog)
+
+
+# ──────────────────────────────────────────────────────────────
+# Entry Point
+# python tools/amadeus_sink.py --latency-ms 800 --offers 100
+# ──────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local Amadeus Flight Offers Search stand-in.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8027)
+    parser.add_argument('--offers', type=int, default=50, help="offers returned per search")
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=0, help="requests/sec, 0 = unlimited")
+    args = parser.parse_args()
+
+    config = SinkConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit)
+    server = make_amadeus_server(config, args.offers, args.host, args.port)
+    print(f"Amadeus stand-in listening on {start_in_background(server)}")
+
+    print("Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\nStand-in stopped")
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. build_offers()          - Synthetic Flight Offers Search data for a query
+#   2. AmadeusSinkHandler      - Token + flight-offers endpoints
+#   3. make_amadeus_server()   - Builds the stand-in server
+# ──────────────────────────────────────────────────────────────
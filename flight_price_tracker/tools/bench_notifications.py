@@ -0,0 +1,147 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# ──────────────────────────────────────────────────────────────
+# Notification Throughput Benchmark
+# Starts the local SendGrid/Twilio sinks, points email_service
+# and sms_service at them, and pushes N price-drop notifications
+# through the real send functions. Reports sends/sec, failures
+# and latency percentiles per channel.
+#
+#   python tools/bench_notifications.py -n 500 --concurrency 16 --latency-ms 50
+# ──────────────────────────────────────────────────────────────
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from notification_sinks import SinkConfig, SendGridSinkHandler, TwilioSinkHandler, make_server, start_in_background
+
+
+# ──────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# Calls send_func once per recipient from a thread pool and
+# records how long each call took and whether it succeeded.
+def drive(send_func, recipients, concurrency, *args):
+    """Run send_func(recipient, *args) for every recipient. Returns a result dict."""
+    def timed(recipient):
+        start = time.perf_counter()
+        ok = send_func(recipient, *args)
+        return ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(timed, recipients))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for _, latency in outcomes)
+    sent = sum(1 for ok, _ in outcomes if ok)
+    return {
+        'sent': sent,
+        'failed': len(outcomes) - sent,
+        'elapsed': elapsed,
+        'sends_per_sec': sent / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def print_report(channel, result, sink_config):
+    print(f"\n{channel}")
+    print("-" * 40)
+    print(f"  sent:          {result['sent']}")
+    print(f"  failed:        {result['failed']}")
+    print(f"  elapsed:       {result['elapsed']:.2f}s")
+    print(f"  sends/sec:     {result['sends_per_sec']:.1f}")
+    print(f"  latency p50:   {result['p50_ms']:.1f} ms")
+    print(f"  latency p90:   {result['p90_ms']:.1f} ms")
+    print(f"  latency p99:   {result['p99_ms']:.1f} ms")
+    print(f"  latency max:   {result['max_ms']:.1f} ms")
+    print(f"  sink received: {sink_config.received} (429s: {sink_config.rejected})")
+
+
+# ──────────────────────────────────────────────────────────────
+# Entry Point
+# ──────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark email/SMS notification throughput against local sinks.")
+    parser.add_argument('-n', type=int, default=200, help="notifications per channel")
+    parser.add_argument('--channel', choices=['email', 'sms', 'both'], default='both')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--jitter-ms', type=float, default=20)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=0, help="sink requests/sec, 0 = unlimited")
+    parser.add_argument('--senders', type=int, default=4, help="size of the SMS sender pool")
+    parser.add_argument('--sms-rate', type=float, default=1.0, help="messages/sec per SMS sender")
+    args = parser.parse_args()
+
+    # --- Start the sinks ---
+    sendgrid_config = SinkConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit)
+    twilio_config = SinkConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit)
+    sendgrid_url = start_in_background(make_server(SendGridSinkHandler, sendgrid_config))
+    twilio_url = start_in_background(make_server(TwilioSinkHandler, twilio_config))
+
+    # --- Point the services at the sinks (must happen before import) ---
+    os.environ['SENDGRID_API_HOST'] = sendgrid_url
+    os.environ['SENDGRID_API_KEY'] = 'SG.bench'
+    os.environ['SENDER_EMAIL'] = 'bench@example.com'
+    os.environ['TWILIO_API_BASE_URL'] = twilio_url
+    os.environ['TWILIO_ACCOUNT_SID'] = 'ACbench'
+    os.environ['TWILIO_AUTH_TOKEN'] = 'bench'
+    os.environ['TWILIO_SENDER_POOL'] = ','.join(f"+1555000{i:04d}" for i in range(args.senders))
+    os.environ['SMS_SENDER_RATE'] = str(args.sms_rate)
+    os.environ['SMS_QUEUE_MAX'] = str(max(args.n, 1))
+
+    from src.core.email_service import send_price_drop_notification
+    from src.core.sms_service import send_price_drop_sms
+
+    alert_details = {
+        'alert_id': 1,
+        'origin': 'LAX',
+        'destination': 'JFK',
+        'departure_date': '2026-03-01',
+        'return_date': '2026-03-08',
+        'price_threshold': 400.0,
+        'trip_type': 'round-trip',
+    }
+    flight_details = {'price': 321.0, 'airline': 'AA'}
+
+    print(f"Sinks: SendGrid {sendgrid_url}, Twilio {twilio_url}")
+    print(f"{args.n} notifications per channel, concurrency {args.concurrency}, "
+          f"latency {args.latency_ms}ms ±{args.jitter_ms}ms, error rate {args.error_rate}")
+
+    if args.channel in ('email', 'both'):
+        recipients = [f"user{i}@example.com" for i in range(args.n)]
+        result = drive(send_price_drop_notification, recipients, args.concurrency, alert_details, flight_details)
+        print_report("Email (SendGrid)", result, sendgrid_config)
+
+    if args.channel in ('sms', 'both'):
+        recipients = [f"+1444{i:07d}" for i in range(args.n)]
+        result = drive(send_price_drop_sms, recipients, args.concurrency, alert_details, flight_details)
+        print_report(f"SMS (Twilio, {args.senders} senders @ {args.sms_rate}/s)", result, twilio_config)
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. percentile()    - Nearest-rank percentile of a sorted list
+#   2. drive()         - Sends N notifications from a thread pool and times them
+#   3. print_report()  - Prints sends/sec and latency percentiles for one channel
+# ──────────────────────────────────────────────────────────────
@@ -0,0 +1,256 @@
+import io
+import os
+import sys
+import time
+import argparse
+import threading
+import contextlib
+from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# ──────────────────────────────────────────────────────────────
+# Search Concurrency Load Test
+# Starts the local Amadeus stand-in and runs the same N searches
+# through each path:
+#   - sync:   travelpayouts.prices_for_dates() (Amadeus SDK) from
+#             a pool of --threads threads
+#   - async:  AsyncSearchService, one event loop thread with up to
+#             --concurrency searches in flight
+#   - routes: GET /api/v1/search through the Flask app from
+#             --threads threads (a threaded WSGI worker), once with
+#             the sync SDK and once with SEARCH_ASYNC=1
+# Reports searches/sec and latency percentiles for each path.
+#
+# --threads defaults to --concurrency, so sync and async compare
+# at the same concurrency. The routes runs show what the web app
+# gets: with SEARCH_ASYNC=1 each request still holds its WSGI
+# thread until the search is done, so the thread count caps
+# concurrent searches on both runs.
+#
+#   python tools/bench_search.py -n 1000 --concurrency 32 --latency-ms 800
+# ──────────────────────────────────────────────────────────────
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+
+from notification_sinks import SinkConfig, start_in_background
+from amadeus_sink import make_amadeus_server
+from bench_notifications import percentile
+
+ROUTES = (('LAX', 'JFK'), ('SFO', 'BOS'), ('SEA', 'MIA'), ('ORD', 'LAS'), ('DEN', 'ATL'),
+          ('JFK', 'LHR'), ('BOS', 'CDG'), ('LAX', 'HNL'), ('DFW', 'MEX'), ('IAD', 'FRA'))
+
+
+# ──────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────
+
+
+# Every search is distinct, so the routes runs never answer one
+# from the search cache.
+def search_kwargs(n):
+    """N distinct prices_for_dates() argument sets over a handful of routes."""
+    searches = []
+    for i in range(n):
+        origin, destination = ROUTES[i % len(ROUTES)]
+        departure = date(2030, 3, 1) + timedelta(days=i // len(ROUTES))
+        searches.append({
+            'origin': origin,
+            'destination': destination,
+            'departure_at': departure.isoformat(),
+            'return_at': (departure + timedelta(days=7)).isoformat() if i % 2 else None,
+            'one_way': not i % 2,
+            'limit': 250,
+        })
+    return searches
+
+
+def search_url(kwargs):
+    """The /api/v1/search URL for one prices_for_dates() argument set."""
+    url = (f"/api/v1/search?origin={kwargs['origin']}&destination={kwargs['destination']}"
+           f"&departure_date={kwargs['departure_at']}")
+    if kwargs['one_way']:
+        return url + "&trip_type=one-way"
+    return url + f"&return_date={kwargs['return_at']}&trip_type=round-trip"
+
+
+def summarize(outcomes, elapsed):
+    """Result dict from [(ok, latency_seconds), ...]."""
+    latencies = sorted(latency for _, latency in outcomes)
+    done = sum(1 for ok, _ in outcomes if ok)
+    return {
+        'done': done,
+        'failed': len(outcomes) - done,
+        'elapsed': elapsed,
+        'per_sec': done / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+# Each search holds one pool thread for its whole round trip.
+# Latency counts from submission (as for the async path), so time
+# spent waiting for a free thread is included.
+def run_sync(searches, threads):
+    from src.api import travelpayouts
+
+    def timed(kwargs):
+        try:
+            travelpayouts.prices_for_dates(**kwargs)
+            ok = True
+        except travelpayouts.APIError:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        outcomes = list(pool.map(timed, searches))
+    return summarize(outcomes, time.perf_counter() - start)
+
+
+# Every search is submitted up front; the service's semaphore
+# keeps at most max_in_flight of them upstream.
+def run_async(searches, service):
+    outcomes = []
+    start = time.perf_counter()
+
+    def record(submitted_at):
+        def done(future):
+            outcomes.append((future.exception() is None, time.perf_counter() - submitted_at))
+        return done
+
+    futures = []
+    for kwargs in searches:
+        future = service.submit(**kwargs)
+        future.add_done_callback(record(time.perf_counter()))
+        futures.append(future)
+    wait(futures)
+    return summarize(outcomes, time.perf_counter() - start)
+
+
+# Each request holds one pool thread from the view to the response,
+# as in a threaded WSGI worker. The app's own caps (per-IP search
+# limit, SEARCH_MAX_UPSTREAM) are lifted so only the threads limit
+# concurrency, and every run starts from an empty search cache.
+def run_routes(searches, threads, use_async):
+    from src.web import app as web
+    from src.core.search_cache import SearchCache
+    from src.core.rate_limit import ConcurrencyGate
+
+    flask_app = web.create_app({'WARM_UP': False, 'TESTING': True})
+    web.search_limiter.rate = 0
+    web.upstream_gate = ConcurrencyGate(limit=0)
+    web.search_cache = SearchCache()
+    web.SEARCH_ASYNC = use_async
+    clients = threading.local()
+
+    def timed(kwargs):
+        if not hasattr(clients, 'client'):
+            clients.client = flask_app.test_client()
+        ok = clients.client.get(search_url(kwargs)).status_code == 200
+        return ok, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        outcomes = list(pool.map(timed, searches))
+    return summarize(outcomes, time.perf_counter() - start)
+
+
+def print_report(label, result):
+    print(f"\n{label}")
+    print("-" * 40)
+    print(f"  searches:      {result['done']}")
+    print(f"  failed:        {result['failed']}")
+    print(f"  elapsed:       {result['elapsed']:.2f}s")
+    print(f"  searches/sec:  {result['per_sec']:.1f}")
+    print(f"  latency p50:   {result['p50_ms']:.1f} ms")
+    print(f"  latency p90:   {result['p90_ms']:.1f} ms")
+    print(f"  latency p99:   {result['p99_ms']:.1f} ms")
+    print(f"  latency max:   {result['max_ms']:.1f} ms")
+
+
+# ──────────────────────────────────────────────────────────────
+# Entry Point
+# ──────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sync and async upstream search throughput.")
+    parser.add_argument('-n', type=int, default=500, help="searches per path")
+    parser.add_argument('--path', choices=['sync', 'async', 'both', 'routes', 'all'], default='both',
+                        help="both = sync and async; all = both plus routes")
+    parser.add_argument('--concurrency', type=int, default=32, help="async path searches in flight")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="sync and routes path threads (default: --concurrency)")
+    parser.add_argument('--offers', type=int, default=50, help="offers returned per search")
+    parser.add_argument('--latency-ms', type=float, default=500)
+    parser.add_argument('--jitter-ms', type=float, default=200)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    threads = args.threads or args.concurrency
+
+    # --- Start the stand-in ---
+    config = SinkConfig(args.latency_ms, args.jitter_ms, args.error_rate)
+    server = make_amadeus_server(config, args.offers)
+    base_url = start_in_background(server)
+    host, port = server.server_address[:2]
+
+    # --- Point both clients at it (must happen before import) ---
+    os.environ['AMADEUS_API_KEY'] = 'bench'
+    os.environ['AMADEUS_API_SECRET'] = 'bench'
+    os.environ['AMADEUS_BASE_URL'] = base_url
+    # the routes runs: the app's async service and client, no on-disk search store
+    os.environ['SEARCH_ASYNC_MAX_IN_FLIGHT'] = str(args.concurrency)
+    os.environ['AMADEUS_ASYNC_MAX_CONNECTIONS'] = str(max(threads, args.concurrency))
+    os.environ['SEARCH_STORE_PATH'] = ''
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        from amadeus import Client
+        from src.api import travelpayouts
+        from src.api.amadeus_async import AsyncAmadeusClient
+        from src.core.async_search import AsyncSearchService
+
+    # The SDK only takes ssl=False as a constructor argument
+    travelpayouts.amadeus = Client(client_id='bench', client_secret='bench', host=host, port=port, ssl=False)
+
+    searches = search_kwargs(args.n)
+    print(f"Amadeus stand-in: {base_url}, {args.offers} offers/search, "
+          f"latency {args.latency_ms}ms ±{args.jitter_ms}ms, error rate {args.error_rate}")
+    print(f"{args.n} searches per path")
+
+    if args.path in ('sync', 'both', 'all'):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_sync(searches, threads)
+        print_report(f"Sync (Amadeus SDK, {threads} threads)", result)
+
+    if args.path in ('async', 'both', 'all'):
+        service = AsyncSearchService(max_in_flight=args.concurrency,
+                                     client=AsyncAmadeusClient(base_url=base_url,
+                                                               max_connections=args.concurrency))
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = run_async(searches, service)
+        service.close()
+        print_report(f"Async (aiohttp, 1 loop, up to {args.concurrency} in flight)", result)
+
+    if args.path in ('routes', 'all'):
+        for use_async in (False, True):
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run_routes(searches, threads, use_async)
+            print_report(f"/api/v1/search, {threads} request threads, SEARCH_ASYNC={int(use_async)}", result)
+
+    print(f"\nStand-in received {config.received} requests")
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. search_kwargs()   - N distinct search argument sets over a few routes
+#   2. search_url()      - The /api/v1/search URL for one of them
+#   3. summarize()       - Throughput and latency percentiles
+#   4. run_sync()        - Searches through the SDK from a thread pool
+#   5. run_async()       - Searches through AsyncSearchService
+#   6. run_routes()      - Searches through the Flask app from a thread pool
+#   7. print_report()    - Prints one path's results
+# ──────────────────────────────────────────────────────────────
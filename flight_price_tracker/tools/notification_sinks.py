@@ -0,0 +1,243 @@
+import re
+import json
+import time
+import random
+import argparse
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+# ──────────────────────────────────────────────────────────────
+# Local Notification Sinks
+# Tiny HTTP stand-ins for the two provider endpoints we call:
+#   - SendGrid v3 mail send:  POST /v3/mail/send
+#   - Twilio Messages:        POST /2010-04-01/Accounts/{sid}/Messages.json
+# They accept requests in the same shape as the real APIs and
+# can add latency, random failures and rate limiting, so the
+# email/SMS code paths can be load-tested without real accounts.
+#
+# Point the services at them with:
+#   SENDGRID_API_HOST=http://127.0.0.1:8025
+#   TWILIO_API_BASE_URL=http://127.0.0.1:8026
+# ──────────────────────────────────────────────────────────────
+
+
+# ──────────────────────────────────────────────────────────────
+# Sink Behaviour
+# ──────────────────────────────────────────────────────────────
+
+
+class SinkConfig:
+    """Latency, failure and rate-limit settings shared by a sink's handlers."""
+
+    def __init__(self, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_limit=0):
+        self.latency_ms = latency_ms  # base delay added to every request
+        self.jitter_ms = jitter_ms  # random extra delay, 0..jitter_ms
+        self.error_rate = error_rate  # fraction of requests answered with a 500
+        self.rate_limit = rate_limit  # requests per second before 429s (0 = unlimited)
+
+        self.received = 0
+        self.rejected = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._lock = threading.Lock()
+
+    # Fixed one-second window counter. Returns False once the
+    # current second has used up its request budget.
+    def allow(self):
+        """Return True if the request fits in the rate limit."""
+        with self._lock:
+            self.received += 1
+            if not self.rate_limit:
+                return True
+            now = time.monotonic()
+            if now - self._window_start >= 1:
+                self._window_start = now
+                self._window_count = 0
+            if self._window_count >= self.rate_limit:
+                self.rejected += 1
+                return False
+            self._window_count += 1
+            return True
+
+    def delay(self):
+        """Sleep for the configured latency plus jitter."""
+        total_ms = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if total_ms:
+            time.sleep(total_ms / 1000)
+
+    def should_fail(self):
+        return random.random() < self.error_rate
+
+
+class _SinkHandler(BaseHTTPRequestHandler):
+    """Shared plumbing for both sinks. Subclasses implement handle_post()."""
+
+    config = None  # set per server in make_server()
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output clean
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+        self.send_response(status)
+        if payload is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length) if length else b''
+
+        if not self.config.allow():
+            return self.rate_limited()
+
+        self.config.delay()
+
+        if self.config.should_fail():
+            return self._send_json(500, {'message': 'Injected failure'})
+
+        self.handle_post(raw)
+
+
+# ──────────────────────────────────────────────────────────────
+# SendGrid v3 Stand-in
+# ──────────────────────────────────────────────────────────────
+
+
+class SendGridSinkHandler(_SinkHandler):
+    """Mimics POST /v3/mail/send (202 Accepted with an empty body)."""
+
+    def rate_limited(self):
+        self._send_json(429, {'errors': [{'message': 'too many requests', 'field': None}]},
+                        headers={'X-RateLimit-Remaining': '0'})
+
+    def handle_post(self, raw):
+        if self.path != '/v3/mail/send':
+            return self._send_json(404, {'errors': [{'message': 'not found'}]})
+        if not self.headers.get('Authorization', '').startswith('Bearer '):
+            return self._send_json(401, {'errors': [{'message': 'authorization required'}]})
+
+        try:
+            mail = json.loads(raw or b'{}')
+        except ValueError:
+            return self._send_json(400, {'errors': [{'message': 'Bad Request'}]})
+        if not mail.get('personalizations') or not mail.get('from'):
+            return self._send_json(400, {'errors': [{'message': 'personalizations and from are required'}]})
+
+        self._send_json(202, None, headers={'X-Message-Id': uuid.uuid4().hex})
+
+
+# ──────────────────────────────────────────────────────────────
+# Twilio Messages Stand-in
+# ──────────────────────────────────────────────────────────────
+
+TWILIO_MESSAGES_PATH = re.compile(r'^/2010-04-01/Accounts/(?P<sid>[^/]+)/Messages\.json$')
+
+
+class TwilioSinkHandler(_SinkHandler):
+    """Mimics POST /2010-04-01/Accounts/{sid}/Messages.json (201 Created)."""
+
+    def rate_limited(self):
+        self._send_json(429, {'code': 20429, 'message': 'Too Many Requests', 'status': 429})
+
+    def handle_post(self, raw):
+        match = TWILIO_MESSAGES_PATH.match(self.path)
+        if not match:
+            return self._send_json(404, {'code': 20404, 'message': 'Not Found', 'status': 404})
+
+        form = {k: v[0] for k, v in parse_qs(raw.decode('utf-8')).items()}
+        if not form.get('To') or not form.get('From') or not form.get('Body'):
+            return self._send_json(400, {'code': 21604, 'message': 'To, From and Body are required', 'status': 400})
+
+        now = datetime.now(timezone.utc).strftime('%a, %d %b %Y %H:%M:%S +0000')
+        sid = 'SM' + uuid.uuid4().hex
+        self._send_json(201, {
+            'sid': sid,
+            'account_sid': match.group('sid'),
+            'to': form['To'],
+            'from': form['From'],
+            'body': form['Body'],
+            'status': 'queued',
+            'num_segments': '1',
+            'direction': 'outbound-api',
+            'api_version': '2010-04-01',
+            'date_created': now,
+            'date_updated': now,
+            'uri': f"/2010-04-01/Accounts/{match.group('sid')}/Messages/{sid}.json",
+        })
+
+
+# ──────────────────────────────────────────────────────────────
+# Server Helpers
+# ──────────────────────────────────────────────────────────────
+
+
+# Builds a threaded HTTP server for one sink. Port 0 picks a free
+# port; read it back from server.server_address.
+def make_server(handler_class, config, host='127.0.0.1', port=0, backlog=128):
+    """Create a sink server with its own SinkConfig."""
+    handler = type(handler_class.__name__, (handler_class,), {'config': config})
+    # default backlog of 5 drops connections under load; set on a
+    # subclass so other ThreadingHTTPServers (metrics) keep theirs
+    server_class = type('SinkServer', (ThreadingHTTPServer,), {'request_queue_size': backlog})
+    server = server_class((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+# Starts a server on a daemon thread and returns its base URL.
+def start_in_background(server):
+    """Serve forever on a background thread. Returns the server's base URL."""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+# ──────────────────────────────────────────────────────────────
+# Entry Point
+# python tools/notification_sinks.py --latency-ms 80 --error-rate 0.02
+# ──────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run local SendGrid/Twilio stand-ins.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--sendgrid-port', type=int, default=8025)
+    parser.add_argument('--twilio-port', type=int, default=8026)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--jitter-ms', type=float, default=0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=0, help="requests/sec per sink, 0 = unlimited")
+    args = parser.parse_args()
+
+    servers = []
+    for handler_class, port in ((SendGridSinkHandler, args.sendgrid_port), (TwilioSinkHandler, args.twilio_port)):
+        config = SinkConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit)
+        server = make_server(handler_class, config, args.host, port)
+        print(f"{handler_class.__name__} listening on {start_in_background(server)}")
+        servers.append(server)
+
+    print("Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\nSinks stopped")
+
+
+# ──────────────────────────────────────────────────────────────
+# Function Reference
+#   1. SinkConfig           - Latency / error rate / rate limit settings and counters
+#   2. SendGridSinkHandler  - Stand-in for SendGrid v3 mail send
+#   3. TwilioSinkHandler    - Stand-in for the Twilio Messages endpoint
+#   4. make_server()        - Builds a threaded server for one sink
+#   5. start_in_background()- Runs a server on a daemon thread
+# ──────────────────────────────────────────────────────────────